@@ -0,0 +1,52 @@
+"""Document post-processing pipeline
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Results of background processing on uploaded files
+    op.add_column('uploaded_file', sa.Column('mime_type', sa.String(255), nullable=True))
+    op.add_column('uploaded_file', sa.Column('size_bytes', sa.BigInteger(), nullable=True))
+    op.add_column('uploaded_file', sa.Column('sha256', sa.String(64), nullable=True))
+    op.add_column('uploaded_file', sa.Column('processed_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    
+    # Durable job queue consumed with SELECT ... FOR UPDATE SKIP LOCKED
+    op.create_table(
+        'document_job',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('uuid_generate_v4()'), primary_key=True),
+        sa.Column('file_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(20), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['file_id'], ['uploaded_file.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_document_job_status_run_after', 'document_job', ['status', 'run_after'], unique=False)
+    
+    # Queue work for files uploaded before the pipeline existed
+    op.execute(
+        "INSERT INTO document_job (file_id) SELECT id FROM uploaded_file WHERE processed_at IS NULL"
+    )
+
+def downgrade():
+    op.drop_index('ix_document_job_status_run_after', table_name='document_job')
+    op.drop_table('document_job')
+    op.drop_column('uploaded_file', 'processed_at')
+    op.drop_column('uploaded_file', 'sha256')
+    op.drop_column('uploaded_file', 'size_bytes')
+    op.drop_column('uploaded_file', 'mime_type')
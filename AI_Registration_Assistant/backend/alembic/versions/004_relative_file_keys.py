@@ -0,0 +1,32 @@
+"""Store uploaded files as relative storage keys
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import os
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Files were stored flat in UPLOAD_DIR, so the key is the path's last component
+    for table in ('uploaded_file', 'upload_session'):
+        op.execute(
+            f"UPDATE {table} SET file_url = regexp_replace(file_url, '^.*[/\\\\]', '') "
+            f"WHERE file_url ~ '[/\\\\]'"
+        )
+
+def downgrade():
+    upload_dir = os.path.abspath(os.getenv("UPLOAD_DIR", "uploads")).replace("'", "''")
+    for table in ('uploaded_file', 'upload_session'):
+        op.execute(
+            f"UPDATE {table} SET file_url = '{upload_dir}/' || file_url "
+            f"WHERE file_url IS NOT NULL AND file_url !~ '[/\\\\]'"
+        )
@@ -0,0 +1,56 @@
+"""Content-addressed file blobs
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # One row per unique file content, with the number of uploads sharing it
+    op.create_table(
+        'file_blob',
+        sa.Column('sha256', sa.String(64), nullable=False),
+        sa.Column('storage_key', sa.String(512), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+    op.add_column('uploaded_file', sa.Column('blob_sha256', sa.String(64), nullable=True))
+    op.create_foreign_key(
+        'fk_uploaded_file_blob_sha256', 'uploaded_file', 'file_blob', ['blob_sha256'], ['sha256']
+    )
+    op.create_index('ix_uploaded_file_blob_sha256', 'uploaded_file', ['blob_sha256'], unique=False)
+    op.add_column('upload_session', sa.Column('sha256', sa.String(64), nullable=True))
+    
+    # Files already hashed by the document pipeline become blobs. Duplicates
+    # are pointed at one copy; the other copies are no longer referenced.
+    op.execute("""
+        INSERT INTO file_blob (sha256, storage_key, size_bytes, ref_count)
+        SELECT sha256, min(file_url), max(size_bytes), count(*)
+        FROM uploaded_file
+        WHERE sha256 IS NOT NULL AND size_bytes IS NOT NULL
+        GROUP BY sha256
+    """)
+    op.execute("""
+        UPDATE uploaded_file
+        SET blob_sha256 = file_blob.sha256, file_url = file_blob.storage_key
+        FROM file_blob
+        WHERE uploaded_file.sha256 = file_blob.sha256
+    """)
+
+def downgrade():
+    op.drop_column('upload_session', 'sha256')
+    op.drop_index('ix_uploaded_file_blob_sha256', table_name='uploaded_file')
+    op.drop_constraint('fk_uploaded_file_blob_sha256', 'uploaded_file', type_='foreignkey')
+    op.drop_column('uploaded_file', 'blob_sha256')
+    op.drop_table('file_blob')
@@ -0,0 +1,22 @@
+"""MIME type of completed upload sessions
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Sniffed when the session completes and copied onto the registered file
+    op.add_column('upload_session', sa.Column('mime_type', sa.String(255), nullable=True))
+
+def downgrade():
+    op.drop_column('upload_session', 'mime_type')
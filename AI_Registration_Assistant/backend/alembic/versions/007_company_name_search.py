@@ -0,0 +1,26 @@
+"""Trigram index for company name search
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Serves both the prefix LIKE and the similarity (%) lookups of the
+    # autocomplete endpoint on the lowercased name
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_company_name_trgm "
+        "ON company USING gin (lower(company_name) gin_trgm_ops)"
+    )
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_company_name_trgm")
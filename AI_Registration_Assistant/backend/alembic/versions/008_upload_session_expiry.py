@@ -0,0 +1,27 @@
+"""Owner of upload sessions and index for expiring them
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Sessions are only visible to the user who started them (and admins)
+    op.add_column('upload_session', sa.Column('created_by', sa.Integer(), nullable=True))
+    # Cleanup looks for unregistered sessions idle for longer than the TTL
+    op.create_index(
+        'ix_upload_session_status_updated_at', 'upload_session', ['status', 'updated_at'], unique=False
+    )
+
+def downgrade():
+    op.drop_index('ix_upload_session_status_updated_at', table_name='upload_session')
+    op.drop_column('upload_session', 'created_by')
@@ -0,0 +1,89 @@
+import mimetypes
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+
+from app.database.database import get_async_db
+from app.models.models import User as UserModel
+from app.models.registration import Applicant, UploadedFile
+from app.services.auth_service import get_current_active_user, get_current_admin_user
+from app.services.file_blobs import delete_uploaded_file
+from app.utils.file_handler import file_handler
+from app.utils.file_response import StoredFileResponse
+
+router = APIRouter()
+
+@router.api_route(
+    "/files/{file_id}",
+    methods=["GET", "HEAD"],
+    response_class=StoredFileResponse,
+    summary="Download an uploaded file",
+    description="""
+    Stream an uploaded document. Supports single `Range` requests (206),
+    `If-None-Match` / `If-Modified-Since` (304) and `If-Range`. Files never
+    change once stored, so responses may be cached privately for a year.
+    Only admins and users whose email is an applicant's of the file's
+    company may download it; anyone else gets 404.
+    """,
+    responses={
+        200: {"content": {"application/octet-stream": {}}},
+        206: {"description": "Partial content"},
+        304: {"description": "Not modified"},
+        416: {"description": "Range not satisfiable"},
+    }
+)
+async def download_file(
+    file_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    query = (
+        select(UploadedFile.file_name, UploadedFile.file_url, UploadedFile.mime_type)
+        .where(UploadedFile.id == file_id)
+    )
+    if not current_user.is_admin:
+        query = query.where(
+            exists().where(
+                Applicant.company_id == UploadedFile.company_id,
+                func.lower(Applicant.email) == current_user.email.lower(),
+            )
+        )
+    result = await db.execute(query)
+    stored = result.first()
+    # The row is all we need; give the connection back before streaming
+    await db.close()
+    if stored is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    storage = file_handler.storage
+    stored_object = await storage.stat(stored.file_url)
+    if stored_object is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    media_type = stored.mime_type or mimetypes.guess_type(stored.file_name)[0] or "application/octet-stream"
+    return StoredFileResponse(
+        storage,
+        stored.file_url,
+        stored_object,
+        request_headers=request.headers,
+        media_type=media_type,
+        filename=stored.file_name,
+        method=request.method,
+    )
+
+@router.delete(
+    "/files/{file_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete an uploaded file",
+    description="Removes the file record; the stored bytes go once no other upload shares them."
+)
+async def delete_file(
+    file_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    await delete_uploaded_file(db, file_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
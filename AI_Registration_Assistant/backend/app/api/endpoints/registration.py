@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.schemas.registration import RegistrationCreate, RegistrationResponse
+from app.schemas.registration import RegistrationResponse, CompanyDetail, BulkImportResponse, CompanySearchResponse
 from app.services.registration import RegistrationService
-from app.database.database import get_db
+from app.services.registration_form import RegistrationForm, REGISTRATION_FORM_SCHEMA, read_registration_form
+from app.services.bulk_import import BulkImportService, BulkImportUpload, BULK_IMPORT_FORM_SCHEMA, read_bulk_import_file
+from app.services.company_cache import company_cache, make_cached_response, etag_matches
+from app.services.company_search import company_search
+from app.services.auth_service import get_current_admin_user
+from app.database.database import get_async_db
+from app.models.models import User as UserModel
 
 router = APIRouter()
 
@@ -18,55 +23,114 @@ router = APIRouter()
     Register a new company with the following details:
     - Company information (name and area of service)
     - Applicant details (name, email, phone)
-    - Optional file uploads
-    """
+    - Optional file uploads, sent in the request or as completed resumable uploads
+    """,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"multipart/form-data": {"schema": REGISTRATION_FORM_SCHEMA}},
+        }
+    }
 )
 async def register_company(
-    company_data: RegistrationCreate = Depends(RegistrationCreate.as_form),
-    files: Optional[List[UploadFile]] = File(None, description="Optional file uploads"),
-    db: Session = Depends(get_db)
+    form: RegistrationForm = Depends(read_registration_form),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new company with applicant and optional file uploads.
     
     - **company_name**: Name of the company (required)
     - **area_of_service**: Area or industry the company serves (optional)
-    - **applicant**: Object containing applicant details (required)
-    - **files**: Optional list of files to upload (max 10 files, 10MB each)
+    - **applicant[full_name]**, **applicant[email]**, **applicant[phone]**: Applicant details
+    - **files**: Optional files to upload (max 10 files, 10MB each), streamed straight to storage
+    - **upload_ids**: Optional IDs of completed uploads from `/uploads`
     """
-    # Validate file uploads if any
-    if files:
-        # Limit number of files
-        if len(files) > 10:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Maximum 10 files allowed per registration"
-            )
-        
-        # Validate file size (10MB max per file)
-        max_size = 10 * 1024 * 1024  # 10MB
-        for file in files:
-            if file.size > max_size:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File {file.filename} exceeds maximum size of 10MB"
-                )
-    
-    # Process the registration
     registration_service = RegistrationService(db)
-    return await registration_service.register_company(company_data, files)
+    return await registration_service.register_company(form.data, form.stored_files, form.upload_ids)
+
+@router.post(
+    "/register/bulk",
+    response_model=BulkImportResponse,
+    summary="Bulk import companies and applicants from CSV or NDJSON",
+    description="""
+    Import many registrations in one request. The file is streamed and
+    inserted in batches; rows with a duplicate company name or applicant
+    email are reported individually without failing the rest of the import.
+    Requires an admin account.
+    """,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"multipart/form-data": {"schema": BULK_IMPORT_FORM_SCHEMA}},
+        }
+    }
+)
+async def bulk_register_companies(
+    current_user: UserModel = Depends(get_current_admin_user),
+    upload: BulkImportUpload = Depends(read_bulk_import_file),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Bulk import registrations.
+
+    - **CSV** columns: `company_name`, `area_of_service`, `applicant[full_name]`,
+      `applicant[email]`, `applicant[phone]`
+    - **NDJSON**: one `RegistrationCreate` object per line
+    - Files are limited to `BULK_IMPORT_MAX_BYTES` and `BULK_IMPORT_MAX_ROWS` rows
+    """
+    bulk_import_service = BulkImportService(db)
+    return await bulk_import_service.import_file(upload.file, upload.format)
+
+@router.get(
+    "/companies/search",
+    response_model=CompanySearchResponse,
+    summary="Autocomplete company names and check for duplicates",
+    description="Prefix and fuzzy matches on company names, with a flag for an exact match"
+)
+async def search_companies(
+    q: str = Query(..., min_length=1, max_length=255, description="Company name as typed so far"),
+    limit: int = Query(10, ge=1, le=25),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Suggest registered company names for a partial name.
+
+    - **exact**: true if a company with exactly this name is registered, so
+      registering it would fail
+    - **matches**: names starting with the query first, then similar names
+
+    Meant to be called on every keystroke: results are cached in memory
+    and cleared whenever a company is registered.
+    """
+    entry = await company_search.search(db, q, limit)
+    return Response(content=entry.body, media_type="application/json")
 
 @router.get(
     "/companies/{company_id}",
+    response_model=CompanyDetail,
     summary="Get company details by ID",
-    description="Retrieve company details including applicants and uploaded files"
+    description="Retrieve company details including applicants and uploaded files",
+    responses={304: {"description": "Not modified since the ETag in If-None-Match"}}
 )
 async def get_company(
     company_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get company details by ID including related applicants and files
+    Get company details by ID including related applicants and files.
+
+    Responses are served from a read-through cache and carry a strong ETag;
+    a matching `If-None-Match` returns 304 without querying the database.
     """
-    registration_service = RegistrationService(db)
-    return registration_service.get_company_by_id(company_id)
+    entry = await company_cache.get(company_id)
+    if entry is None:
+        registration_service = RegistrationService(db)
+        company = await registration_service.get_company_by_id(company_id)
+        entry = make_cached_response(CompanyDetail.from_orm(company).json().encode())
+        await company_cache.set(company_id, entry)
+    
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
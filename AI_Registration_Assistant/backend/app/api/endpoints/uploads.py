@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, Header, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from uuid import UUID
+
+from app.schemas.registration import UploadSessionCreate, UploadSessionResponse
+from app.services.upload_sessions import UploadSessionService
+from app.services.auth_service import get_current_active_user
+from app.database.database import get_async_db
+from app.models.models import User as UserModel
+
+router = APIRouter()
+
+@router.post(
+    "/uploads",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a resumable upload",
+    description="""
+    Create an upload session for one file of a known size. Send its bytes
+    with `PUT /uploads/{upload_id}`, complete it, then pass the id to
+    `/register` as `upload_ids`. Requires a login; only the user who created
+    a session (or an admin) can see and use it.
+    """
+)
+async def create_upload(
+    upload: UploadSessionCreate,
+    current_user: UserModel = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await UploadSessionService(db, current_user).create_session(upload)
+
+@router.get(
+    "/uploads/{upload_id}",
+    response_model=UploadSessionResponse,
+    summary="Get the state of a resumable upload",
+    description="`received_bytes` is the offset the next byte range must start at."
+)
+async def get_upload(
+    upload_id: UUID,
+    current_user: UserModel = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await UploadSessionService(db, current_user).get_session(upload_id)
+
+@router.put(
+    "/uploads/{upload_id}",
+    response_model=UploadSessionResponse,
+    summary="Upload a byte range",
+    description="""
+    Send raw bytes with `Content-Range: bytes start-end/total`, where `start`
+    is the session's `received_bytes`. The body is streamed to storage; if the
+    connection drops, whatever arrived is kept and the upload resumes from
+    the offset reported by `GET /uploads/{upload_id}`.
+    """
+)
+async def upload_range(
+    upload_id: UUID,
+    request: Request,
+    content_range: Optional[str] = Header(None),
+    current_user: UserModel = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await UploadSessionService(db, current_user).write_range(upload_id, content_range, request.stream())
+
+@router.post(
+    "/uploads/{upload_id}/complete",
+    response_model=UploadSessionResponse,
+    summary="Finish a resumable upload",
+    description="Fails with 409 until every byte has been received."
+)
+async def complete_upload(
+    upload_id: UUID,
+    current_user: UserModel = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await UploadSessionService(db, current_user).complete_session(upload_id)
+
+@router.delete(
+    "/uploads/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Abandon a resumable upload"
+)
+async def delete_upload(
+    upload_id: UUID,
+    current_user: UserModel = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    await UploadSessionService(db, current_user).delete_session(upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -7,15 +7,118 @@ load_dotenv()
 # Database settings
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/ai_registration")
 TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "postgresql://postgres:postgres@db:5432/test_ai_registration")
+# Async driver URL used by request handlers; derived from DATABASE_URL unless set explicitly
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+)
+
+# Connection pool settings (applied to both the sync and the async engine)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds; -1 disables
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Driver / statement settings
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))  # seconds
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 disables
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))  # asyncpg; 0 for pgbouncer
 
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-for-development-only")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Authenticated principal cache (entries never outlive the token's exp)
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_INVALIDATION_FILE = os.getenv("PRINCIPAL_INVALIDATION_FILE", "")  # shared by workers; empty uses the temp dir
+
+# Password hashing settings (bcrypt runs in a process pool; 0 uses the threadpool)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
 # API settings
 API_V1_STR = "/api/v1"
 
+# Admission control: per-client token buckets and per-process concurrency caps
+ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() in ("1", "true", "yes")
+ADMISSION_BACKEND = os.getenv("ADMISSION_BACKEND", "memory").lower()  # memory or redis (shared by workers)
+ADMISSION_REDIS_URL = os.getenv("ADMISSION_REDIS_URL", "")  # e.g. redis://localhost:6379/0
+UPLOAD_RATE_PER_SECOND = float(os.getenv("UPLOAD_RATE_PER_SECOND", "1"))  # per client IP and per user
+UPLOAD_BURST = int(os.getenv("UPLOAD_BURST", "20"))
+MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", "32"))  # per process; 0 disables
+LOGIN_RATE_PER_SECOND = float(os.getenv("LOGIN_RATE_PER_SECOND", "0.2"))  # per client IP
+LOGIN_BURST = int(os.getenv("LOGIN_BURST", "5"))
+MAX_CONCURRENT_LOGINS = int(os.getenv("MAX_CONCURRENT_LOGINS", str(max(PASSWORD_HASH_WORKERS, 1) * 4)))  # per process
+
+# Observability settings
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# On-demand request profiling (off unless a token or a sample rate is set)
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")  # value expected in X-Profile-Token
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))  # fraction of requests
+PROFILING_DIR = os.getenv("PROFILING_DIR", "profiles")
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "1"))  # stack sampling interval
+
+# Upload settings
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")  # local storage root and resumable upload staging area
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(10 * 1024 * 1024)))  # 10MB per file
+MAX_UPLOAD_FILES = int(os.getenv("MAX_UPLOAD_FILES", "10"))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))  # streaming buffer size
+# Sniffed MIME types accepted for uploads; "type/*" matches a whole family, empty accepts anything
+ALLOWED_UPLOAD_MIME_TYPES = [
+    mime_type.strip()
+    for mime_type in os.getenv(
+        "ALLOWED_UPLOAD_MIME_TYPES",
+        "application/pdf,image/*,text/plain,text/csv,application/msword,application/rtf,text/rtf,"
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document,"
+        "application/vnd.ms-excel,application/vnd.openxmlformats-officedocument.spreadsheetml.sheet,"
+        "application/vnd.oasis.opendocument.text,application/vnd.oasis.opendocument.spreadsheet"
+    ).split(",")
+    if mime_type.strip()
+]
+MAX_FORM_FIELDS = int(os.getenv("MAX_FORM_FIELDS", "50"))  # non-file parts per registration request
+MAX_FORM_FIELD_SIZE = int(os.getenv("MAX_FORM_FIELD_SIZE", str(64 * 1024)))  # bytes per non-file part
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(256 * 1024)))  # read size when sendfile is unavailable
+MAX_RESUMABLE_UPLOAD_SIZE = int(os.getenv("MAX_RESUMABLE_UPLOAD_SIZE", str(1024 * 1024 * 1024)))  # 1GB per upload session
+UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(24 * 3600)))  # idle time before an unregistered upload is deleted
+UPLOAD_SESSION_CLEANUP_SECONDS = float(os.getenv("UPLOAD_SESSION_CLEANUP_SECONDS", "600"))  # 0 disables cleanup in this process
+
+# Storage backend for uploaded files: "local" (sharded under UPLOAD_DIR) or "s3"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_PREFIX = os.getenv("S3_PREFIX", "")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "")  # e.g. http://localhost:9000 for MinIO
+S3_REGION = os.getenv("S3_REGION", "")
+S3_PART_SIZE = int(os.getenv("S3_PART_SIZE", str(8 * 1024 * 1024)))  # multipart part size (min 5MB)
+
+# Background document pipeline (jobs are stored in Postgres; 0 workers disables it in this process)
+DOCUMENT_WORKERS = int(os.getenv("DOCUMENT_WORKERS", "2"))
+DOCUMENT_POLL_INTERVAL_SECONDS = float(os.getenv("DOCUMENT_POLL_INTERVAL_SECONDS", "2"))
+DOCUMENT_JOB_MAX_ATTEMPTS = int(os.getenv("DOCUMENT_JOB_MAX_ATTEMPTS", "5"))
+DOCUMENT_JOB_LEASE_SECONDS = int(os.getenv("DOCUMENT_JOB_LEASE_SECONDS", "300"))  # reclaim jobs of crashed workers
+
+# Company detail response cache (in-process LRU plus optional shared directory)
+COMPANY_CACHE_SIZE = int(os.getenv("COMPANY_CACHE_SIZE", "1024"))
+COMPANY_CACHE_TTL_SECONDS = float(os.getenv("COMPANY_CACHE_TTL_SECONDS", "300"))
+COMPANY_CACHE_DIR = os.getenv("COMPANY_CACHE_DIR", "")  # empty disables the shared cache
+COMPANY_SEARCH_CACHE_SIZE = int(os.getenv("COMPANY_SEARCH_CACHE_SIZE", "4096"))  # cached autocomplete queries
+COMPANY_SEARCH_CACHE_TTL_SECONDS = float(os.getenv("COMPANY_SEARCH_CACHE_TTL_SECONDS", "30"))
+
+# Bloom filters ruling out taken company names / applicant emails without a query.
+# A value taken through another worker can pass the pre-check until the next
+# rebuild; the insert still rejects it with 409, after the files are stored.
+REGISTRATION_FILTER_ENABLED = os.getenv("REGISTRATION_FILTER_ENABLED", "true").lower() in ("1", "true", "yes")
+REGISTRATION_FILTER_ERROR_RATE = float(os.getenv("REGISTRATION_FILTER_ERROR_RATE", "0.01"))  # target false-positive rate
+REGISTRATION_FILTER_MIN_CAPACITY = int(os.getenv("REGISTRATION_FILTER_MIN_CAPACITY", "100000"))  # items per filter
+REGISTRATION_FILTER_REBUILD_SECONDS = float(os.getenv("REGISTRATION_FILTER_REBUILD_SECONDS", "300"))  # 0 loads once
+
+# Bulk import settings
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "500"))
+BULK_IMPORT_MAX_BYTES = int(os.getenv("BULK_IMPORT_MAX_BYTES", str(50 * 1024 * 1024)))  # 50MB per import file
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "100000"))  # rows read per import
+
 # CORS settings
 CORS_ORIGINS = [
     "http://localhost:3000",  # Frontend in development
@@ -1,3 +1,9 @@
-from app.database.database import Base, engine, SessionLocal, get_db
+from app.database.database import (
+    Base, SessionLocal, AsyncSessionLocal, get_db, get_async_db,
+    get_engine, get_async_engine, dispose_engines
+)
 
-__all__ = ["Base", "engine", "SessionLocal", "get_db"]
+__all__ = [
+    "Base", "SessionLocal", "AsyncSessionLocal", "get_db", "get_async_db",
+    "get_engine", "get_async_engine", "dispose_engines"
+]
@@ -1,14 +1,108 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from app.config.settings import DATABASE_URL
+from app.config.settings import (
+    DATABASE_URL, ASYNC_DATABASE_URL,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    DB_CONNECT_TIMEOUT, DB_STATEMENT_TIMEOUT_MS, DB_STATEMENT_CACHE_SIZE,
+)
+from app.database.pool import TimedQueuePool, TimedAsyncAdaptedQueuePool
+from app.utils.instrumentation import instrument_engine
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# Pool options shared by both engines
+POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+def _psycopg2_connect_args() -> dict:
+    connect_args = {"connect_timeout": DB_CONNECT_TIMEOUT}
+    if DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    return connect_args
+
+def _asyncpg_connect_args() -> dict:
+    connect_args = {
+        "timeout": DB_CONNECT_TIMEOUT,
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    }
+    if DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+    return connect_args
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to its engine the first time a session is made"""
+
+    def __init__(self, engine_factory, **kw):
+        super().__init__(**kw)
+        self._engine_factory = engine_factory
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=self._engine_factory())
+        return super().__call__(**local_kw)
+
+_engine = None
+_async_engine = None
+
+def get_engine():
+    """Return the SQLAlchemy engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            DATABASE_URL,
+            poolclass=TimedQueuePool,
+            connect_args=_psycopg2_connect_args(),
+            **POOL_OPTIONS
+        )
+        instrument_engine(_engine)
+    return _engine
+
+def get_async_engine():
+    """Return the async engine (asyncpg) used by request handlers, creating it on first use"""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=TimedAsyncAdaptedQueuePool,
+            connect_args=_asyncpg_connect_args(),
+            **POOL_OPTIONS
+        )
+        instrument_engine(_async_engine.sync_engine)
+    return _async_engine
+
+async def dispose_engines() -> None:
+    """Close pooled connections of any engine that was created"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+def __getattr__(name):
+    # Keep ``from app.database.database import engine`` working without
+    # creating the engines at import time
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = LazySessionmaker(get_engine, autocommit=False, autoflush=False)
+
+# Create AsyncSessionLocal class. Objects stay usable after commit so that
+# handlers can return them without triggering a lazy refresh.
+AsyncSessionLocal = LazySessionmaker(
+    get_async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 # Create Base class
 Base = declarative_base()
@@ -20,3 +114,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,36 @@
+"""
+Explicit schema setup step.
+
+Creates any missing tables for all models, plus the Postgres extensions and
+indexes that models cannot declare. Run it once per deployment (or after
+``alembic upgrade head``) instead of at application start-up:
+
+    python -m app.database.init_db
+"""
+from sqlalchemy import text
+
+from app.database.database import Base, get_engine
+
+# Company name search (pg_trgm similarity and its GIN index); same as
+# migration 007. Every statement is idempotent.
+POSTGRES_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_company_name_trgm "
+    "ON company USING gin (lower(company_name) gin_trgm_ops)",
+]
+
+def init_db() -> None:
+    # Import models so they are registered on Base.metadata
+    import app.models.models  # noqa: F401
+    import app.models.registration  # noqa: F401
+
+    engine = get_engine()
+    with engine.begin() as conn:
+        Base.metadata.create_all(bind=conn)
+        if conn.dialect.name == "postgresql":
+            for statement in POSTGRES_SETUP:
+                conn.execute(text(statement))
+
+if __name__ == "__main__":
+    init_db()
+    print("Database schema is up to date")
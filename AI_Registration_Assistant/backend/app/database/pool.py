@@ -0,0 +1,79 @@
+import time
+from threading import Lock
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class PoolWaitStats:
+    """Running totals of how long callers waited to check out a connection"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def as_dict(self) -> dict:
+        attempts = self.checkouts + self.timeouts
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.total_wait, 6),
+            "wait_seconds_avg": round(self.total_wait / attempts, 6) if attempts else 0.0,
+            "wait_seconds_max": round(self.max_wait, 6),
+        }
+
+class _TimedCheckoutMixin:
+    """Record checkout wait time on a QueuePool; stats survive pool.recreate()"""
+
+    wait_stats: PoolWaitStats = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.wait_stats is None:
+            self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_status(pool) -> dict:
+    """Snapshot of a pool's connections plus its checkout wait statistics"""
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.as_dict())
+    return status
@@ -1,42 +1,116 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-import os
 
-from app.api.endpoints import registration
-from app.database.database import engine, Base
+from app.api.endpoints import files, registration, uploads
+from app.routers import admin, auth, users
+from app.config.settings import (
+    API_V1_STR, METRICS_ENABLED,
+    ADMISSION_CONTROL_ENABLED, ADMISSION_BACKEND, ADMISSION_REDIS_URL,
+    PROFILING_TOKEN, PROFILING_SAMPLE_RATE, PROFILING_DIR, PROFILING_INTERVAL_MS,
+)
+from app.database.database import dispose_engines
+from app.services.document_pipeline import document_pipeline
+from app.services.registration_filter import registration_filter
+from app.services.upload_sessions import upload_session_reaper
+from app.utils.password_hasher import shutdown_hash_executor
+from app.utils.admission import AdmissionControlMiddleware, default_policies
+from app.utils.instrumentation import MetricsMiddleware
+from app.utils.metrics import registry
+from app.utils.profiling import ProfilingMiddleware
+from app.utils.rate_limit import create_rate_limit_backend
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+def create_app(admission_control: bool = ADMISSION_CONTROL_ENABLED) -> FastAPI:
+    """
+    Build the API application.
 
-app = FastAPI(
-    title="AI Registration Assistant API",
-    description="API for company and applicant registration with file uploads",
-    version="1.0.0"
-)
+    Creating the app has no side effects: the database engines, the upload
+    directory and the hashing pool are all initialized on first use, the
+    document workers start with the server's event loop, and the
+    schema is managed by an explicit step (``python -m app.database.init_db``
+    or Alembic), never at start-up. ``admission_control`` overrides
+    ADMISSION_CONTROL_ENABLED, e.g. for benchmarks that send every request
+    from one client.
+    """
+    app = FastAPI(
+        title="AI Registration Assistant API",
+        description="API for company and applicant registration with file uploads",
+        version="1.0.0"
+    )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with your frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    # Shed excess uploads and logins before their bodies are read. Added
+    # first so it runs inside CORS and refusals still carry CORS headers.
+    rate_limit_backend = None
+    if admission_control:
+        rate_limit_backend = create_rate_limit_backend(ADMISSION_BACKEND, ADMISSION_REDIS_URL)
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            policies=default_policies(),
+            backend=rate_limit_backend,
+        )
 
-# Include API routers
-app.include_router(
-    registration.router,
-    prefix="/api/v1",
-    tags=["registration"]
-)
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with your frontend URL
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Per-route latency, in-flight and SQL metrics
+    if METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware, routes_app=app)
+
+    # Opt-in request profiling; not installed at all unless configured
+    if PROFILING_TOKEN or PROFILING_SAMPLE_RATE > 0:
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=PROFILING_DIR,
+            token=PROFILING_TOKEN,
+            sample_rate=PROFILING_SAMPLE_RATE,
+            interval=PROFILING_INTERVAL_MS / 1000,
+        )
+
+    # Include API routers
+    app.include_router(registration.router, prefix=API_V1_STR, tags=["registration"])
+    app.include_router(uploads.router, prefix=API_V1_STR, tags=["uploads"])
+    app.include_router(files.router, prefix=API_V1_STR, tags=["files"])
+    app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
+    app.include_router(users.router, prefix="/api/users", tags=["Users"])
+    app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+
+    @app.get("/")
+    async def root():
+        return {"message": "AI Registration Assistant API is running"}
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    if METRICS_ENABLED:
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+    @app.on_event("startup")
+    async def startup():
+        # Background document processing (no-op when DOCUMENT_WORKERS is 0)
+        document_pipeline.start()
+        # Loads in the background; pre-checks query Postgres until it is ready
+        registration_filter.start()
+        # Deletes unregistered uploads idle for UPLOAD_SESSION_TTL_SECONDS
+        upload_session_reaper.start()
 
-# Create uploads directory if it doesn't exist
-os.makedirs("uploads", exist_ok=True)
+    @app.on_event("shutdown")
+    async def shutdown():
+        await document_pipeline.stop()
+        await registration_filter.stop()
+        await upload_session_reaper.stop()
+        if rate_limit_backend is not None:
+            await rate_limit_backend.close()
+        shutdown_hash_executor()
+        await dispose_engines()
 
-# Serve static files (for uploaded files in development)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+    return app
 
-@app.get("/")
-async def root():
-    return {"message": "AI Registration Assistant API is running"}
+app = create_app()
@@ -1,4 +1,4 @@
 from app.models.models import User, Profile, Registration, Event
-from app.database.database import Base, engine
+from app.database.database import Base
 
-__all__ = ["User", "Profile", "Registration", "Event", "Base", "engine"]
+__all__ = ["User", "Profile", "Registration", "Event", "Base"]
@@ -2,7 +2,7 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, T
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.database.database import Base, engine
+from app.database.database import Base
 
 class User(Base):
     __tablename__ = "users"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, BigInteger, Integer, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -31,14 +31,66 @@ class Applicant(Base):
     # Relationships
     company = relationship("Company", back_populates="applicants")
 
+class FileBlob(Base):
+    """One stored copy of a unique file content, shared by every upload of it"""
+    __tablename__ = "file_blob"
+
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(String(512), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
 class UploadedFile(Base):
     __tablename__ = "uploaded_file"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     company_id = Column(UUID(as_uuid=True), ForeignKey("company.id", ondelete="CASCADE"), nullable=False)
     file_name = Column(String(255), nullable=False)
-    file_url = Column(String(512), nullable=False)
+    file_url = Column(String(512), nullable=False)  # the blob's storage key
+    blob_sha256 = Column(String(64), ForeignKey("file_blob.sha256"), nullable=True, index=True)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
+    # Sniffed on upload; the rest is filled in by the background document pipeline
+    mime_type = Column(String(255), nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    sha256 = Column(String(64), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Relationships
     company = relationship("Company", back_populates="files")
+
+class DocumentJob(Base):
+    """Durable queue entry for post-processing an uploaded file"""
+    __tablename__ = "document_job"
+    __table_args__ = (
+        Index("ix_document_job_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    file_id = Column(UUID(as_uuid=True), ForeignKey("uploaded_file.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+class UploadSession(Base):
+    """A resumable upload; its bytes are appended at received_bytes until complete"""
+    __tablename__ = "upload_session"
+    __table_args__ = (
+        Index("ix_upload_session_status_updated_at", "status", "updated_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    file_name = Column(String(255), nullable=False)
+    total_size = Column(BigInteger, nullable=False)
+    received_bytes = Column(BigInteger, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="uploading")  # uploading, completing, complete, consumed
+    created_by = Column(Integer, nullable=True)  # id of the user who started the upload
+    file_url = Column(String(512), nullable=True)  # set once complete
+    sha256 = Column(String(64), nullable=True)  # set once complete
+    mime_type = Column(String(255), nullable=True)  # set once complete
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import get_engine, get_async_engine, get_async_db
+from app.database.pool import pool_status
+from app.services.auth_service import get_current_admin_user
+from app.services.file_blobs import dedup_report
+from app.services.company_search import company_search
+from app.services.principal_cache import principal_cache
+from app.services.registration_filter import registration_filter
+from app.models.models import User as UserModel
+
+router = APIRouter()
+
+@router.get("/cache")
+async def read_cache_stats(
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """Hit/miss counters for the in-process caches"""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "company_search_cache": company_search.cache.stats(),
+        "registration_filter": registration_filter.stats(),
+    }
+
+@router.get("/pool")
+async def read_pool_stats(
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """Connection pool usage for the sync and async engines"""
+    return {
+        "sync": pool_status(get_engine().pool),
+        "async": pool_status(get_async_engine().pool),
+    }
+
+@router.get("/storage/dedup")
+async def read_dedup_report(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """Unique blobs vs. uploads referencing them, and the bytes deduplication saves"""
+    return await dedup_report(db)
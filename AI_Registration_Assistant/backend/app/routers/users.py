@@ -1,73 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from app.database.database import get_db
+from app.database.database import get_async_db, AsyncSessionLocal
 from app.services.user_service import (
-    get_user, get_users, create_user, update_user, delete_user
+    get_user, get_users, stream_users, create_user, update_user, delete_user
 )
 from app.services.auth_service import get_current_active_user, get_current_admin_user
-from app.schemas.schemas import User, UserCreate, UserUpdate
+from app.schemas.schemas import User, UserCreate, UserUpdate, UserPage
 from app.models.models import User as UserModel
 
 router = APIRouter()
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-def create_new_user(
+async def create_new_user(
     user: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return create_user(db=db, user=user)
+    return await create_user(db=db, user=user)
 
 @router.get("/me", response_model=User)
-def read_users_me(
+async def read_users_me(
     current_user: UserModel = Depends(get_current_active_user)
 ):
     return current_user
 
 @router.put("/me", response_model=User)
-def update_user_me(
+async def update_user_me(
     user_update: UserUpdate,
     current_user: UserModel = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return update_user(db=db, user_id=current_user.id, user_update=user_update)
+    return await update_user(db=db, user_id=current_user.id, user_update=user_update)
 
-@router.get("/", response_model=List[User])
-def read_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+@router.get("/", response_model=UserPage)
+async def read_users(
+    cursor: Optional[str] = Query(None, description="Continuation token from a previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_admin_user)
 ):
-    users = get_users(db, skip=skip, limit=limit)
-    return users
+    users, next_cursor = await get_users(db, cursor=cursor, limit=limit)
+    return {"items": users, "next_cursor": next_cursor}
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """Stream every user as newline-delimited JSON"""
+    async def ndjson():
+        # Own session: the stream outlives the request's dependencies
+        async with AsyncSessionLocal() as db:
+            async for row in stream_users(db):
+                yield User.from_orm(row).json() + "\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 @router.get("/{user_id}", response_model=User)
-def read_user(
+async def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_admin_user)
 ):
-    db_user = get_user(db, user_id=user_id)
+    db_user = await get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
 
 @router.put("/{user_id}", response_model=User)
-def update_user_by_id(
+async def update_user_by_id(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_admin_user)
 ):
-    return update_user(db=db, user_id=user_id, user_update=user_update)
+    return await update_user(db=db, user_id=user_id, user_update=user_update)
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_by_id(
+async def delete_user_by_id(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_admin_user)
 ):
-    delete_user(db=db, user_id=user_id)
+    await delete_user(db=db, user_id=user_id)
     return None
@@ -1,5 +1,5 @@
 from app.schemas.schemas import (
-    User, UserCreate, UserUpdate, UserInDB,
+    User, UserCreate, UserUpdate, UserInDB, UserPage,
     Profile, ProfileCreate, ProfileUpdate, ProfileInDB,
     Event, EventCreate, EventUpdate, EventInDB,
     Registration, RegistrationCreate, RegistrationUpdate, RegistrationInDB,
@@ -7,7 +7,7 @@ from app.schemas.schemas import (
 )
 
 __all__ = [
-    "User", "UserCreate", "UserUpdate", "UserInDB",
+    "User", "UserCreate", "UserUpdate", "UserInDB", "UserPage",
     "Profile", "ProfileCreate", "ProfileUpdate", "ProfileInDB",
     "Event", "EventCreate", "EventUpdate", "EventInDB",
     "Registration", "RegistrationCreate", "RegistrationUpdate", "RegistrationInDB",
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, EmailStr, Field, ValidationError
+from typing import Optional, List, Mapping
 from datetime import datetime
 from uuid import UUID
 
@@ -17,12 +18,34 @@ class RegistrationCreate(BaseModel):
     area_of_service: Optional[str] = Field(None, max_length=255)
     applicant: ApplicantBase
 
+    @classmethod
+    def from_form(cls, fields: Mapping[str, str]) -> "RegistrationCreate":
+        """
+        Build from form fields, using ``applicant[full_name]``,
+        ``applicant[email]`` and ``applicant[phone]`` for the nested applicant.
+        Blank optional fields count as missing.
+        """
+        applicant = {
+            key[len("applicant["):-1]: value or None
+            for key, value in fields.items()
+            if key.startswith("applicant[") and key.endswith("]")
+        }
+        try:
+            return cls(
+                company_name=fields.get("company_name"),
+                area_of_service=fields.get("area_of_service") or None,
+                applicant=applicant
+            )
+        except ValidationError as e:
+            raise RequestValidationError(e.raw_errors)
+
 class RegistrationResponse(BaseModel):
     success: bool
     company_id: UUID
     message: str = "Registration successful"
 
     class Config:
+        orm_mode = True
         from_attributes = True
 
 class CompanyResponse(BaseModel):
@@ -31,6 +54,7 @@ class CompanyResponse(BaseModel):
     created_at: datetime
 
     class Config:
+        orm_mode = True
         from_attributes = True
 
 class ApplicantResponse(ApplicantBase):
@@ -39,12 +63,65 @@ class ApplicantResponse(ApplicantBase):
     company_id: UUID
 
     class Config:
+        orm_mode = True
         from_attributes = True
 
 class FileResponse(FileCreate):
     id: UUID
     company_id: UUID
     uploaded_at: datetime
+    # Null until the background pipeline has processed the file
+    mime_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+    sha256: Optional[str] = None
+    processed_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
+
+class CompanyDetail(CompanyResponse):
+    area_of_service: Optional[str] = None
+    applicants: List[ApplicantResponse] = []
+    files: List[FileResponse] = []
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
+
+class CompanySuggestion(BaseModel):
+    id: UUID
+    company_name: str
+    similarity: float
+
+class CompanySearchResponse(BaseModel):
+    query: str
+    exact: bool = Field(..., description="A company with exactly this name is already registered")
+    matches: List[CompanySuggestion] = []
+
+class BulkImportIssue(BaseModel):
+    row: int
+    company_name: Optional[str] = None
+    reason: str
+
+class BulkImportResponse(BaseModel):
+    total_rows: int = 0
+    inserted: int = 0
+    conflicts: List[BulkImportIssue] = []
+    errors: List[BulkImportIssue] = []
+
+class UploadSessionCreate(BaseModel):
+    file_name: str = Field(..., max_length=255)
+    size: int = Field(..., gt=0, description="Total size of the file in bytes")
+
+class UploadSessionResponse(BaseModel):
+    id: UUID
+    file_name: str
+    total_size: int
+    received_bytes: int
+    status: str
+    created_at: datetime
 
     class Config:
+        orm_mode = True
         from_attributes = True
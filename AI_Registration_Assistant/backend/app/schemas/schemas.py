@@ -30,6 +30,10 @@ class UserInDB(UserBase):
 class User(UserInDB):
     pass
 
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[str] = None
+
 # Profile schemas
 class ProfileBase(BaseModel):
     avatar_url: Optional[str] = None
@@ -1,6 +1,6 @@
 from app.services.user_service import (
-    get_password_hash, verify_password,
-    get_user, get_user_by_email, get_user_by_username, get_users,
+    get_password_hash, verify_password, get_password_hash_async, verify_password_async,
+    get_user, get_user_by_email, get_user_by_username, get_users, stream_users,
     create_user, update_user, delete_user
 )
 from app.services.auth_service import (
@@ -9,8 +9,8 @@ from app.services.auth_service import (
 )
 
 __all__ = [
-    "get_password_hash", "verify_password",
-    "get_user", "get_user_by_email", "get_user_by_username", "get_users",
+    "get_password_hash", "verify_password", "get_password_hash_async", "verify_password_async",
+    "get_user", "get_user_by_email", "get_user_by_username", "get_users", "stream_users",
     "create_user", "update_user", "delete_user",
     "authenticate_user", "create_access_token",
     "get_current_user", "get_current_active_user", "get_current_admin_user"
@@ -1,23 +1,25 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.database import get_db
+from app.database.database import get_async_db
 from app.models.models import User
 from app.schemas.schemas import TokenData
-from app.services.user_service import get_user_by_username, verify_password
+from app.services.user_service import get_user_by_username, verify_password_async
+from app.services.principal_cache import principal_cache
 from app.config.settings import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
-    user = get_user_by_username(db, username)
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+    user = await get_user_by_username(db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
@@ -33,7 +35,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,9 +51,21 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = get_user_by_username(db, username=token_data.username)
+    user = principal_cache.get(token_data.username)
+    if user is not None:
+        return user
+    
+    # Before the read, so that an account change racing it invalidates the entry
+    loaded_at = time.time_ns()
+    user = await get_user_by_username(db, username=token_data.username)
     if user is None:
         raise credentials_exception
+    
+    # Cache a detached copy for at most the remaining lifetime of the token
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        db.expunge(user)
+        principal_cache.set(token_data.username, user, loaded_at, ttl=expires_at - time.time())
     return user
 
 async def get_current_active_user(
@@ -0,0 +1,303 @@
+import codecs
+import csv
+import io
+import json
+import tempfile
+from typing import AsyncIterator, BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+from uuid import uuid4
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import (
+    BULK_IMPORT_BATCH_SIZE, BULK_IMPORT_MAX_BYTES, BULK_IMPORT_MAX_ROWS, MAX_FORM_FIELD_SIZE,
+)
+from app.models.registration import Company, Applicant
+from app.schemas.registration import RegistrationCreate, BulkImportIssue, BulkImportResponse
+from app.services.company_search import company_search
+from app.services.registration_filter import registration_filter
+from app.utils.multipart_stream import FileData, FileStart, iter_multipart
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+
+# Rows are (row number, parsed registration or validation error message)
+ParsedRow = Tuple[int, object]
+
+# Multipart field holding the import file
+FILE_FIELD = "file"
+
+# Imports up to this size are spooled in memory, larger ones to a temporary file
+SPOOL_MEMORY_SIZE = 1024 * 1024
+
+# OpenAPI description of the form, since it is parsed by hand
+BULK_IMPORT_FORM_SCHEMA = {
+    "type": "object",
+    "required": [FILE_FIELD],
+    "properties": {
+        FILE_FIELD: {"type": "string", "format": "binary", "description": "CSV or NDJSON file of registrations"},
+    },
+}
+
+class BulkImportUpload(NamedTuple):
+    file: BinaryIO
+    format: str
+
+def detect_format(filename: str, content_type: str) -> str:
+    """Pick the import format from the upload's content type or extension"""
+    content_type = (content_type or "").lower()
+    filename = (filename or "").lower()
+    if "ndjson" in content_type or "jsonlines" in content_type or filename.endswith((".ndjson", ".jsonl")):
+        return NDJSON_FORMAT
+    if "csv" in content_type or filename.endswith(".csv"):
+        return CSV_FORMAT
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Bulk import accepts CSV or NDJSON files"
+    )
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Bulk import files are limited to {BULK_IMPORT_MAX_BYTES} bytes"
+    )
+
+async def read_bulk_import_file(request: Request) -> AsyncIterator[BulkImportUpload]:
+    """
+    Spool the ``file`` part of a bulk import request, up to BULK_IMPORT_MAX_BYTES.
+
+    The body is read off the request stream, so an oversized import is
+    refused with 413 as soon as the limit is crossed (or up front from
+    Content-Length) instead of after the whole body has been spooled. The
+    spooled copy is closed once the request is done.
+    """
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > BULK_IMPORT_MAX_BYTES:
+        raise _too_large()
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_SIZE)
+    try:
+        fmt: Optional[str] = None
+        size = 0
+        async for event in iter_multipart(request, 0, MAX_FORM_FIELD_SIZE, 1):
+            if isinstance(event, FileStart):
+                if event.name != FILE_FIELD:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Unexpected file field {event.name}"
+                    )
+                fmt = detect_format(event.filename, event.content_type)
+            elif isinstance(event, FileData):
+                size += len(event.data)
+                if size > BULK_IMPORT_MAX_BYTES:
+                    raise _too_large()
+                await run_in_threadpool(spool.write, event.data)
+        if fmt is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing {FILE_FIELD} part"
+            )
+        spool.seek(0)
+        yield BulkImportUpload(spool, fmt)
+    finally:
+        spool.close()
+
+def _csv_records(stream: io.TextIOBase) -> Iterator[dict]:
+    """
+    CSV rows as RegistrationCreate-shaped dicts.
+
+    Applicant columns use the same names as the registration form:
+    ``applicant[full_name]``, ``applicant[email]`` and ``applicant[phone]``.
+    A row the reader cannot parse (e.g. a field over ``csv.field_size_limit()``)
+    is yielded as its ``csv.Error`` and ends the file, since the reader
+    cannot resynchronize after it.
+    """
+    reader = csv.DictReader(stream)
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield e
+            return
+        applicant = {}
+        data = {}
+        for key, value in record.items():
+            if key is None:
+                continue
+            value = value or None
+            if key.startswith("applicant[") and key.endswith("]"):
+                applicant[key[len("applicant["):-1]] = value
+            else:
+                data[key] = value
+        data["applicant"] = applicant
+        yield data
+
+def _ndjson_records(stream: io.TextIOBase) -> Iterator[object]:
+    for line in stream:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield e
+
+def iter_batches(raw: BinaryIO, fmt: str, batch_size: int, max_rows: int) -> Iterator[List[ParsedRow]]:
+    """
+    Parse an upload lazily and yield validated rows in batches.
+
+    This is a blocking generator meant to be advanced from the threadpool;
+    only one batch is held in memory at a time. Reading stops after
+    ``max_rows`` rows, with an error reported for the first row left out.
+    """
+    stream = codecs.getreader("utf-8-sig")(raw, errors="replace")
+    records = _csv_records(stream) if fmt == CSV_FORMAT else _ndjson_records(stream)
+    batch: List[ParsedRow] = []
+    # Row numbers are 1-based data rows (the CSV header is not counted)
+    for row_number, record in enumerate(records, start=1):
+        if row_number > max_rows:
+            batch.append((row_number, f"Row limit of {max_rows} reached; this and later rows were not imported"))
+            break
+        if isinstance(record, csv.Error):
+            batch.append((row_number, f"Invalid CSV: {record}; this and later rows were not imported"))
+            break
+        if isinstance(record, Exception):
+            batch.append((row_number, f"Invalid JSON: {record}"))
+        else:
+            try:
+                batch.append((row_number, RegistrationCreate.parse_obj(record)))
+            except ValidationError as e:
+                batch.append((row_number, str(e).replace("\n", " ")))
+            except TypeError:
+                batch.append((row_number, "Row must be a JSON object"))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class BulkImportService:
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int = BULK_IMPORT_BATCH_SIZE,
+        max_rows: int = BULK_IMPORT_MAX_ROWS,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+
+    async def import_file(self, raw: BinaryIO, fmt: str) -> BulkImportResponse:
+        """Stream a CSV/NDJSON file into the database one batch at a time"""
+        report = BulkImportResponse()
+        batches = iter_batches(raw, fmt, self.batch_size, self.max_rows)
+        while True:
+            batch = await run_in_threadpool(next, batches, None)
+            if batch is None:
+                break
+            await self._import_batch(batch, report)
+        report.conflicts.sort(key=lambda issue: issue.row)
+        return report
+
+    async def _import_batch(self, batch: List[ParsedRow], report: BulkImportResponse) -> None:
+        """
+        Insert one batch with a multi-row INSERT per table.
+
+        Duplicates are skipped with ON CONFLICT DO NOTHING and reported per
+        row instead of aborting the batch. A company whose applicant email
+        conflicts is removed again in the same transaction.
+        """
+        report.total_rows += len(batch)
+        rows = {}
+        seen_names = set()
+        seen_emails = set()
+        for row_number, parsed in batch:
+            if not isinstance(parsed, RegistrationCreate):
+                report.errors.append(BulkImportIssue(row=row_number, reason=parsed))
+            elif parsed.company_name in seen_names:
+                report.conflicts.append(BulkImportIssue(
+                    row=row_number, company_name=parsed.company_name,
+                    reason="Duplicate company_name in import"
+                ))
+            elif parsed.applicant.email in seen_emails:
+                report.conflicts.append(BulkImportIssue(
+                    row=row_number, company_name=parsed.company_name,
+                    reason="Duplicate applicant email in import"
+                ))
+            else:
+                seen_names.add(parsed.company_name)
+                seen_emails.add(parsed.applicant.email)
+                rows[uuid4()] = (row_number, parsed)
+
+        if not rows:
+            return
+
+        try:
+            result = await self.db.execute(
+                insert(Company)
+                .values([
+                    {
+                        "id": company_id,
+                        "company_name": data.company_name,
+                        "area_of_service": data.area_of_service,
+                    }
+                    for company_id, (_, data) in rows.items()
+                ])
+                .on_conflict_do_nothing(index_elements=[Company.company_name])
+                .returning(Company.id)
+            )
+            inserted_companies = {row.id for row in result}
+
+            applicant_rows = [
+                {
+                    "id": uuid4(),
+                    "company_id": company_id,
+                    "full_name": data.applicant.full_name,
+                    "email": data.applicant.email,
+                    "phone": data.applicant.phone,
+                }
+                for company_id, (_, data) in rows.items()
+                if company_id in inserted_companies
+            ]
+            inserted_applicants = set()
+            if applicant_rows:
+                result = await self.db.execute(
+                    insert(Applicant)
+                    .values(applicant_rows)
+                    .on_conflict_do_nothing(index_elements=[Applicant.email])
+                    .returning(Applicant.company_id)
+                )
+                inserted_applicants = {row.company_id for row in result}
+
+            orphaned = inserted_companies - inserted_applicants
+            if orphaned:
+                await self.db.execute(delete(Company).where(Company.id.in_(orphaned)))
+
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        if inserted_companies - orphaned:
+            company_search.invalidate()
+        for company_id in inserted_companies - orphaned:
+            _, data = rows[company_id]
+            registration_filter.add(data.company_name, data.applicant.email)
+
+        for company_id, (row_number, data) in rows.items():
+            if company_id not in inserted_companies:
+                registration_filter.add(company_name=data.company_name)
+                reason = "Company with this name already exists"
+            elif company_id in orphaned:
+                registration_filter.add(email=data.applicant.email)
+                reason = "Applicant with this email already exists"
+            else:
+                report.inserted += 1
+                continue
+            report.conflicts.append(BulkImportIssue(
+                row=row_number, company_name=data.company_name, reason=reason
+            ))
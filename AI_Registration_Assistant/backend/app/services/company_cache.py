@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config.settings import COMPANY_CACHE_SIZE, COMPANY_CACHE_TTL_SECONDS, COMPANY_CACHE_DIR
+from app.utils.cache import TTLCache
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+def make_cached_response(body: bytes) -> CachedResponse:
+    """Wrap a serialized response body with its strong ETag"""
+    return CachedResponse(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison, per RFC 7232)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+class FileCacheBackend:
+    """
+    Shared on-disk cache so gunicorn workers on one host can reuse each
+    other's serialized responses. Entries are written atomically.
+
+    Invalidating a key deletes its entry and touches a ``<key>.invalidated``
+    marker next to it, which workers compare against their in-process copies.
+    """
+
+    def __init__(self, directory: str, ttl: float):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _marker(self, key: str) -> Path:
+        return self.directory / f"{key}.invalidated"
+
+    def get(self, key: str) -> Optional[Tuple[CachedResponse, int]]:
+        """Return the entry and the ``time.time_ns()`` it was written at"""
+        path = self._path(key)
+        try:
+            written_at = path.stat().st_mtime_ns
+            if time.time_ns() - written_at > self.ttl * 1e9:
+                path.unlink()
+                return None
+            data = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(body=data["body"].encode(), etag=data["etag"]), written_at
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        path = self._path(key)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps({"body": value.body.decode(), "etag": value.etag}))
+        # Explicit timestamp: file systems stamp mtimes from a coarser clock
+        now = time.time_ns()
+        os.utime(temp_path, ns=(now, now))
+        os.replace(temp_path, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        marker = self._marker(key)
+        marker.touch()
+        now = time.time_ns()
+        os.utime(marker, ns=(now, now))
+
+    def invalidated_at(self, key: str) -> int:
+        try:
+            return self._marker(key).stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+class CompanyCache:
+    """
+    Read-through cache of serialized company detail responses.
+
+    Lookups go to the in-process LRU first, then to the optional shared
+    backend. Entries copied from the shared backend keep their remaining
+    lifetime. With a shared backend, each local hit costs one ``stat`` of
+    the company's invalidation marker, so an invalidation in any worker on
+    the host applies everywhere on the next request. Without one, other
+    workers' copies expire within COMPANY_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, local: TTLCache, shared: Optional[FileCacheBackend] = None):
+        self.local = local
+        self.shared = shared
+
+    async def get(self, company_id: UUID) -> Optional[CachedResponse]:
+        key = str(company_id)
+        cached = self.local.get(key)
+        if cached is not None:
+            entry, cached_at = cached
+            if self.shared is None or cached_at > self.shared.invalidated_at(key):
+                return entry
+            self.local.delete(key)
+        if self.shared is None:
+            return None
+        shared = await run_in_threadpool(self.shared.get, key)
+        if shared is None:
+            return None
+        entry, written_at = shared
+        remaining = self.shared.ttl - (time.time_ns() - written_at) / 1e9
+        self.local.set(key, (entry, written_at), ttl=remaining)
+        return entry
+
+    async def set(self, company_id: UUID, entry: CachedResponse) -> None:
+        key = str(company_id)
+        self.local.set(key, (entry, time.time_ns()))
+        if self.shared is not None:
+            await run_in_threadpool(self.shared.set, key, entry)
+
+    async def invalidate(self, company_id: UUID) -> None:
+        """Call whenever a company's applicants or files change"""
+        key = str(company_id)
+        self.local.delete(key)
+        if self.shared is not None:
+            await run_in_threadpool(self.shared.delete, key)
+
+company_cache = CompanyCache(
+    local=TTLCache(maxsize=COMPANY_CACHE_SIZE, ttl=COMPANY_CACHE_TTL_SECONDS),
+    shared=FileCacheBackend(COMPANY_CACHE_DIR, COMPANY_CACHE_TTL_SECONDS) if COMPANY_CACHE_DIR else None,
+)
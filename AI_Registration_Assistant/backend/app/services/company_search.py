@@ -0,0 +1,78 @@
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import COMPANY_SEARCH_CACHE_SIZE, COMPANY_SEARCH_CACHE_TTL_SECONDS
+from app.models.registration import Company
+from app.schemas.registration import CompanySearchResponse, CompanySuggestion
+from app.services.company_cache import CachedResponse, make_cached_response
+from app.utils.cache import TTLCache
+from app.utils.metrics import timed
+
+def _like_prefix(query: str) -> str:
+    """LIKE pattern matching names that start with ``query`` literally"""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+def build_search_statement(limit: int):
+    """
+    Prefix and fuzzy (pg_trgm) matches on the lowercased name, both served
+    by the trigram GIN index. The exact name ranks first, then prefix
+    matches, then the rest by similarity. Parameters: ``name`` (as typed),
+    ``query`` (lowercased) and ``prefix`` (LIKE pattern of ``query``).
+    """
+    lowered = func.lower(Company.company_name)
+    query = bindparam("query")
+    is_exact = (Company.company_name == bindparam("name")).label("is_exact")
+    is_prefix = lowered.like(bindparam("prefix"))
+    similarity = func.similarity(lowered, query).label("similarity")
+    return (
+        select(Company.id, Company.company_name, similarity, is_exact)
+        .where(is_prefix | lowered.op("%")(query))
+        .order_by(is_exact.desc(), is_prefix.desc(), similarity.desc(), Company.company_name)
+        .limit(limit)
+    )
+
+class CompanySearch:
+    """
+    Company name lookups for autocomplete and duplicate checks as the user
+    types. Serialized results are kept in a small TTL cache keyed by the
+    query, so repeated keystrokes never reach Postgres; every insert clears
+    it, and other workers' copies expire within COMPANY_SEARCH_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    async def search(self, db: AsyncSession, name: str, limit: int) -> CachedResponse:
+        name = " ".join(name.split())
+        key = (name, limit)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry
+
+        query = name.lower()
+        with timed("company_search"):
+            result = await db.execute(
+                build_search_statement(limit),
+                {"name": name, "query": query, "prefix": _like_prefix(query)}
+            )
+            rows = result.all()
+        response = CompanySearchResponse(
+            query=name,
+            exact=any(row.is_exact for row in rows),
+            matches=[
+                CompanySuggestion(id=row.id, company_name=row.company_name, similarity=round(row.similarity, 3))
+                for row in rows
+            ],
+        )
+        entry = make_cached_response(response.json().encode())
+        self.cache.set(key, entry)
+        return entry
+
+    def invalidate(self) -> None:
+        """Call after companies are inserted; any cached query may now match them"""
+        self.cache.clear()
+
+company_search = CompanySearch(
+    TTLCache(maxsize=COMPANY_SEARCH_CACHE_SIZE, ttl=COMPANY_SEARCH_CACHE_TTL_SECONDS)
+)
@@ -0,0 +1,218 @@
+"""
+Background post-processing of uploaded documents.
+
+Jobs live in the ``document_job`` table, so they survive restarts and need
+no external broker. Each API process runs a small pool of asyncio workers
+that claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``; any number of
+processes can share the table without handing out a job twice. A job stuck
+in ``running`` longer than DOCUMENT_JOB_LEASE_SECONDS (its worker died) is
+claimed again.
+
+Run a standalone worker with ``python -m app.services.document_pipeline``.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import (
+    DOCUMENT_WORKERS, DOCUMENT_POLL_INTERVAL_SECONDS,
+    DOCUMENT_JOB_MAX_ATTEMPTS, DOCUMENT_JOB_LEASE_SECONDS,
+)
+from app.database.database import AsyncSessionLocal, dispose_engines
+from app.models.registration import DocumentJob, UploadedFile
+from app.services.company_cache import company_cache
+from app.utils.file_handler import file_handler
+from app.utils.file_inspector import FileInfo, FileInspector
+from app.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Longest delay between retries of a failing job
+MAX_RETRY_DELAY_SECONDS = 300
+
+async def enqueue_document_jobs(db: AsyncSession, file_ids: List[UUID]) -> None:
+    """Queue processing for new files; call inside the transaction that inserts them"""
+    if file_ids:
+        await db.execute(
+            insert(DocumentJob).values([{"id": uuid4(), "file_id": file_id} for file_id in file_ids])
+        )
+
+def build_claim_statement(lease_seconds: int):
+    """
+    Atomically mark the next runnable job as running and return it.
+
+    Locked rows are skipped rather than waited on, so concurrent workers each
+    get a different job.
+    """
+    now = func.now()
+    next_job = (
+        select(DocumentJob.id)
+        .where(or_(
+            and_(DocumentJob.status == JOB_PENDING, DocumentJob.run_after <= now),
+            and_(
+                DocumentJob.status == JOB_RUNNING,
+                DocumentJob.updated_at < now - timedelta(seconds=lease_seconds),
+            ),
+        ))
+        .order_by(DocumentJob.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(DocumentJob)
+        .where(DocumentJob.id == next_job)
+        .values(status=JOB_RUNNING, attempts=DocumentJob.attempts + 1, updated_at=now)
+        .returning(DocumentJob.id, DocumentJob.file_id, DocumentJob.attempts)
+        .execution_options(synchronize_session=False)
+    )
+
+async def inspect_stored_file(key: str, file_name: str) -> FileInfo:
+    """Stream a stored file once through a FileInspector; hashing runs in the threadpool"""
+    inspector = FileInspector(file_name)
+    async for chunk in file_handler.storage.read(key):
+        await run_in_threadpool(inspector.update, chunk)
+    return inspector.result()
+
+class DocumentPipeline:
+    def __init__(
+        self,
+        workers: int = DOCUMENT_WORKERS,
+        poll_interval: float = DOCUMENT_POLL_INTERVAL_SECONDS,
+        max_attempts: int = DOCUMENT_JOB_MAX_ATTEMPTS,
+        lease_seconds: int = DOCUMENT_JOB_LEASE_SECONDS,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        if self._tasks or self.workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"document-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; a job interrupted mid-way is retried after its lease expires"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """Wake idle workers in this process, e.g. right after jobs were committed"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Document worker failed to claim a job")
+                processed = False
+            if not processed:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_once(self) -> bool:
+        """Claim and process one job; returns False when the queue is empty"""
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(build_claim_statement(self.lease_seconds))).first()
+            await db.commit()
+        if job is None:
+            return False
+        if job.attempts > self.max_attempts:
+            # Reclaimed after its worker died on the last allowed attempt
+            await self._retry_or_fail(job, RuntimeError("Worker lease expired"))
+            return True
+        try:
+            await self._process(job)
+        except Exception as e:
+            logger.exception("Document job %s failed", job.id)
+            await self._retry_or_fail(job, e)
+        return True
+
+    async def _process(self, job) -> None:
+        async with AsyncSessionLocal() as db:
+            stored = (await db.execute(
+                select(UploadedFile.company_id, UploadedFile.file_name, UploadedFile.file_url)
+                .where(UploadedFile.id == job.file_id)
+            )).first()
+            if stored is None:
+                # The file row was deleted; its job goes with it via ON DELETE CASCADE
+                return
+
+            with timed("document_inspect"):
+                info = await inspect_stored_file(stored.file_url, stored.file_name)
+
+            await db.execute(
+                update(UploadedFile)
+                .where(UploadedFile.id == job.file_id)
+                .values(
+                    mime_type=info.mime_type,
+                    size_bytes=info.size_bytes,
+                    sha256=info.sha256,
+                    processed_at=func.now(),
+                )
+            )
+            await db.execute(
+                update(DocumentJob)
+                .where(DocumentJob.id == job.id)
+                .values(status=JOB_DONE, last_error=None, updated_at=func.now())
+            )
+            await db.commit()
+        await company_cache.invalidate(stored.company_id)
+
+    async def _retry_or_fail(self, job, error: Exception) -> None:
+        """Reschedule with exponential backoff, or give up after max_attempts"""
+        if job.attempts >= self.max_attempts:
+            values = {"status": JOB_FAILED}
+        else:
+            delay = min(self.poll_interval * 2 ** job.attempts, MAX_RETRY_DELAY_SECONDS)
+            values = {"status": JOB_PENDING, "run_after": func.now() + timedelta(seconds=delay)}
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(DocumentJob)
+                .where(DocumentJob.id == job.id)
+                .values(last_error=f"{type(error).__name__}: {error}", updated_at=func.now(), **values)
+            )
+            await db.commit()
+
+document_pipeline = DocumentPipeline()
+
+async def _run_forever() -> None:
+    pipeline = DocumentPipeline(workers=max(DOCUMENT_WORKERS, 1))
+    pipeline.start()
+    try:
+        await asyncio.gather(*pipeline._tasks)
+    finally:
+        await pipeline.stop()
+        await dispose_engines()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_forever())
@@ -0,0 +1,129 @@
+"""
+Content-addressed deduplication of uploaded files.
+
+Every stored file is hashed while it streams in. Registration records one
+reference per file against a ``file_blob`` row keyed by SHA-256; the first
+upload of a content becomes the blob's stored copy and later copies are
+deleted once the transaction commits. Deleting a file releases its
+reference, and a blob's copy is only removed with its last reference.
+"""
+from collections import Counter
+from typing import List, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.registration import FileBlob, UploadedFile
+from app.services.company_cache import company_cache
+from app.utils.file_handler import file_handler
+
+async def attach_blobs(db: AsyncSession, stored_files: List[dict]) -> Tuple[List[dict], List[str]]:
+    """
+    Add a blob reference for each stored file (``file_name``, ``file_url``,
+    ``size``, ``sha256``).
+
+    Returns the files pointed at their blob's storage key, and the keys of
+    copies that duplicate an existing blob, to delete after commit. Files
+    without a hash are returned unchanged and stay unshared.
+    """
+    hashed = [f for f in stored_files if f.get("sha256")]
+    if not hashed:
+        return stored_files, []
+
+    counts = Counter(f["sha256"] for f in hashed)
+    first = {}
+    for f in hashed:
+        first.setdefault(f["sha256"], f)
+    # Sorted so concurrent registrations lock blob rows in the same order
+    stmt = insert(FileBlob).values([
+        {
+            "sha256": sha256,
+            "storage_key": first[sha256]["file_url"],
+            "size_bytes": first[sha256]["size"],
+            "ref_count": count,
+        }
+        for sha256, count in sorted(counts.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FileBlob.sha256],
+        set_={"ref_count": FileBlob.ref_count + stmt.excluded.ref_count}
+    ).returning(FileBlob.sha256, FileBlob.storage_key)
+    blob_keys = {row.sha256: row.storage_key for row in await db.execute(stmt)}
+
+    attached = []
+    redundant = []
+    for f in stored_files:
+        sha256 = f.get("sha256")
+        if sha256 is None:
+            attached.append(f)
+            continue
+        key = blob_keys[sha256]
+        if f["file_url"] != key:
+            redundant.append(f["file_url"])
+        attached.append({**f, "file_url": key})
+    return attached, redundant
+
+async def release_blobs(db: AsyncSession, sha256s: List[str]) -> List[str]:
+    """
+    Drop one reference per hash; blobs left without references are deleted.
+    Returns their storage keys, to delete after commit.
+    """
+    counts = Counter(sha256 for sha256 in sha256s if sha256)
+    for sha256, count in sorted(counts.items()):
+        await db.execute(
+            update(FileBlob)
+            .where(FileBlob.sha256 == sha256)
+            .values(ref_count=FileBlob.ref_count - count)
+        )
+    if not counts:
+        return []
+    result = await db.execute(
+        delete(FileBlob)
+        .where(FileBlob.sha256.in_(list(counts)), FileBlob.ref_count <= 0)
+        .returning(FileBlob.storage_key)
+        .execution_options(synchronize_session=False)
+    )
+    return [row.storage_key for row in result]
+
+async def delete_uploaded_file(db: AsyncSession, file_id: UUID) -> None:
+    """Delete a file record, and its stored bytes if no other upload shares them"""
+    result = await db.execute(
+        delete(UploadedFile)
+        .where(UploadedFile.id == file_id)
+        .returning(UploadedFile.company_id, UploadedFile.file_url, UploadedFile.blob_sha256)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.first()
+    if deleted is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    if deleted.blob_sha256 is None:
+        orphaned = [deleted.file_url]
+    else:
+        orphaned = await release_blobs(db, [deleted.blob_sha256])
+    await db.commit()
+    await file_handler.delete_files(orphaned)
+    await company_cache.invalidate(deleted.company_id)
+
+async def dedup_report(db: AsyncSession) -> dict:
+    """How much storage deduplication saves across all blobs"""
+    row = (await db.execute(
+        select(
+            func.count().label("blobs"),
+            func.coalesce(func.sum(FileBlob.ref_count), 0).label("references"),
+            func.coalesce(func.sum(FileBlob.size_bytes), 0).label("stored_bytes"),
+            func.coalesce(func.sum(FileBlob.size_bytes * FileBlob.ref_count), 0).label("logical_bytes"),
+        )
+    )).one()
+    stored_bytes = int(row.stored_bytes)
+    logical_bytes = int(row.logical_bytes)
+    return {
+        "blobs": row.blobs,
+        "references": int(row.references),
+        "stored_bytes": stored_bytes,
+        "logical_bytes": logical_bytes,
+        "bytes_saved": logical_bytes - stored_bytes,
+        "dedup_ratio": round(logical_bytes / stored_bytes, 3) if stored_bytes else 1.0,
+    }
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from app.config.settings import PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_INVALIDATION_FILE
+from app.utils.cache import TTLCache
+
+class PrincipalCache:
+    """
+    Authenticated users keyed by JWT subject (username). Entries are detached
+    User objects; they never outlive the token that populated them.
+
+    Invalidation has to reach every worker, not just the one that changed the
+    account. It touches a shared marker file, and each lookup discards
+    entries cached before the marker's last change. That costs one ``stat``
+    per hit and flushes the whole cache, which is fine for account changes,
+    which are rare. The marker is a local file, so it reaches workers on the
+    same host. Workers on other hosts see a change within
+    PRINCIPAL_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, cache: TTLCache, invalidation_file: str):
+        self.cache = cache
+        self.invalidation_file = Path(invalidation_file)
+
+    def _invalidated_at(self) -> int:
+        try:
+            return self.invalidation_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def get(self, username: str) -> Optional[Any]:
+        entry = self.cache.get(username)
+        if entry is None:
+            return None
+        user, cached_at = entry
+        if cached_at <= self._invalidated_at():
+            self.cache.delete(username)
+            return None
+        return user
+
+    def set(self, username: str, user: Any, loaded_at: int, ttl: Optional[float] = None) -> None:
+        """
+        Cache a user read from the database. ``loaded_at`` is ``time.time_ns()``
+        taken before the read started: an invalidation committed while the
+        read was in flight is newer, so the entry is discarded on its next
+        lookup instead of outliving the change.
+        """
+        self.cache.set(username, (user, loaded_at), ttl=ttl)
+
+    def invalidate(self, *usernames: str) -> None:
+        """Drop cached principals here and mark every other worker's cache stale"""
+        for username in usernames:
+            if username:
+                self.cache.delete(username)
+        self.invalidation_file.parent.mkdir(parents=True, exist_ok=True)
+        self.invalidation_file.touch()
+        # Explicit timestamp: file systems stamp mtimes from a coarser clock
+        now = time.time_ns()
+        os.utime(self.invalidation_file, ns=(now, now))
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+principal_cache = PrincipalCache(
+    TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS),
+    PRINCIPAL_INVALIDATION_FILE or os.path.join(tempfile.gettempdir(), "ai-registration-principals.invalidated"),
+)
+
+def invalidate_principal(*usernames: str) -> None:
+    """Drop cached principals so account changes apply on the next request, in every worker"""
+    principal_cache.invalidate(*usernames)
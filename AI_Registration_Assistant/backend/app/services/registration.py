@@ -1,90 +1,242 @@
-from uuid import UUID
+import logging
+from uuid import UUID, uuid4
 from typing import List, Optional
-from fastapi import HTTPException, status, UploadFile
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from sqlalchemy import cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.models.registration import Company, Applicant, UploadedFile
+from app.models.registration import Company, Applicant, UploadedFile, UploadSession
 from app.schemas.registration import RegistrationCreate, RegistrationResponse, FileCreate
 from app.utils.file_handler import file_handler
+from app.services.company_search import company_search
+from app.services.document_pipeline import document_pipeline, enqueue_document_jobs
+from app.services.file_blobs import attach_blobs
+from app.services.registration_filter import registration_filter
+from app.services.upload_sessions import SESSION_COMPLETE, SESSION_CONSUMED
+
+logger = logging.getLogger(__name__)
+
+def build_registration_statement(
+    company_id: UUID, applicant_id: UUID, registration_data: RegistrationCreate
+):
+    """
+    Insert a company and its applicant as a single statement.
+
+    Two data-modifying CTEs run ``INSERT ... ON CONFLICT DO NOTHING
+    RETURNING id``; the applicant is only inserted if the company was. The
+    statement returns one row of ``(company_id, applicant_id)`` where a NULL
+    marks the insert that hit an existing company name or applicant email.
+    Applicant values are cast explicitly because Postgres cannot infer the
+    types of bind parameters in the ``INSERT ... SELECT`` list.
+    """
+    applicant_data = registration_data.applicant
+    new_company = (
+        insert(Company)
+        .values(
+            id=company_id,
+            company_name=registration_data.company_name,
+            area_of_service=registration_data.area_of_service
+        )
+        .on_conflict_do_nothing(index_elements=[Company.company_name])
+        .returning(Company.id)
+        .cte("new_company")
+    )
+    new_applicant = (
+        insert(Applicant)
+        .from_select(
+            ["id", "company_id", "full_name", "email", "phone"],
+            select(
+                cast(literal(applicant_id), Applicant.id.type),
+                new_company.c.id,
+                cast(literal(applicant_data.full_name), Applicant.full_name.type),
+                cast(literal(applicant_data.email), Applicant.email.type),
+                cast(literal(applicant_data.phone), Applicant.phone.type),
+            )
+        )
+        .on_conflict_do_nothing(index_elements=[Applicant.email])
+        .returning(Applicant.id)
+        .cte("new_applicant")
+    )
+    return select(
+        select(new_company.c.id).scalar_subquery().label("company_id"),
+        select(new_applicant.c.id).scalar_subquery().label("applicant_id"),
+    )
 
 class RegistrationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
     async def register_company(
         self, 
         registration_data: RegistrationCreate,
-        files: Optional[List[UploadFile]] = None
+        saved_files: Optional[List[dict]] = None,
+        upload_ids: Optional[List[UUID]] = None
     ) -> RegistrationResponse:
         """
-        Register a new company with applicant and optional file uploads
+        Register a new company with applicant and optional file uploads.
+
+        Files come either in the request body or as completed resumable
+        uploads referenced by ``upload_ids``; the latter are claimed in the
+        registration transaction, so each can only be registered once.
+
+        Files in the request body arrive already stored (``saved_files``,
+        streamed by the form parser), so the database transaction only opens
+        once their bytes are durable and its duration does not depend on
+        upload size; they are deleted again if registration fails. Files whose content is already
+        stored share that copy. MIME sniffing is queued in the same
+        transaction and runs in the background pipeline.
         """
+        company_id = uuid4()
+        
+        saved_files = saved_files or []
+        
         # Start a transaction
         try:
-            # Check if company already exists
-            existing_company = self.db.query(Company).filter(
-                Company.company_name == registration_data.company_name
-            ).first()
+            # Company and applicant in one round trip; duplicates insert nothing
+            result = await self.db.execute(
+                build_registration_statement(company_id, uuid4(), registration_data)
+            )
+            inserted = result.one()
             
-            if existing_company:
+            # Taken values the filter missed, e.g. inserted by another worker
+            if inserted.company_id is None:
+                registration_filter.add(company_name=registration_data.company_name)
                 raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
+                    status_code=status.HTTP_409_CONFLICT,
                     detail="Company with this name already exists"
                 )
+            if inserted.applicant_id is None:
+                registration_filter.add(email=registration_data.applicant.email)
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Applicant with this email already exists"
+                )
             
-            # Create company
-            company = Company(
-                company_name=registration_data.company_name,
-                area_of_service=registration_data.area_of_service
-            )
-            self.db.add(company)
-            self.db.flush()  # Flush to get the company ID
+            # Claim completed resumable uploads
+            stored_files = list(saved_files)
+            if upload_ids:
+                stored_files.extend(await self._claim_uploads(upload_ids))
             
-            # Create applicant
-            applicant_data = registration_data.applicant
-            applicant = Applicant(
-                company_id=company.id,
-                full_name=applicant_data.full_name,
-                email=applicant_data.email,
-                phone=applicant_data.phone
-            )
-            self.db.add(applicant)
+            # Share stored copies of identical content
+            stored_files, duplicate_copies = await attach_blobs(self.db, stored_files)
             
-            # Handle file uploads if any
-            if files:
-                for file in files:
-                    file_info = await file_handler.save_upload_file(file, str(company.id))
-                    
-                    uploaded_file = UploadedFile(
-                        company_id=company.id,
-                        file_name=file_info["file_name"],
-                        file_url=file_info["file_url"]
-                    )
-                    self.db.add(uploaded_file)
+            # Add file rows as one multi-row insert and queue their processing
+            if stored_files:
+                file_ids = [uuid4() for _ in stored_files]
+                await self.db.execute(
+                    insert(UploadedFile).values([
+                        {
+                            "id": file_id,
+                            "company_id": company_id,
+                            "file_name": file_info["file_name"],
+                            "file_url": file_info["file_url"],
+                            "blob_sha256": file_info.get("sha256"),
+                            "sha256": file_info.get("sha256"),
+                            "size_bytes": file_info.get("size"),
+                            "mime_type": file_info.get("mime_type"),
+                        }
+                        for file_id, file_info in zip(file_ids, stored_files)
+                    ])
+                )
+                await enqueue_document_jobs(self.db, file_ids)
             
             # Commit the transaction
-            self.db.commit()
-            
-            return RegistrationResponse(
-                success=True,
-                company_id=company.id,
-                message="Registration successful"
-            )
+            await self.db.commit()
             
         except HTTPException:
-            self.db.rollback()
+            await self.db.rollback()
+            await file_handler.delete_files([f["file_url"] for f in saved_files])
             raise
             
+        except IntegrityError:
+            # A constraint not covered by ON CONFLICT, e.g. a concurrent delete
+            await self.db.rollback()
+            await file_handler.delete_files([f["file_url"] for f in saved_files])
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Registration conflicts with an existing record"
+            )
+            
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
+            await file_handler.delete_files([f["file_url"] for f in saved_files])
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error during registration: {str(e)}"
             )
+        
+        # The registration is committed and its files are referenced from now
+        # on, so a failing side effect must not delete them or fail the request
+        await self._after_commit(registration_data, duplicate_copies, notify_pipeline=bool(stored_files))
+        return RegistrationResponse(
+            success=True,
+            company_id=company_id,
+            message="Registration successful"
+        )
     
-    def get_company_by_id(self, company_id: UUID):
-        """Get company by ID with related data"""
-        company = self.db.query(Company).filter(Company.id == company_id).first()
+    async def _after_commit(
+        self, registration_data: RegistrationCreate, duplicate_copies: List[str], notify_pipeline: bool
+    ) -> None:
+        """Best-effort follow-ups of a committed registration; failures are only logged"""
+        try:
+            await file_handler.delete_files(duplicate_copies)
+        except Exception:
+            logger.exception("Deleting duplicate upload copies failed")
+        try:
+            company_search.invalidate()
+            registration_filter.add(registration_data.company_name, registration_data.applicant.email)
+            if notify_pipeline:
+                document_pipeline.notify()
+        except Exception:
+            logger.exception("Updating caches after a registration failed")
+    
+    async def _claim_uploads(self, upload_ids: List[UUID]) -> List[dict]:
+        """Mark completed upload sessions as consumed and return their stored files"""
+        upload_ids = list(dict.fromkeys(upload_ids))
+        result = await self.db.execute(
+            update(UploadSession)
+            .where(UploadSession.id.in_(upload_ids), UploadSession.status == SESSION_COMPLETE)
+            .values(status=SESSION_CONSUMED, updated_at=func.now())
+            .returning(
+                UploadSession.id, UploadSession.file_name, UploadSession.file_url,
+                UploadSession.total_size, UploadSession.sha256, UploadSession.mime_type
+            )
+            .execution_options(synchronize_session=False)
+        )
+        claimed = {row.id: row for row in result}
+        missing = [str(upload_id) for upload_id in upload_ids if upload_id not in claimed]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Uploads not found, not complete or already registered: {', '.join(missing)}"
+            )
+        return [
+            {
+                "file_name": claimed[upload_id].file_name,
+                "file_url": claimed[upload_id].file_url,
+                "size": claimed[upload_id].total_size,
+                "sha256": claimed[upload_id].sha256,
+                "mime_type": claimed[upload_id].mime_type,
+            }
+            for upload_id in upload_ids
+        ]
+    
+    async def get_company_by_id(self, company_id: UUID) -> Company:
+        """
+        Get company by ID with its applicants and files.
+
+        Relationships are loaded with selectin loading, so this is always three
+        queries regardless of how many applicants or files the company has.
+        """
+        result = await self.db.execute(
+            select(Company)
+            .options(selectinload(Company.applicants), selectinload(Company.files))
+            .where(Company.id == company_id)
+        )
+        company = result.scalars().first()
         if not company:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,216 @@
+"""
+In-memory pre-check for taken company names and applicant emails.
+
+One Bloom filter per unique column answers "definitely not registered"
+without a database round trip; only possible hits are looked up in
+Postgres. The filters are loaded from the tables at start-up, updated after
+every insert and every conflict seen by this process and rebuilt every
+REGISTRATION_FILTER_REBUILD_SECONDS, which also picks up inserts made by
+other workers and sizes the filters for the current row count.
+
+A stale filter only ever costs a skipped pre-check: the registration
+transaction still enforces uniqueness with ON CONFLICT.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import (
+    REGISTRATION_FILTER_ENABLED, REGISTRATION_FILTER_ERROR_RATE,
+    REGISTRATION_FILTER_MIN_CAPACITY, REGISTRATION_FILTER_REBUILD_SECONDS,
+)
+from app.database.database import AsyncSessionLocal
+from app.models.registration import Applicant, Company
+from app.utils.bloom import BloomFilter
+from app.utils.metrics import FunctionGauge, registry, timed
+
+logger = logging.getLogger(__name__)
+
+# Rows handed to the threadpool at a time while loading a filter
+LOAD_BATCH_SIZE = 10000
+
+# Retry delay when loading fails, e.g. while the database is still starting
+LOAD_RETRY_SECONDS = 30
+
+class ColumnFilter:
+    """A Bloom filter over one unique column, with observed accuracy counters"""
+
+    def __init__(self, column, error_rate: float, min_capacity: int):
+        self.column = column
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self.bloom: Optional[BloomFilter] = None
+        self.negatives = 0
+        self.false_positives = 0
+
+    def might_contain(self, value: str) -> bool:
+        """False only if the value is certainly not in the table; True until loaded"""
+        if self.bloom is None:
+            return True
+        if self.bloom.might_contain(value):
+            return True
+        self.negatives += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        """The filter said maybe, the database said no"""
+        if self.bloom is not None:
+            self.false_positives += 1
+
+    def add(self, value: str) -> None:
+        if self.bloom is not None:
+            self.bloom.add(value)
+
+    async def build(self, db: AsyncSession) -> BloomFilter:
+        """Fill a fresh filter from the table, sized for twice the current rows"""
+        count = await db.scalar(select(func.count()).select_from(self.column.table))
+        bloom = BloomFilter(max(count * 2, self.min_capacity), self.error_rate)
+        result = await db.stream(
+            select(self.column).execution_options(yield_per=LOAD_BATCH_SIZE)
+        )
+        async for rows in result.partitions(LOAD_BATCH_SIZE):
+            await run_in_threadpool(bloom.update, [row[0] for row in rows])
+        return bloom
+
+    def observed_error_rate(self) -> float:
+        checked = self.false_positives + self.negatives
+        return self.false_positives / checked if checked else 0.0
+
+    def stats(self) -> dict:
+        if self.bloom is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            **self.bloom.stats(),
+            "negatives": self.negatives,
+            "false_positives": self.false_positives,
+            "observed_false_positive_rate": round(self.observed_error_rate(), 6),
+        }
+
+class RegistrationFilter:
+    def __init__(
+        self,
+        enabled: bool = REGISTRATION_FILTER_ENABLED,
+        error_rate: float = REGISTRATION_FILTER_ERROR_RATE,
+        min_capacity: int = REGISTRATION_FILTER_MIN_CAPACITY,
+        rebuild_seconds: float = REGISTRATION_FILTER_REBUILD_SECONDS,
+    ):
+        self.enabled = enabled
+        self.rebuild_seconds = rebuild_seconds
+        self.company_names = ColumnFilter(Company.company_name, error_rate, min_capacity)
+        self.emails = ColumnFilter(Applicant.email, error_rate, min_capacity)
+        self._task: Optional[asyncio.Task] = None
+        # Inserts seen while a rebuild is loading, replayed into the new filters
+        self._pending: Optional[List[Tuple[Optional[str], Optional[str]]]] = None
+
+    def start(self) -> None:
+        """Load the filters in the background and keep rebuilding them"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="registration-filter")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+                delay = self.rebuild_seconds
+            except Exception:
+                logger.exception("Loading the registration filter failed")
+                delay = min(self.rebuild_seconds, LOAD_RETRY_SECONDS)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def rebuild(self) -> None:
+        """Reload both filters from the database and swap them in"""
+        self._pending = []
+        try:
+            with timed("registration_filter_rebuild"):
+                async with AsyncSessionLocal() as db:
+                    company_names = await self.company_names.build(db)
+                    emails = await self.emails.build(db)
+            for company_name, email in self._pending:
+                if company_name is not None:
+                    company_names.add(company_name)
+                if email is not None:
+                    emails.add(email)
+            self.company_names.bloom = company_names
+            self.emails.bloom = emails
+        finally:
+            self._pending = None
+
+    def add(self, company_name: Optional[str] = None, email: Optional[str] = None) -> None:
+        """Record values known to be taken: a committed registration or a conflict"""
+        if company_name is not None:
+            self.company_names.add(company_name)
+        if email is not None:
+            self.emails.add(email)
+        if self._pending is not None:
+            self._pending.append((company_name, email))
+
+    async def precheck(self, db: AsyncSession, company_name: str, email: str) -> None:
+        """
+        Raise 409 if the company name or applicant email is already taken.
+
+        Values the filters rule out are not queried at all; the rest are
+        checked in one statement.
+        """
+        checks = {}
+        if self.company_names.might_contain(company_name):
+            checks["company"] = exists().where(Company.company_name == company_name)
+        if self.emails.might_contain(email):
+            checks["applicant"] = exists().where(Applicant.email == email)
+        if not checks:
+            return
+
+        with timed("registration_precheck"):
+            taken = (await db.execute(
+                select(*(check.label(name) for name, check in checks.items()))
+            )).one()._mapping
+        if taken.get("company"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Company with this name already exists"
+            )
+        if taken.get("applicant"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Applicant with this email already exists"
+            )
+        if "company" in checks:
+            self.company_names.record_false_positive()
+        if "applicant" in checks:
+            self.emails.record_false_positive()
+
+    def stats(self) -> dict:
+        return {"company_name": self.company_names.stats(), "applicant_email": self.emails.stats()}
+
+registration_filter = RegistrationFilter()
+
+for _label, _filter in (("company_name", registration_filter.company_names),
+                        ("applicant_email", registration_filter.emails)):
+    registry.register(FunctionGauge(
+        f"app_{_label}_filter_memory_bytes",
+        f"Memory used by the {_label} Bloom filter",
+        lambda f=_filter: f.bloom.memory_bytes if f.bloom is not None else 0,
+    ))
+    registry.register(FunctionGauge(
+        f"app_{_label}_filter_expected_false_positive_rate",
+        f"False-positive probability of the {_label} Bloom filter at its current fill",
+        lambda f=_filter: f.bloom.expected_error_rate() if f.bloom is not None else 0,
+    ))
+    registry.register(FunctionGauge(
+        f"app_{_label}_filter_observed_false_positive_rate",
+        f"Share of absent {_label} values the Bloom filter could not rule out",
+        lambda f=_filter: f.observed_error_rate(),
+    ))
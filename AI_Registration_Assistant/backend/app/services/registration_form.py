@@ -0,0 +1,146 @@
+import time
+from typing import List, NamedTuple, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+
+from app.config.settings import MAX_UPLOAD_FILES, MAX_FORM_FIELDS, MAX_FORM_FIELD_SIZE
+from app.database.database import AsyncSessionLocal
+from app.schemas.registration import RegistrationCreate
+from app.services.registration_filter import registration_filter
+from app.utils.file_handler import UploadWriter, file_handler
+from app.utils.metrics import span_duration
+from app.utils.multipart_stream import FileData, FileEnd, FileStart, iter_multipart
+
+# Multipart field names understood by /register besides the RegistrationCreate fields
+FILES_FIELD = "files"
+UPLOAD_IDS_FIELD = "upload_ids"
+
+# OpenAPI description of the form, since it is parsed by hand
+REGISTRATION_FORM_SCHEMA = {
+    "type": "object",
+    "required": ["company_name", "applicant[full_name]", "applicant[email]"],
+    "properties": {
+        "company_name": {"type": "string", "maxLength": 255},
+        "area_of_service": {"type": "string", "maxLength": 255},
+        "applicant[full_name]": {"type": "string", "maxLength": 255},
+        "applicant[email]": {"type": "string", "format": "email"},
+        "applicant[phone]": {"type": "string", "maxLength": 50},
+        FILES_FIELD: {"type": "array", "items": {"type": "string", "format": "binary"}},
+        UPLOAD_IDS_FIELD: {"type": "array", "items": {"type": "string", "format": "uuid"}},
+    },
+}
+
+class RegistrationForm(NamedTuple):
+    data: RegistrationCreate
+    stored_files: List[dict]
+    upload_ids: List[UUID]
+
+def _too_many_files() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Maximum {MAX_UPLOAD_FILES} files allowed per registration"
+    )
+
+def _build_form(fields: dict, stored_files: List[dict], upload_ids: List[str]) -> RegistrationForm:
+    if len(stored_files) + len(upload_ids) > MAX_UPLOAD_FILES:
+        raise _too_many_files()
+    try:
+        parsed_upload_ids = [UUID(value) for value in upload_ids]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="upload_ids must be UUIDs"
+        )
+    return RegistrationForm(
+        data=RegistrationCreate.from_form(fields),
+        stored_files=stored_files,
+        upload_ids=parsed_upload_ids,
+    )
+
+async def _read_urlencoded_form(request: Request) -> RegistrationForm:
+    """A form without files; small enough to parse in one go"""
+    form = await request.form()
+    if len(form) > MAX_FORM_FIELDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {MAX_FORM_FIELDS} form fields allowed per request"
+        )
+    fields = {key: value for key, value in form.items() if key != UPLOAD_IDS_FIELD}
+    upload_ids = [value for value in form.getlist(UPLOAD_IDS_FIELD) if value]
+    return _build_form(fields, [], upload_ids)
+
+async def _precheck(fields: dict) -> None:
+    """
+    409 before any file is stored if the fields sent so far are already taken.
+
+    Runs on its own short-lived session, so no connection or transaction is
+    held while the files stream in.
+    """
+    try:
+        data = RegistrationCreate.from_form(fields)
+    except RequestValidationError:
+        return  # incomplete so far; validated once the body is read
+    async with AsyncSessionLocal() as db:
+        await registration_filter.precheck(db, data.company_name, data.applicant.email)
+
+async def read_registration_form(request: Request) -> RegistrationForm:
+    """
+    Stream a multipart registration request into storage.
+
+    Each ``files`` part is written to the storage backend as its bytes
+    arrive, with no spooled copy; text fields are collected and validated
+    as a RegistrationCreate once the body is complete. Size and count limits
+    fail the request as soon as they are exceeded. When the company and
+    applicant fields precede the files, a taken name or email is rejected
+    before the first file is stored. If anything fails, files already stored
+    for this request are deleted.
+    """
+    if request.headers.get("content-type", "").startswith("application/x-www-form-urlencoded"):
+        return await _read_urlencoded_form(request)
+
+    fields = {}
+    upload_ids: List[str] = []
+    stored_files: List[dict] = []
+    upload: Optional[UploadWriter] = None
+    started = 0.0
+    prechecked = False
+    try:
+        async for event in iter_multipart(request, MAX_FORM_FIELDS, MAX_FORM_FIELD_SIZE, MAX_UPLOAD_FILES):
+            if isinstance(event, FileData):
+                await upload.write(event.data)
+            elif isinstance(event, FileStart):
+                if event.name != FILES_FIELD:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Unexpected file field {event.name}"
+                    )
+                if len(stored_files) + len(upload_ids) >= MAX_UPLOAD_FILES:
+                    raise _too_many_files()
+                if not prechecked:
+                    await _precheck(fields)
+                    prechecked = True
+                started = time.perf_counter()
+                upload = await file_handler.open_upload(event.filename)
+            elif isinstance(event, FileEnd):
+                stored_files.append(await upload.commit())
+                upload = None
+                span_duration.observe(time.perf_counter() - started, "file_save")
+            elif event.name == UPLOAD_IDS_FIELD:
+                if event.value:
+                    upload_ids.append(event.value)
+            else:
+                fields[event.name] = event.value
+
+        return _build_form(fields, stored_files, upload_ids)
+    except BaseException as e:
+        if upload is not None:
+            await upload.abort()
+        await file_handler.delete_files([f["file_url"] for f in stored_files])
+        if isinstance(e, OSError):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error saving file: {str(e)}"
+            )
+        raise
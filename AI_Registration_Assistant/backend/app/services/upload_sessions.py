@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import re
+from datetime import timedelta
+from typing import AsyncIterator, Optional, Tuple
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import (
+    MAX_RESUMABLE_UPLOAD_SIZE, UPLOAD_SESSION_TTL_SECONDS, UPLOAD_SESSION_CLEANUP_SECONDS,
+)
+from app.database.database import AsyncSessionLocal
+from app.models.models import User
+from app.models.registration import UploadSession
+from app.schemas.registration import UploadSessionCreate
+from app.utils.file_handler import file_handler
+from app.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+SESSION_UPLOADING = "uploading"
+SESSION_COMPLETING = "completing"
+SESSION_COMPLETE = "complete"
+SESSION_CONSUMED = "consumed"
+
+# Expired sessions deleted per statement during cleanup
+CLEANUP_BATCH_SIZE = 100
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+def parse_content_range(header: Optional[str], total_size: int) -> Tuple[int, int]:
+    """Parse ``Content-Range: bytes start-end/total`` into ``(start, length)``"""
+    match = CONTENT_RANGE_RE.match((header or "").strip())
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Content-Range header of the form 'bytes start-end/total' is required"
+        )
+    start, end, total = match.groups()
+    start, end = int(start), int(end)
+    if end < start or end >= total_size or (total != "*" and int(total) != total_size):
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=f"Content-Range does not fit an upload of {total_size} bytes"
+        )
+    return start, end - start + 1
+
+class UploadSessionService:
+    """
+    Resumable uploads: create a session, PUT byte ranges from the current
+    offset until all bytes are in, then complete it. A completed session is
+    consumed when a registration references it. Sessions belong to the user
+    who created them; other users (except admins) get 404.
+    """
+
+    def __init__(self, db: AsyncSession, user: Optional[User] = None):
+        self.db = db
+        self.user = user
+
+    async def create_session(self, data: UploadSessionCreate) -> UploadSession:
+        if data.size > MAX_RESUMABLE_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Uploads are limited to {MAX_RESUMABLE_UPLOAD_SIZE} bytes"
+            )
+        session = UploadSession(
+            id=uuid4(),
+            file_name=data.file_name,
+            total_size=data.size,
+            received_bytes=0,
+            status=SESSION_UPLOADING,
+            created_by=self.user.id if self.user is not None else None,
+        )
+        await file_handler.create_session_file(str(session.id))
+        self.db.add(session)
+        await self.db.commit()
+        await self.db.refresh(session)
+        return session
+
+    async def get_session(self, session_id: UUID, lock: bool = False) -> UploadSession:
+        session = await self.db.get(
+            UploadSession, session_id, with_for_update=lock, populate_existing=lock
+        )
+        if session is None or not self._can_access(session):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
+            )
+        return session
+
+    def _can_access(self, session: UploadSession) -> bool:
+        return self.user is None or self.user.is_admin or session.created_by == self.user.id
+
+    async def write_range(
+        self,
+        session_id: UUID,
+        content_range: Optional[str],
+        chunks: AsyncIterator[bytes]
+    ) -> UploadSession:
+        """
+        Append one byte range to a session.
+
+        The range must start at the session's current offset. The database
+        connection is released while the body streams to disk, and progress
+        is recorded even when the client disconnects half-way, so a retry
+        only resends the missing bytes.
+        """
+        session = await self.get_session(session_id)
+        if session.status != SESSION_UPLOADING:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload is already complete"
+            )
+        start, length = parse_content_range(content_range, session.total_size)
+        if start != session.received_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload is at offset {session.received_bytes}; resume from there"
+            )
+        await self.db.commit()
+
+        try:
+            received = await file_handler.write_range(
+                str(session_id), start, chunks, length, session.file_name
+            )
+        except Exception:
+            await self._record_progress(session, file_handler.session_size(str(session_id)))
+            raise
+        await self._record_progress(session, received)
+        return session
+
+    async def _record_progress(self, session: UploadSession, received: int) -> None:
+        await self.db.execute(
+            update(UploadSession)
+            .where(UploadSession.id == session.id)
+            .values(received_bytes=received, updated_at=func.now())
+        )
+        await self.db.commit()
+        session.received_bytes = received
+
+    async def complete_session(self, session_id: UUID) -> UploadSession:
+        """
+        Move the assembled file into storage; the session can then be registered.
+
+        Hashing and moving up to MAX_RESUMABLE_UPLOAD_SIZE bytes takes a
+        while, so no transaction is open meanwhile. The session is claimed by
+        switching it from ``uploading`` to ``completing`` with a conditional
+        update, which a concurrent complete or delete cannot also win, and
+        switched to ``complete`` afterwards, or back to ``uploading`` if the
+        file is rejected.
+        """
+        session = await self.get_session(session_id)
+        if session.status in (SESSION_COMPLETE, SESSION_CONSUMED):
+            return session
+        if session.status == SESSION_COMPLETING:
+            raise self._completing()
+        if session.received_bytes != session.total_size:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload has {session.received_bytes} of {session.total_size} bytes"
+            )
+        if not await self._transition(
+            session_id, SESSION_UPLOADING, SESSION_COMPLETING,
+            UploadSession.received_bytes == UploadSession.total_size,
+        ):
+            raise self._completing()
+
+        try:
+            stored = await file_handler.finalize_session(str(session_id), session.file_name)
+        except BaseException:
+            await self._transition(session_id, SESSION_COMPLETING, SESSION_UPLOADING)
+            raise
+        if not await self._transition(
+            session_id, SESSION_COMPLETING, SESSION_COMPLETE,
+            file_url=stored["file_url"], sha256=stored["sha256"], mime_type=stored["mime_type"],
+        ):
+            # Expired and cleaned up while the file was being moved
+            await file_handler.delete_files([stored["file_url"]])
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
+            )
+        await self.db.refresh(session)
+        return session
+
+    async def _transition(self, session_id: UUID, from_status: str, to_status: str, *criteria, **values) -> bool:
+        """Move a session between states if it is still in ``from_status``; commits"""
+        result = await self.db.execute(
+            update(UploadSession)
+            .where(UploadSession.id == session_id, UploadSession.status == from_status, *criteria)
+            .values(status=to_status, updated_at=func.now(), **values)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def _completing() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is already being completed"
+        )
+
+    async def delete_session(self, session_id: UUID) -> None:
+        """Abandon an upload that has not been registered yet"""
+        session = await self.get_session(session_id, lock=True)
+        if session.status == SESSION_CONSUMED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload belongs to a registration"
+            )
+        if session.status == SESSION_COMPLETING:
+            raise self._completing()
+        file_url = session.file_url
+        await self.db.delete(session)
+        await self.db.commit()
+        if file_url:
+            await file_handler.delete_files([file_url])
+        else:
+            await file_handler.discard_session(str(session_id))
+
+async def expire_sessions(db: AsyncSession, ttl_seconds: int = UPLOAD_SESSION_TTL_SECONDS) -> int:
+    """
+    Delete upload sessions that were never registered and have been idle for
+    ``ttl_seconds``, with their files. Returns how many were deleted.
+
+    Rows are deleted before their files, each batch in one statement, so a
+    session consumed by a registration at the same moment is never removed
+    and no two processes clean up the same session.
+    """
+    cutoff = func.now() - timedelta(seconds=ttl_seconds)
+    expired = 0
+    while True:
+        stale = (
+            select(UploadSession.id)
+            .where(UploadSession.status != SESSION_CONSUMED, UploadSession.updated_at < cutoff)
+            .limit(CLEANUP_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(UploadSession)
+            .where(UploadSession.id.in_(stale))
+            .returning(UploadSession.id, UploadSession.file_url)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        await db.commit()
+        for row in rows:
+            if row.file_url:
+                await file_handler.delete_files([row.file_url])
+            else:
+                await file_handler.discard_session(str(row.id))
+        expired += len(rows)
+        if len(rows) < CLEANUP_BATCH_SIZE:
+            return expired
+
+class UploadSessionReaper:
+    """Background task deleting expired upload sessions every ``interval`` seconds"""
+
+    def __init__(self, interval: float = UPLOAD_SESSION_CLEANUP_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="upload-session-reaper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                with timed("upload_session_cleanup"):
+                    async with AsyncSessionLocal() as db:
+                        expired = await expire_sessions(db)
+                if expired:
+                    logger.info("Deleted %d expired upload sessions", expired)
+            except Exception:
+                logger.exception("Cleaning up expired upload sessions failed")
+            await asyncio.sleep(self.interval)
+
+upload_session_reaper = UploadSessionReaper()
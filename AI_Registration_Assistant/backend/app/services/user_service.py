@@ -1,49 +1,99 @@
-from sqlalchemy.orm import Session
+import base64
+import binascii
+import json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from typing import Optional
-from passlib.context import CryptContext
+from typing import AsyncIterator, List, Optional, Tuple
 
 from app.models.models import User, Profile
 from app.schemas.schemas import UserCreate, UserUpdate
+from app.services.principal_cache import invalidate_principal
+from app.utils.password_hasher import (
+    get_password_hash, verify_password, get_password_hash_async, verify_password_async
+)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.get(User, user_id)
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
 
-def get_user(db: Session, user_id: int) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+# Plain column rows for listings; avoids building ORM objects per row
+USER_LIST_COLUMNS = [
+    User.id, User.email, User.username, User.full_name,
+    User.is_active, User.is_admin, User.created_at, User.updated_at
+]
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+def encode_cursor(last_id: int) -> str:
+    """Opaque continuation token for keyset pagination on users.id"""
+    payload = json.dumps({"after_id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
 
-def get_user_by_username(db: Session, username: str) -> Optional[User]:
-    return db.query(User).filter(User.username == username).first()
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after_id = json.loads(base64.urlsafe_b64decode(padded))["after_id"]
+        if not isinstance(after_id, int):
+            raise ValueError
+        return after_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+async def get_users(
+    db: AsyncSession, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List, Optional[str]]:
+    """
+    Return one page of users ordered by id and the cursor for the next page.
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(User).offset(skip).limit(limit).all()
+    Uses keyset pagination (``WHERE id > :after_id``) so every page costs the
+    same index range scan no matter how deep it is.
+    """
+    query = select(*USER_LIST_COLUMNS).order_by(User.id).limit(limit + 1)
+    if cursor:
+        query = query.where(User.id > decode_cursor(cursor))
+    rows = (await db.execute(query)).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+    return rows, next_cursor
+
+async def stream_users(db: AsyncSession, batch_size: int = 1000) -> AsyncIterator:
+    """Yield every user row through a server-side cursor in constant memory"""
+    result = await db.stream(
+        select(*USER_LIST_COLUMNS).order_by(User.id).execution_options(yield_per=batch_size)
+    )
+    async for partition in result.partitions(batch_size):
+        for row in partition:
+            yield row
 
-def create_user(db: Session, user: UserCreate) -> User:
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
     # Check if email already exists
-    if get_user_by_email(db, user.email):
+    if await get_user_by_email(db, user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Check if username already exists
-    if get_user_by_username(db, user.username):
+    if await get_user_by_username(db, user.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -52,18 +102,18 @@ def create_user(db: Session, user: UserCreate) -> User:
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.flush()
     
-    # Create empty profile for user
+    # Create empty profile for user in the same transaction
     db_profile = Profile(user_id=db_user.id)
     db.add(db_profile)
-    db.commit()
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
-def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User:
-    db_user = get_user(db, user_id)
+async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate) -> User:
+    db_user = await get_user(db, user_id)
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,22 +121,25 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User:
         )
     
     # Update user fields if provided
+    previous_username = db_user.username
     update_data = user_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_user, key, value)
     
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    invalidate_principal(previous_username, db_user.username)
+    await db.refresh(db_user)
     return db_user
 
-def delete_user(db: Session, user_id: int) -> bool:
-    db_user = get_user(db, user_id)
+async def delete_user(db: AsyncSession, user_id: int) -> bool:
+    db_user = await get_user(db, user_id)
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
+    invalidate_principal(db_user.username)
     return True
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from app.config.settings import (
+    STORAGE_BACKEND, UPLOAD_DIR, DOWNLOAD_CHUNK_SIZE,
+    S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL, S3_REGION, S3_PART_SIZE,
+)
+from app.storage.base import StorageBackend, StorageWriter, StoredObject
+from app.storage.local import LocalStorage
+
+_storage: Optional[StorageBackend] = None
+
+def create_storage(backend: str = STORAGE_BACKEND) -> StorageBackend:
+    """Build the storage backend named by STORAGE_BACKEND"""
+    if backend == "local":
+        return LocalStorage(UPLOAD_DIR, chunk_size=DOWNLOAD_CHUNK_SIZE)
+    if backend == "s3":
+        from app.storage.s3 import S3Storage
+        return S3Storage(
+            S3_BUCKET,
+            prefix=S3_PREFIX,
+            endpoint_url=S3_ENDPOINT_URL,
+            region=S3_REGION,
+            part_size=S3_PART_SIZE,
+            chunk_size=DOWNLOAD_CHUNK_SIZE,
+        )
+    raise RuntimeError(f"Unknown STORAGE_BACKEND {backend!r} (expected 'local' or 's3')")
+
+def get_storage() -> StorageBackend:
+    """The configured storage backend, created on first use"""
+    global _storage
+    if _storage is None:
+        _storage = create_storage()
+    return _storage
+
+__all__ = [
+    "StorageBackend", "StorageWriter", "StoredObject", "LocalStorage",
+    "create_storage", "get_storage",
+]
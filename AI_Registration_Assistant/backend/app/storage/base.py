@@ -0,0 +1,82 @@
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import PurePosixPath
+from typing import AsyncIterator, NamedTuple, Optional
+
+class StoredObject(NamedTuple):
+    size: int
+    modified: float  # POSIX timestamp
+    etag: str  # quoted, usable as an HTTP ETag
+
+class StorageWriter(ABC):
+    """
+    Incremental writer for one object. Nothing is visible under the key
+    until ``commit`` succeeds; ``abort`` discards what was written.
+    """
+
+    key: str
+    size: int = 0
+
+    @abstractmethod
+    async def write(self, chunk: bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def commit(self) -> None:
+        ...
+
+    @abstractmethod
+    async def abort(self) -> None:
+        ...
+
+    async def __aenter__(self) -> "StorageWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            await self.abort()
+
+class StorageBackend(ABC):
+    """Where uploaded documents are kept, addressed by relative keys"""
+
+    @staticmethod
+    def new_key(file_name: str = "") -> str:
+        """
+        A fresh key sharded by its leading hex digits, e.g. ``3f/a2/3fa2...pdf``,
+        so no directory or key prefix ever holds more than a small slice of
+        all files.
+        """
+        name = uuid.uuid4().hex
+        return f"{name[:2]}/{name[2:4]}/{name}{PurePosixPath(file_name).suffix.lower()}"
+
+    @staticmethod
+    def validate_key(key: str) -> str:
+        """Reject keys that are absolute or climb out of the storage root"""
+        parts = PurePosixPath(key).parts
+        if not key or "\\" in key or key.startswith("/") or any(p in ("", ".", "..") for p in parts):
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return key
+
+    @abstractmethod
+    async def open_writer(self, key: str) -> StorageWriter:
+        """Start writing a new object under ``key``"""
+
+    @abstractmethod
+    def read(self, key: str, offset: int = 0, length: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Stream an object (or a byte range of it) in chunks"""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        """Size and modification time of an object, or None if it does not exist"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove an object; missing objects are ignored"""
+
+    @abstractmethod
+    async def put_file(self, path: str, key: str) -> None:
+        """Move a finished local file into storage under ``key``"""
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path of an object when the backend is local disk (enables sendfile)"""
+        return None
@@ -0,0 +1,100 @@
+import os
+import shutil
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.storage.base import StorageBackend, StorageWriter, StoredObject
+
+class LocalFileWriter(StorageWriter):
+    def __init__(self, key: str, path: Path):
+        self.key = key
+        self.path = path
+        self.temp_path = path.with_name(f".{path.name}.part")
+        self.size = 0
+        self._buffer: Optional[BinaryIO] = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._buffer = open(self.temp_path, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        await run_in_threadpool(self._buffer.write, chunk)
+        self.size += len(chunk)
+
+    def _commit(self) -> None:
+        self._buffer.flush()
+        os.fsync(self._buffer.fileno())
+        self._buffer.close()
+        os.replace(self.temp_path, self.path)
+
+    async def commit(self) -> None:
+        """Flush to disk and rename into place, so readers never see a partial file"""
+        await run_in_threadpool(self._commit)
+
+    def _abort(self) -> None:
+        if not self._buffer.closed:
+            self._buffer.close()
+        self.temp_path.unlink(missing_ok=True)
+
+    async def abort(self) -> None:
+        await run_in_threadpool(self._abort)
+
+class LocalStorage(StorageBackend):
+    """Files under a root directory, in the sharded layout of ``new_key``"""
+
+    def __init__(self, root: str, chunk_size: int = 256 * 1024):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+
+    def _path(self, key: str) -> Path:
+        return self.root / self.validate_key(key)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return str(self._path(key))
+
+    async def open_writer(self, key: str) -> LocalFileWriter:
+        writer = LocalFileWriter(key, self._path(key))
+        await run_in_threadpool(writer._open)
+        return writer
+
+    async def read(self, key: str, offset: int = 0, length: Optional[int] = None) -> AsyncIterator[bytes]:
+        f = await run_in_threadpool(open, self._path(key), "rb")
+        try:
+            if offset:
+                await run_in_threadpool(f.seek, offset)
+            remaining = length
+            while remaining is None or remaining > 0:
+                size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                chunk = await run_in_threadpool(f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await run_in_threadpool(f.close)
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            stat_result = await run_in_threadpool(os.stat, self._path(key))
+        except FileNotFoundError:
+            return None
+        return StoredObject(
+            size=stat_result.st_size,
+            modified=stat_result.st_mtime,
+            etag=f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+        )
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool(self._path(key).unlink, missing_ok=True)
+
+    def _put_file(self, path: str, key: str) -> None:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # A rename when on the same filesystem, a copy otherwise
+        shutil.move(path, target)
+
+    async def put_file(self, path: str, key: str) -> None:
+        await run_in_threadpool(self._put_file, path, key)
@@ -0,0 +1,156 @@
+import os
+from typing import AsyncIterator, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.storage.base import StorageBackend, StorageWriter, StoredObject
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # only needed with STORAGE_BACKEND=s3
+    boto3 = None
+
+# S3 rejects multipart parts smaller than this, except the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+class S3Writer(StorageWriter):
+    """
+    Buffers up to one part in memory and uploads it as a multipart part.
+    Objects smaller than a part are sent with a single PUT on commit.
+    """
+
+    def __init__(self, storage: "S3Storage", key: str):
+        self.storage = storage
+        self.key = key
+        self.size = 0
+        self._object_key = storage._object_key(key)
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[dict] = []
+
+    async def write(self, chunk: bytes) -> None:
+        self._buffer += chunk
+        self.size += len(chunk)
+        if len(self._buffer) >= self.storage.part_size:
+            await self._upload_part()
+
+    async def _upload_part(self) -> None:
+        client = self.storage.client
+        if self._upload_id is None:
+            response = await run_in_threadpool(
+                client.create_multipart_upload, Bucket=self.storage.bucket, Key=self._object_key
+            )
+            self._upload_id = response["UploadId"]
+        body = bytes(self._buffer)
+        self._buffer.clear()
+        part_number = len(self._parts) + 1
+        response = await run_in_threadpool(
+            client.upload_part,
+            Bucket=self.storage.bucket, Key=self._object_key,
+            UploadId=self._upload_id, PartNumber=part_number, Body=body,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    async def commit(self) -> None:
+        client = self.storage.client
+        if self._upload_id is None:
+            await run_in_threadpool(
+                client.put_object,
+                Bucket=self.storage.bucket, Key=self._object_key, Body=bytes(self._buffer),
+            )
+            self._buffer.clear()
+            return
+        if self._buffer:
+            await self._upload_part()
+        await run_in_threadpool(
+            client.complete_multipart_upload,
+            Bucket=self.storage.bucket, Key=self._object_key,
+            UploadId=self._upload_id, MultipartUpload={"Parts": self._parts},
+        )
+
+    async def abort(self) -> None:
+        self._buffer.clear()
+        if self._upload_id is not None:
+            await run_in_threadpool(
+                self.storage.client.abort_multipart_upload,
+                Bucket=self.storage.bucket, Key=self._object_key, UploadId=self._upload_id,
+            )
+            self._upload_id = None
+
+class S3Storage(StorageBackend):
+    """
+    Objects in an S3-compatible bucket. ``endpoint_url`` points the client at
+    a stand-in such as MinIO; credentials come from the usual AWS sources
+    (environment, shared config, instance role). boto3 calls are blocking
+    and run in the threadpool.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        part_size: int = 8 * 1024 * 1024,
+        chunk_size: int = 256 * 1024,
+    ):
+        if boto3 is None:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.chunk_size = chunk_size
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region or None)
+
+    def _object_key(self, key: str) -> str:
+        return self.prefix + self.validate_key(key)
+
+    async def open_writer(self, key: str) -> S3Writer:
+        return S3Writer(self, key)
+
+    async def read(self, key: str, offset: int = 0, length: Optional[int] = None) -> AsyncIterator[bytes]:
+        kwargs = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if offset or length is not None:
+            end = "" if length is None else str(offset + length - 1)
+            kwargs["Range"] = f"bytes={offset}-{end}"
+        response = await run_in_threadpool(lambda: self.client.get_object(**kwargs))
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await run_in_threadpool(body.read, self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            response = await run_in_threadpool(
+                lambda: self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StoredObject(
+            size=response["ContentLength"],
+            modified=response["LastModified"].timestamp(),
+            etag=response["ETag"],
+        )
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool(
+            lambda: self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+        )
+
+    def _put_file(self, path: str, key: str) -> None:
+        # Managed transfer: multipart with parallel parts for large files
+        self.client.upload_file(path, self.bucket, self._object_key(key))
+        os.remove(path)
+
+    async def put_file(self, path: str, key: str) -> None:
+        await run_in_threadpool(self._put_file, path, key)
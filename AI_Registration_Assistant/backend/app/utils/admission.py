@@ -0,0 +1,161 @@
+import math
+import re
+from typing import Iterable, List, Optional, Sequence
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.settings import (
+    SECRET_KEY, ALGORITHM, API_V1_STR,
+    UPLOAD_RATE_PER_SECOND, UPLOAD_BURST, MAX_CONCURRENT_UPLOADS,
+    LOGIN_RATE_PER_SECOND, LOGIN_BURST, MAX_CONCURRENT_LOGINS,
+)
+from app.utils.metrics import Counter, Gauge, registry
+from app.utils.rate_limit import RateLimitBackend
+
+admission_rejections = registry.register(Counter(
+    "app_admission_rejections_total", "Requests shed by admission control", ("policy", "reason")
+))
+admission_in_flight = registry.register(Gauge(
+    "app_admission_in_flight", "Admitted requests currently running", ("policy",)
+))
+
+# Retry-After for requests shed because all slots are busy
+BUSY_RETRY_AFTER_SECONDS = 1
+
+class AdmissionPolicy:
+    """
+    Limits for one class of expensive requests: a token bucket per client
+    IP and per authenticated user, and a cap on how many run at once in
+    this process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        routes: Iterable[str],
+        rate: float,
+        burst: int,
+        max_concurrent: int,
+    ):
+        self.name = name
+        self.routes = [re.compile(route) for route in routes]
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+
+    def matches(self, method: str, path: str) -> bool:
+        target = f"{method} {path}"
+        return any(route.fullmatch(target) for route in self.routes)
+
+    def try_enter(self) -> bool:
+        if self.max_concurrent > 0 and self.in_flight >= self.max_concurrent:
+            return False
+        self.in_flight += 1
+        admission_in_flight.inc(self.name)
+        return True
+
+    def leave(self) -> None:
+        self.in_flight -= 1
+        admission_in_flight.dec(self.name)
+
+def default_policies() -> List[AdmissionPolicy]:
+    """Uploads (disk and bandwidth) and logins (bcrypt CPU), as configured in settings"""
+    return [
+        AdmissionPolicy(
+            "upload",
+            [
+                f"POST {API_V1_STR}/register",
+                f"POST {API_V1_STR}/register/bulk",
+                f"PUT {API_V1_STR}/uploads/[^/]+",
+            ],
+            rate=UPLOAD_RATE_PER_SECOND,
+            burst=UPLOAD_BURST,
+            max_concurrent=MAX_CONCURRENT_UPLOADS,
+        ),
+        AdmissionPolicy(
+            "login",
+            ["POST /api/auth/token"],
+            rate=LOGIN_RATE_PER_SECOND,
+            burst=LOGIN_BURST,
+            max_concurrent=MAX_CONCURRENT_LOGINS,
+        ),
+    ]
+
+def _user_from_token(headers: Headers) -> Optional[str]:
+    """Username of a valid bearer token; no database lookup"""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware shedding load on expensive routes before they run.
+
+    A matching request is refused with 503 when its policy is at its
+    concurrency cap, or with 429 when the client's token bucket is empty,
+    both with ``Retry-After``. The decision is made from the request line
+    and headers alone, so a refused request's body is never read. The
+    client IP is the one the server reports (run uvicorn/gunicorn with
+    proxy headers enabled behind a load balancer).
+    """
+
+    def __init__(self, app: ASGIApp, policies: Sequence[AdmissionPolicy], backend: RateLimitBackend):
+        self.app = app
+        self.policies: List[AdmissionPolicy] = list(policies)
+        self.backend = backend
+
+    def _policy(self, scope: Scope) -> Optional[AdmissionPolicy]:
+        for policy in self.policies:
+            if policy.matches(scope["method"], scope["path"]):
+                return policy
+        return None
+
+    async def _wait(self, policy: AdmissionPolicy, scope: Scope) -> float:
+        """
+        Longest wait imposed by the client's IP and user buckets; 0 if both
+        have a token, in which case one is taken from each, and from neither
+        otherwise.
+        """
+        keys = [f"{policy.name}:ip:{scope['client'][0] if scope.get('client') else 'unknown'}"]
+        user = _user_from_token(Headers(scope=scope))
+        if user:
+            keys.append(f"{policy.name}:user:{user}")
+        return await self.backend.acquire(keys, policy.rate, policy.burst)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        policy = self._policy(scope) if scope["type"] == "http" else None
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not policy.try_enter():
+            admission_rejections.inc(policy.name, "busy")
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(BUSY_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            wait = await self._wait(policy, scope)
+            if wait > 0:
+                admission_rejections.inc(policy.name, "rate_limited")
+                response = JSONResponse(
+                    {"detail": "Too many requests"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, receive, send)
+                return
+            await self.app(scope, receive, send)
+        finally:
+            policy.leave()
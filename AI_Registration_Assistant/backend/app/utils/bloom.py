@@ -0,0 +1,60 @@
+import hashlib
+import math
+from typing import Iterable
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    ``might_contain`` never returns False for an added item; it returns True
+    for an absent one with a probability that stays near ``error_rate`` as
+    long as no more than ``capacity`` items are added. Items cannot be
+    removed, so the filter is rebuilt from the source of truth instead.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def might_contain(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    __contains__ = might_contain
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+    def expected_error_rate(self) -> float:
+        """False-positive probability at the current fill, ``(1 - e^(-kn/m))^k``"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def stats(self) -> dict:
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "memory_bytes": self.memory_bytes,
+            "hashes": self.num_hashes,
+            "expected_false_positive_rate": round(self.expected_error_rate(), 6),
+        }
@@ -1,56 +1,265 @@
+import hashlib
 import os
-import uuid
 from pathlib import Path
-from typing import Optional
-from fastapi import UploadFile, HTTPException, status
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.config.settings import UPLOAD_DIR, MAX_UPLOAD_SIZE, UPLOAD_CHUNK_SIZE, ALLOWED_UPLOAD_MIME_TYPES
+from app.storage import StorageBackend, StorageWriter, get_storage
+from app.utils.file_inspector import SNIFF_SIZE, detect_mime_type, mime_type_allowed
+from app.utils.metrics import timed
+
+try:
+    import fcntl
+except ImportError:  # Windows; concurrent writes to one session are not prevented
+    fcntl = None
+
+def check_upload_type(head: bytes, file_name: str) -> str:
+    """Sniff an upload's MIME type from its leading bytes; 415 unless it is allowed"""
+    mime_type = detect_mime_type(head, file_name)
+    if not mime_type_allowed(mime_type, ALLOWED_UPLOAD_MIME_TYPES):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"File {file_name} is {mime_type}, which is not an accepted file type"
+        )
+    return mime_type
+
+class UploadWriter:
+    """
+    One upload on its way into storage. Chunks are size-checked and hashed
+    (for deduplication) as they arrive, and handed to the backend writer in
+    batches of about ``chunk_size`` bytes; nothing is visible under the key
+    until ``commit``. Nothing reaches the backend either until the first
+    ``SNIFF_SIZE`` bytes have passed the MIME type check, so a disallowed
+    file is rejected after a few KB.
+    """
+
+    def __init__(self, writer: StorageWriter, file_name: str, max_size: Optional[int], chunk_size: int):
+        self.writer = writer
+        self.file_name = file_name
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.mime_type: Optional[str] = None
+        self._pending = bytearray()
+
+    async def write(self, chunk: bytes) -> None:
+        if self.max_size is not None and self.size + len(chunk) > self.max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File {self.file_name} exceeds maximum size of {self.max_size} bytes"
+            )
+        self.size += len(chunk)
+        self.digest.update(chunk)
+        self._pending += chunk
+        if self.mime_type is None:
+            if len(self._pending) < SNIFF_SIZE:
+                return
+            self.mime_type = check_upload_type(bytes(self._pending[:SNIFF_SIZE]), self.file_name)
+        if len(self._pending) >= self.chunk_size:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if self._pending:
+            data = bytes(self._pending)
+            self._pending.clear()
+            await self.writer.write(data)
+
+    async def commit(self) -> dict:
+        """Make the file visible and return its record"""
+        if self.mime_type is None:
+            # Smaller than SNIFF_SIZE: the whole file is still buffered
+            self.mime_type = check_upload_type(bytes(self._pending), self.file_name)
+        await self._flush()
+        await self.writer.commit()
+        return {
+            "file_name": self.file_name,
+            "file_url": self.writer.key,
+            "size": self.size,
+            "sha256": self.digest.hexdigest(),
+            "mime_type": self.mime_type
+        }
+
+    async def abort(self) -> None:
+        self._pending.clear()
+        await self.writer.abort()
 
 class FileHandler:
-    def __init__(self, upload_dir: str = "uploads"):
+    """
+    Streams uploads into the configured storage backend. Stored files are
+    identified by a relative storage key (saved as ``file_url``), never by a
+    path. Resumable upload sessions need random-access writes, so they are
+    staged as local files under ``upload_dir`` and moved into storage once
+    complete.
+    """
+
+    def __init__(
+        self,
+        storage: Optional[StorageBackend] = None,
+        upload_dir: str = UPLOAD_DIR,
+        chunk_size: int = UPLOAD_CHUNK_SIZE
+    ):
+        self._storage = storage
         self.upload_dir = Path(upload_dir)
-        self._ensure_upload_dir_exists()
+        self.chunk_size = chunk_size
+        self._upload_dir_ready = False
+    
+    @property
+    def storage(self) -> StorageBackend:
+        # Resolved on use so importing this module never builds a backend
+        return self._storage or get_storage()
     
     def _ensure_upload_dir_exists(self) -> None:
-        """Create upload directory if it doesn't exist"""
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        """Create the staging directory if it doesn't exist (once, on first write)"""
+        if not self._upload_dir_ready:
+            self.upload_dir.mkdir(parents=True, exist_ok=True)
+            self._upload_dir_ready = True
     
-    async def save_upload_file(self, upload_file: UploadFile, company_id: str) -> dict:
-        """Save an uploaded file to the filesystem"""
+    async def open_upload(self, file_name: str, max_size: Optional[int] = MAX_UPLOAD_SIZE) -> "UploadWriter":
+        """Start streaming a new upload into storage under a fresh sharded key"""
+        key = self.storage.new_key(file_name)
+        return UploadWriter(await self.storage.open_writer(key), file_name, max_size, self.chunk_size)
+    
+    def session_path(self, session_id: str) -> Path:
+        """File that accumulates the bytes of an unfinished upload session"""
+        return self.upload_dir / f".{session_id}.upload"
+    
+    async def create_session_file(self, session_id: str) -> None:
+        """Create the empty file a new upload session writes into"""
+        def create() -> None:
+            self._ensure_upload_dir_exists()
+            self.session_path(session_id).touch()
+        await run_in_threadpool(create)
+    
+    def _open_session_file(self, session_id: str, offset: int) -> BinaryIO:
+        """
+        Lock a session file and position it at ``offset``.
+
+        Bytes past ``offset`` are leftovers of an attempt whose progress was
+        never recorded and are discarded. Fewer bytes than ``offset`` means the
+        caller's view of the session is stale.
+        """
+        buffer = open(self.session_path(session_id), "r+b")
         try:
-            # Generate a unique filename to prevent collisions
-            file_ext = Path(upload_file.filename).suffix
-            filename = f"{uuid.uuid4()}{file_ext}"
-            file_path = self.upload_dir / filename
-            
-            # Save the file
-            with open(file_path, "wb") as buffer:
-                content = await upload_file.read()
-                buffer.write(content)
-            
-            # Return file info
-            return {
-                "file_name": upload_file.filename,
-                "file_url": str(file_path.absolute())
-            }
-            
-        except Exception as e:
-            # Clean up if there was an error
-            if 'file_path' in locals() and file_path.exists():
-                file_path.unlink()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error saving file: {str(e)}"
-            )
+            if fcntl is not None:
+                try:
+                    fcntl.flock(buffer.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Another request is uploading to this session"
+                    )
+            size = os.fstat(buffer.fileno()).st_size
+            if size < offset:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload has only {size} bytes; resume from that offset"
+                )
+            buffer.truncate(offset)
+            buffer.seek(offset)
+            return buffer
+        except BaseException:
+            buffer.close()
+            raise
+    
+    @staticmethod
+    def _close_session_file(buffer: BinaryIO) -> None:
+        buffer.flush()
+        os.fsync(buffer.fileno())
+        buffer.close()
     
-    def delete_file(self, file_url: str) -> bool:
-        """Delete a file from the filesystem"""
+    async def write_range(
+        self,
+        session_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+        limit: int,
+        file_name: Optional[str] = None
+    ) -> int:
+        """
+        Stream bytes into an upload session's file starting at ``offset``.
+
+        Memory use is one chunk regardless of the range size. Whatever was
+        written is flushed to disk even if the stream breaks off, so the
+        session file's size is always the durable upload offset. More than
+        ``limit`` bytes is rejected. With ``file_name``, a range starting at
+        0 has its type checked once ``SNIFF_SIZE`` bytes are in, so a
+        disallowed file fails on its first request. Returns the new offset.
+        """
+        with timed("file_save"):
+            buffer = await run_in_threadpool(self._open_session_file, session_id, offset)
+            try:
+                written = 0
+                head = bytearray() if offset == 0 and file_name else None
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    written += len(chunk)
+                    if written > limit:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Request body is longer than its Content-Range"
+                        )
+                    if head is not None:
+                        head += chunk[:SNIFF_SIZE - len(head)]
+                        if len(head) == SNIFF_SIZE:
+                            check_upload_type(bytes(head), file_name)
+                            head = None
+                    await run_in_threadpool(buffer.write, chunk)
+                return offset + written
+            finally:
+                await run_in_threadpool(self._close_session_file, buffer)
+    
+    def session_size(self, session_id: str) -> int:
+        """Bytes durably written to an upload session so far"""
         try:
-            file_path = Path(file_url)
-            if file_path.exists():
-                file_path.unlink()
-                return True
-            return False
-        except Exception:
-            return False
+            return self.session_path(session_id).stat().st_size
+        except FileNotFoundError:
+            return 0
+    
+    def _hash_file(self, path: Path) -> Tuple[int, str, bytes]:
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            head = f.read(SNIFF_SIZE)
+            f.seek(0)
+            while True:
+                chunk = f.read(1024 * 1024)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+        return size, digest.hexdigest(), head
+    
+    async def finalize_session(self, session_id: str, file_name: str) -> dict:
+        """Hash and type-check a fully uploaded session file and move it into storage"""
+        key = self.storage.new_key(file_name)
+        session_path = self.session_path(session_id)
+        # Ranges may have been rewritten on resume, so hash the final bytes once
+        size, sha256, head = await run_in_threadpool(self._hash_file, session_path)
+        mime_type = check_upload_type(head, file_name)
+        await self.storage.put_file(str(session_path), key)
+        return {
+            "file_name": file_name,
+            "file_url": key,
+            "size": size,
+            "sha256": sha256,
+            "mime_type": mime_type
+        }
+    
+    async def discard_session(self, session_id: str) -> None:
+        """Remove the partial file of an abandoned upload session"""
+        await run_in_threadpool(self.session_path(session_id).unlink, missing_ok=True)
+    
+    async def delete_files(self, keys: List[str]) -> None:
+        """Delete several stored files, ignoring ones that cannot be removed"""
+        for key in keys:
+            try:
+                await self.storage.delete(key)
+            except Exception:
+                pass
 
 # Initialize file handler
 file_handler = FileHandler()
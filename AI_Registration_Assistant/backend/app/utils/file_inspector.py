@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import mimetypes
+from typing import Iterable, NamedTuple, Optional
+
+try:
+    import magic
+except ImportError:  # libmagic missing; fall back to the signatures below
+    magic = None
+
+logger = logging.getLogger(__name__)
+
+if magic is None:
+    logger.warning(
+        "python-magic/libmagic is not installed: upload types are sniffed from a built-in "
+        "list of signatures only, and anything it does not recognize is rejected"
+    )
+
+# Bytes handed to libmagic; enough for every signature it checks by default
+SNIFF_SIZE = 8192
+
+# Leading bytes of the formats the upload allowlist is about, plus common
+# executables so that they are named in the 415 message
+SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"BM", "image/bmp"),
+    (b"{\\rtf", "text/rtf"),
+    (b"MZ", "application/x-dosexec"),
+    (b"\x7fELF", "application/x-executable"),
+    (b"\xca\xfe\xba\xbe", "application/x-mach-binary"),
+    (b"\xcf\xfa\xed\xfe", "application/x-mach-binary"),
+    (b"#!", "text/x-shellscript"),
+]
+
+ZIP_SIGNATURE = b"PK\x03\x04"
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# Office Open XML packages, told apart by their part names
+OOXML_PARTS = [
+    (b"word/", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    (b"xl/", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    (b"ppt/", "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+]
+
+# Legacy Office files share one container format; the extension picks among these
+OLE_TYPES = {"application/msword", "application/vnd.ms-excel", "application/vnd.ms-powerpoint"}
+
+def _sniff_zip(head: bytes) -> str:
+    # OpenDocument stores its type uncompressed as the first entry, "mimetype"
+    if head[30:38] == b"mimetype":
+        declared = head[38:38 + 100].split(b"PK", 1)[0]
+        if declared.startswith(b"application/vnd.oasis.opendocument."):
+            return declared.decode("ascii", "replace")
+    if b"[Content_Types].xml" in head:
+        for part, mime_type in OOXML_PARTS:
+            if part in head:
+                return mime_type
+    return "application/zip"
+
+def _looks_like_text(head: bytes) -> bool:
+    # A multi-byte character may be cut off at the end of the sniffed bytes
+    try:
+        text = head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start < len(head) - 3:
+            return False
+        text = head[:e.start].decode("utf-8")
+    return not any(ord(c) < 32 and c not in "\t\n\r\f" for c in text)
+
+def sniff_mime_type(head: bytes, file_name: str) -> str:
+    """
+    MIME type from a built-in table of signatures, used without libmagic.
+
+    Only formats recognized from their content get a specific type; the
+    file name is consulted only to name a text file (CSV vs plain text) or
+    a legacy Office file, never to vouch for binary content.
+    """
+    guessed: Optional[str] = mimetypes.guess_type(file_name)[0]
+    for signature, mime_type in SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    if head.startswith(ZIP_SIGNATURE):
+        return _sniff_zip(head)
+    if head.startswith(OLE_SIGNATURE):
+        return guessed if guessed in OLE_TYPES else "application/x-ole-storage"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head and _looks_like_text(head):
+        return guessed if guessed and guessed.startswith("text/") else "text/plain"
+    return "application/octet-stream"
+
+class FileInfo(NamedTuple):
+    mime_type: str
+    size_bytes: int
+    sha256: str
+
+def detect_mime_type(head: bytes, file_name: str) -> str:
+    """Sniff the MIME type from the leading bytes, with libmagic if available"""
+    if magic is not None and head:
+        try:
+            return magic.from_buffer(head, mime=True)
+        except magic.MagicException:
+            pass
+    return sniff_mime_type(head, file_name)
+
+def mime_type_allowed(mime_type: str, allowed: Iterable[str]) -> bool:
+    """Match against an allowlist of exact types and ``type/*`` families; empty allows all"""
+    allowed = list(allowed)
+    if not allowed:
+        return True
+    family = mime_type.split("/", 1)[0] + "/*"
+    return mime_type in allowed or family in allowed
+
+class FileInspector:
+    """
+    Computes a file's MIME type, size and SHA-256 in one pass over its
+    chunks, so it works on any stream without holding the file in memory.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+
+    def update(self, chunk: bytes) -> None:
+        if len(self.head) < SNIFF_SIZE:
+            self.head += chunk[:SNIFF_SIZE - len(self.head)]
+        self.digest.update(chunk)
+        self.size += len(chunk)
+
+    def result(self) -> FileInfo:
+        return FileInfo(
+            mime_type=detect_mime_type(self.head, self.file_name),
+            size_bytes=self.size,
+            sha256=self.digest.hexdigest(),
+        )
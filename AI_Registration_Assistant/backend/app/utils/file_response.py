@@ -0,0 +1,165 @@
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Mapping, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.services.company_cache import etag_matches
+from app.storage import StorageBackend, StoredObject
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+# Stored files are immutable (every upload gets a new key), so clients may
+# keep them for a year; "private" because downloads require authentication.
+DOWNLOAD_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+ByteRange = Tuple[int, int]  # (offset, length)
+
+def parse_range(header: Optional[str], size: int) -> Optional[ByteRange]:
+    """
+    Parse a single-range ``Range: bytes=...`` header.
+
+    Returns None when the whole file should be sent (no header, or a
+    multi-range request, which may be answered in full per RFC 7233) and
+    raises ValueError when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end - start + 1
+
+def _not_modified(headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def _range_applies(headers: Mapping[str, str], etag: str, last_modified: str) -> bool:
+    """``If-Range``: only honour Range if the client's copy is still current"""
+    if_range = headers.get("if-range")
+    return if_range is None or if_range.strip() in (etag, last_modified)
+
+class StoredFileResponse(Response):
+    """
+    Serve a stored file with conditional and Range request support.
+
+    For local storage the body is handed to the server with the ASGI
+    ``zerocopysend`` extension (``sendfile``) when the server offers it;
+    otherwise it is streamed in chunks from the storage backend, so memory
+    use does not depend on file size.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        key: str,
+        stored: StoredObject,
+        request_headers: Mapping[str, str],
+        media_type: str,
+        filename: str,
+        method: str = "GET",
+        background: Optional[BackgroundTask] = None,
+    ):
+        self.storage = storage
+        self.key = key
+        self.background = background
+        self.media_type = media_type
+        self.send_body = method != "HEAD"
+        self.byte_range: Optional[ByteRange] = None
+        self.body = b""
+
+        size = stored.size
+        etag = stored.etag
+        last_modified = formatdate(stored.modified, usegmt=True)
+        headers = {
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "last-modified": last_modified,
+            "cache-control": DOWNLOAD_CACHE_CONTROL,
+            "x-content-type-options": "nosniff",
+            "content-disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+        }
+
+        if _not_modified(request_headers, etag, stored.modified):
+            self.status_code = 304
+            self.send_body = False
+            self.init_headers(headers)
+            return
+
+        status_code = 200
+        length = size
+        if _range_applies(request_headers, etag, last_modified):
+            try:
+                self.byte_range = parse_range(request_headers.get("range"), size)
+            except ValueError:
+                self.status_code = 416
+                self.send_body = False
+                headers["content-range"] = f"bytes */{size}"
+                self.init_headers(headers)
+                return
+        if self.byte_range is not None:
+            start, length = self.byte_range
+            status_code = 206
+            headers["content-range"] = f"bytes {start}-{start + length - 1}/{size}"
+
+        self.status_code = status_code
+        headers["content-length"] = str(length)
+        self.init_headers(headers)
+        self.byte_range = self.byte_range or (0, size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        offset, length = self.byte_range or (0, 0)
+        path = self.storage.local_path(self.key)
+        if not self.send_body or length == 0:
+            await send({"type": "http.response.body", "body": b""})
+        elif path is not None and ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            f = await run_in_threadpool(open, path, "rb")
+            try:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": f,
+                    "offset": offset,
+                    "count": length,
+                })
+            finally:
+                await run_in_threadpool(f.close)
+        else:
+            await self._send_chunks(offset, length, send)
+        if self.background is not None:
+            await self.background()
+
+    async def _send_chunks(self, offset: int, length: int, send: Send) -> None:
+        async for chunk in self.storage.read(self.key, offset, length):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
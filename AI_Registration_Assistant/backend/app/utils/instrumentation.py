@@ -0,0 +1,95 @@
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.metrics import (
+    RequestStats, current_request, record_query,
+    http_requests, http_request_duration, http_in_flight,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, status counts, in-flight
+    requests and the SQL work done for each request.
+
+    Routes are labelled with their path template (``/api/v1/companies/{company_id}``)
+    so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp, routes_app=None):
+        self.app = app
+        self.routes_app = routes_app
+        self._route_paths: Optional[Dict[object, str]] = None
+
+    def _route_label(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None or self.routes_app is None:
+            return UNMATCHED_ROUTE
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path
+                for route in self.routes_app.routes
+                if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestStats()
+        token = current_request.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            http_in_flight.dec(method)
+            current_request.reset(token)
+            route = self._route_label(scope)
+            http_requests.inc(method, route, str(status_code))
+            http_request_duration.observe(duration, method, route)
+            stats.finish(route)
+
+def instrument_engine(engine) -> None:
+    """
+    Time every statement executed through a (sync) SQLAlchemy engine.
+
+    The start time lives on the statement's execution context, which is
+    discarded with it, so statements that fail are timed too and leave
+    nothing behind on the pooled connection.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _record(context)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        _record(exception_context.execution_context)
+
+def _record(context) -> None:
+    start = getattr(context, "_query_start", None)
+    if start is not None:
+        del context._query_start
+        record_query(time.perf_counter() - start)
@@ -0,0 +1,199 @@
+"""
+Minimal Prometheus-compatible metrics.
+
+Counters, gauges and histograms are plain in-process objects updated on the
+hot path with a dict lookup and a few additions; rendering to the Prometheus
+text format only happens when ``/metrics`` is scraped. Each worker process
+exposes its own values.
+"""
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional, Tuple
+
+# Latency buckets in seconds, from 1 ms to 10 s
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> list:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> list:
+        lines = self.header()
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        self._values[labels] = value
+
+class FunctionGauge(Metric):
+    """Gauge whose value is computed by a callback at scrape time"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def collect(self) -> list:
+        return self.header() + [f"{self.name} {_format_value(self.callback())}"]
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def collect(self) -> list:
+        lines = self.header()
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="{}"'.format(_format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# HTTP metrics
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method",)
+))
+
+# Database metrics
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement execution time"
+))
+db_queries = registry.register(Counter(
+    "db_queries_total", "SQL statements executed", ("route",)
+))
+db_query_time = registry.register(Counter(
+    "db_query_seconds_total", "Time spent executing SQL statements", ("route",)
+))
+db_queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request", ("route",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50)
+))
+
+# Timed code sections (file writes, password hashing, ...)
+span_duration = registry.register(Histogram(
+    "app_span_duration_seconds", "Duration of instrumented operations", ("span",)
+))
+
+class RequestStats:
+    """Per-request SQL counters, carried in a context variable"""
+
+    __slots__ = ("queries", "query_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+
+    def finish(self, route: str) -> None:
+        """Attribute this request's SQL work to its route once routing is known"""
+        db_queries_per_request.observe(self.queries, route)
+        if self.queries:
+            db_queries.inc(route, amount=self.queries)
+            db_query_time.inc(route, amount=self.query_time)
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+@contextmanager
+def timed(span: str):
+    """Record how long the enclosed block takes under ``app_span_duration_seconds``"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        span_duration.observe(time.perf_counter() - start, span)
+
+def record_query(duration: float) -> None:
+    """Called for every SQL statement; charged to the current request if any"""
+    db_query_duration.observe(duration)
+    stats = current_request.get()
+    if stats is None:
+        db_queries.inc("background")
+        db_query_time.inc("background", amount=duration)
+    else:
+        stats.queries += 1
+        stats.query_time += duration
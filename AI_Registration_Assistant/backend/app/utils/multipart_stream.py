@@ -0,0 +1,186 @@
+"""
+Incremental multipart/form-data parsing straight off the request stream.
+
+Unlike ``Request.form()``, nothing is spooled: field values are buffered up
+to a small limit and file contents are handed to the caller chunk by chunk
+as the body arrives, so a consumer can pipe them into storage with bounded
+memory. Part count and size limits are enforced while parsing, before the
+rest of the body is read.
+"""
+from typing import AsyncIterator, List, NamedTuple, Optional, Union
+
+from fastapi import HTTPException, Request, status
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+# Headers of a single part (Content-Disposition, Content-Type) are tiny
+MAX_PART_HEADER_SIZE = 16 * 1024
+
+class FormField(NamedTuple):
+    name: str
+    value: str
+
+class FileStart(NamedTuple):
+    name: str
+    filename: str
+    content_type: Optional[str]
+
+class FileData(NamedTuple):
+    data: bytes
+
+class FileEnd(NamedTuple):
+    pass
+
+MultipartEvent = Union[FormField, FileStart, FileData, FileEnd]
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+class _PartCollector:
+    """Turns MultipartParser callbacks into a list of events, applying limits"""
+
+    def __init__(self, max_fields: int, max_field_size: int, max_files: int):
+        self.max_fields = max_fields
+        self.max_field_size = max_field_size
+        self.max_files = max_files
+        self.events: List[MultipartEvent] = []
+        self.fields = 0
+        self.files = 0
+        self.finished = False
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._header_size = 0
+        self._headers = {}
+        self._name = ""
+        self._is_file = False
+        self._skip = False
+        self._value = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_end": self.on_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._header_size = 0
+        self._value.clear()
+
+    def _count_header(self, length: int) -> None:
+        self._header_size += length
+        if self._header_size > MAX_PART_HEADER_SIZE:
+            raise _bad_request("Multipart part headers are too large")
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._count_header(end - start)
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._count_header(end - start)
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if b"name" not in options:
+            raise _bad_request("Multipart part is missing a Content-Disposition name")
+        self._name = options[b"name"].decode("utf-8", "replace")
+        filename = options.get(b"filename")
+        self._is_file = filename is not None
+        # Browsers send a part with an empty filename for a file input left blank
+        self._skip = filename == b""
+        if self._skip:
+            return
+        if self._is_file:
+            self.files += 1
+            if self.files > self.max_files:
+                raise _bad_request(f"Maximum {self.max_files} files allowed per request")
+            content_type = self._headers.get(b"content-type")
+            self.events.append(FileStart(
+                name=self._name,
+                filename=filename.decode("utf-8", "replace"),
+                content_type=content_type.decode("latin-1") if content_type else None,
+            ))
+        else:
+            self.fields += 1
+            if self.fields > self.max_fields:
+                raise _bad_request(f"Maximum {self.max_fields} form fields allowed per request")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._skip:
+            return
+        if self._is_file:
+            # The parser reuses its buffer, so the slice must be copied out
+            self.events.append(FileData(bytes(data[start:end])))
+        else:
+            if len(self._value) + end - start > self.max_field_size:
+                raise _bad_request(f"Form field {self._name} exceeds {self.max_field_size} bytes")
+            self._value += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self._skip:
+            return
+        if self._is_file:
+            self.events.append(FileEnd())
+        else:
+            try:
+                value = self._value.decode("utf-8")
+            except UnicodeDecodeError:
+                raise _bad_request(f"Form field {self._name} is not valid UTF-8")
+            self.events.append(FormField(self._name, value))
+
+    def on_end(self) -> None:
+        self.finished = True
+
+async def iter_multipart(
+    request: Request,
+    max_fields: int,
+    max_field_size: int,
+    max_files: int
+) -> AsyncIterator[MultipartEvent]:
+    """
+    Parse a multipart/form-data request body as it streams in.
+
+    Yields ``FormField`` for each complete text field and, for each file
+    part, ``FileStart``, any number of ``FileData`` chunks and ``FileEnd``.
+    Raises 400 for malformed bodies or exceeded limits, as soon as the
+    offending bytes are parsed.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected a multipart/form-data body"
+        )
+    collector = _PartCollector(max_fields, max_field_size, max_files)
+    parser = MultipartParser(params[b"boundary"], collector.callbacks())
+
+    async for chunk in request.stream():
+        if not chunk:
+            continue
+        try:
+            parser.write(chunk)
+        except MultipartParseError as e:
+            raise _bad_request(f"Malformed multipart body: {e}")
+        events, collector.events = collector.events, []
+        for event in events:
+            yield event
+    try:
+        parser.finalize()
+    except MultipartParseError as e:
+        raise _bad_request(f"Malformed multipart body: {e}")
+    if not collector.finished:
+        raise _bad_request("Multipart body ended before its closing boundary")
+    for event in collector.events:
+        yield event
@@ -0,0 +1,56 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+
+from app.config.settings import PASSWORD_HASH_WORKERS
+from app.utils.metrics import timed
+
+# Password hashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+_executor: Optional[Executor] = None
+
+def get_password_hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def get_hash_executor() -> Optional[Executor]:
+    """
+    Return the process pool used for bcrypt, creating it on first use.
+
+    Returns None when PASSWORD_HASH_WORKERS is 0, in which case hashing falls
+    back to the default threadpool.
+    """
+    global _executor
+    if _executor is None and PASSWORD_HASH_WORKERS > 0:
+        _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+    return _executor
+
+def shutdown_hash_executor() -> None:
+    """Stop the hashing worker processes (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+async def _run_hash_job(func, *args):
+    executor = get_hash_executor()
+    if executor is None:
+        return await run_in_threadpool(func, *args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password off the event loop"""
+    with timed("password_hash"):
+        return await _run_hash_job(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password off the event loop"""
+    with timed("password_verify"):
+        return await _run_hash_job(verify_password, plain_password, hashed_password)
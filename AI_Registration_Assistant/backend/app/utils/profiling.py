@@ -0,0 +1,126 @@
+import cProfile
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+class StackSampler:
+    """
+    Samples one thread's Python stack at a fixed interval and counts the
+    stacks in collapsed (flamegraph) form: ``outer;inner;leaf count``.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class ProfilingMiddleware:
+    """
+    Opt-in per-request profiling.
+
+    A request is profiled when it carries ``X-Profile-Token`` matching the
+    configured token, or when it is picked by the sampling rate. It runs
+    under cProfile (saved as ``<id>.pstats``) plus a stack sampler (saved as
+    ``<id>.collapsed``), and the response gets an ``X-Profile-Id`` header
+    naming the files. Profiles cover the handler up to the start of the
+    response and include anything else the event loop ran meanwhile; only
+    one request is profiled at a time.
+
+    Only install this middleware when profiling is configured, so it costs
+    nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp, directory: str, token: str = "",
+                 sample_rate: float = 0.0, interval: float = 0.001):
+        self.app = app
+        self.directory = Path(directory)
+        self.token = token.encode()
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._active = threading.Lock()
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        running = True
+
+        def stop() -> None:
+            nonlocal running
+            if running:
+                running = False
+                profiler.disable()
+                sampler.stop()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                stop()
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER, profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        sampler.start()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop()
+            try:
+                await run_in_threadpool(self._save, profile_id, profiler, sampler)
+            finally:
+                self._active.release()
+
+    def _save(self, profile_id: str, profiler: cProfile.Profile, sampler: StackSampler) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(self.directory / f"{profile_id}.pstats"))
+        (self.directory / f"{profile_id}.collapsed").write_text(sampler.collapsed())
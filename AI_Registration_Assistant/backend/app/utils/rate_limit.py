@@ -0,0 +1,119 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # only needed with ADMISSION_BACKEND=redis
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+class RateLimitBackend(ABC):
+    """Token buckets keyed by client; each request takes one token"""
+
+    @abstractmethod
+    async def acquire(self, keys: Sequence[str], rate: float, burst: int) -> float:
+        """
+        Take a token from each of ``keys``' buckets, which hold up to
+        ``burst`` tokens and refill at ``rate`` per second. Tokens are only
+        taken if every bucket has one, so a request refused by one bucket
+        does not drain the others. Returns 0 if the request may proceed,
+        otherwise the seconds until every bucket will have a token.
+        """
+
+    async def close(self) -> None:
+        pass
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Buckets in this process. Idle buckets beyond ``max_keys`` are dropped
+    least recently used first; a dropped bucket simply starts full again.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, keys: Sequence[str], rate: float, burst: int) -> float:
+        # No awaits in here, so concurrent requests cannot interleave
+        now = time.monotonic()
+        levels: List[float] = []
+        for key in keys:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            levels.append(min(burst, tokens + (now - updated) * rate))
+        wait = max((0.0 if tokens >= 1 else (1 - tokens) / rate for tokens in levels), default=0.0)
+        for key, tokens in zip(keys, levels):
+            self._buckets[key] = (tokens - 1 if wait == 0 else tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+# Refill every bucket and take a token from each only if all have one,
+# atomically on the server and with its clock, so that every worker sees the
+# same time. Buckets expire once they would be full again.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local state = redis.call('HMGET', key, 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or burst
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+    levels[i] = tokens
+end
+for i, key in ipairs(KEYS) do
+    local tokens = levels[i]
+    if wait == 0 then
+        tokens = tokens - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return tostring(wait)
+"""
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Buckets shared by every worker through Redis. If Redis cannot be
+    reached the request is admitted: rate limiting fails open rather than
+    taking the API down with it. A request's buckets are updated by one
+    script call, so the default prefix is a hash tag keeping them in one
+    Redis Cluster slot.
+    """
+
+    def __init__(self, url: str, prefix: str = "{admission}:"):
+        if aioredis is None:
+            raise RuntimeError("ADMISSION_BACKEND=redis requires redis (pip install redis)")
+        if not url:
+            raise RuntimeError("ADMISSION_BACKEND=redis requires ADMISSION_REDIS_URL")
+        self.prefix = prefix
+        self.client = aioredis.from_url(url)
+        self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, keys: Sequence[str], rate: float, burst: int) -> float:
+        try:
+            return float(await self._script(keys=[self.prefix + key for key in keys], args=[rate, burst]))
+        except Exception:
+            logger.exception("Rate limit backend unavailable; admitting request")
+            return 0.0
+
+    async def close(self) -> None:
+        await self.client.close()
+
+def create_rate_limit_backend(backend: str, redis_url: str = "") -> RateLimitBackend:
+    """Build the rate limit backend named by ADMISSION_BACKEND"""
+    if backend == "memory":
+        return MemoryRateLimitBackend()
+    if backend == "redis":
+        return RedisRateLimitBackend(redis_url)
+    raise RuntimeError(f"Unknown ADMISSION_BACKEND {backend!r} (expected 'memory' or 'redis')")
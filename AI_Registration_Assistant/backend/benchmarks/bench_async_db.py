@@ -0,0 +1,68 @@
+"""
+Concurrent-request throughput: blocking Session vs AsyncSession.
+
+Simulates N concurrent async handlers that each run one query taking
+``--query-ms`` on Postgres (``pg_sleep``). The sync variant runs the query
+through ``SessionLocal`` directly on the event loop, the way the handlers did
+before; the async variant uses ``AsyncSessionLocal``.
+
+Usage (from the backend directory, with DATABASE_URL pointing at Postgres):
+
+    python -m benchmarks.bench_async_db --requests 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import text
+
+from app.database.database import SessionLocal, AsyncSessionLocal, dispose_engines
+
+
+async def _sync_handler(delay: float) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT pg_sleep(:d)"), {"d": delay})
+    finally:
+        db.close()
+
+
+async def _async_handler(delay: float) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT pg_sleep(:d)"), {"d": delay})
+
+
+async def _run(handler, requests: int, concurrency: int, delay: float) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await handler(delay)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(requests / elapsed, 1),
+    }
+
+
+async def main(args) -> None:
+    delay = args.query_ms / 1000
+    results = {
+        "sync_session_on_loop": await _run(_sync_handler, args.requests, args.concurrency, delay),
+        "async_session": await _run(_async_handler, args.requests, args.concurrency, delay),
+    }
+    await dispose_engines()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=20.0)
+    asyncio.run(main(parser.parse_args()))
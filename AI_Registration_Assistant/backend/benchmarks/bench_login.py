@@ -0,0 +1,87 @@
+"""
+Login-storm benchmark: bcrypt on the event loop vs the hashing worker pool.
+
+Fires ``--logins`` concurrent password verifications while a probe task
+measures how late the event loop wakes it up. Blocking bcrypt shows up as
+large loop lag; offloaded hashing keeps the lag near zero while the pool
+determines login throughput.
+
+Usage (from the backend directory):
+
+    PASSWORD_HASH_WORKERS=4 python -m benchmarks.bench_login --logins 64
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.utils import password_hasher
+from app.utils.password_hasher import (
+    get_password_hash, verify_password, verify_password_async, shutdown_hash_executor
+)
+
+PROBE_INTERVAL = 0.005
+
+
+async def _probe_loop_lag(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _inline_verify(password: str, hashed: str) -> bool:
+    return verify_password(password, hashed)
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _run(verify, logins: int, password: str, hashed: str) -> dict:
+    stop = asyncio.Event()
+    lags: list = []
+    probe = asyncio.create_task(_probe_loop_lag(stop, lags))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(verify(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+    return {
+        "logins": logins,
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(logins / elapsed, 1),
+        "loop_lag_ms": {
+            "mean": round(statistics.mean(lags) * 1000, 2) if lags else 0.0,
+            "p99": round(_percentile(lags, 0.99) * 1000, 2),
+            "max": round(max(lags, default=0.0) * 1000, 2),
+        },
+    }
+
+
+async def main(args) -> None:
+    password = "correct horse battery staple"
+    hashed = get_password_hash(password)
+    # Warm up the pool so process start-up is not counted
+    await verify_password_async(password, hashed)
+
+    results = {
+        "hash_workers": password_hasher.PASSWORD_HASH_WORKERS,
+        "inline_on_loop": await _run(_inline_verify, args.logins, password, hashed),
+        "worker_pool": await _run(verify_password_async, args.logins, password, hashed),
+    }
+    shutdown_hash_executor()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=64)
+    asyncio.run(main(parser.parse_args()))
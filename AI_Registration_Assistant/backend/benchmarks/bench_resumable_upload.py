@@ -0,0 +1,133 @@
+"""
+Resumable upload throughput and memory for large files.
+
+Uploads one ``--size-mb`` file through the upload session endpoints in
+``--range-mb`` PUT requests, completes it and registers a company with it,
+then reports MB/s and the peak RSS of the process. The payload is generated
+on the fly, so neither side ever holds the whole file; with the default
+in-process mode the RSS covers client and server, and should stay flat as
+``--size-mb`` grows. Needs a local Postgres with the schema in place.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_resumable_upload --size-mb 500 --range-mb 32
+    python -m benchmarks.bench_resumable_upload --url http://127.0.0.1:8000 --size-mb 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+import uuid
+
+import httpx
+
+BLOCK_SIZE = 1024 * 1024
+PDF_HEADER = b"%PDF-1.4\n"
+PASSWORD = "bench-upload-password"
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _body(block: bytes, length: int):
+    """``length`` bytes made of repeated ``block``s, without materializing them"""
+    while length > 0:
+        chunk = block[:length]
+        length -= len(chunk)
+        yield chunk
+
+
+async def _login(client: httpx.AsyncClient) -> dict:
+    """Create a throwaway user; upload sessions need a bearer token"""
+    username = f"bench-upload-{uuid.uuid4().hex[:8]}"
+    response = await client.post("/api/users/", json={
+        "email": f"{username}@example.com", "username": username, "password": PASSWORD,
+    })
+    response.raise_for_status()
+    response = await client.post("/api/auth/token", data={"username": username, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run(client: httpx.AsyncClient, args) -> dict:
+    size = args.size_mb * 1024 * 1024
+    range_size = args.range_mb * 1024 * 1024
+    # Uploads are sniffed on complete, so the file has to start like a PDF
+    block = PDF_HEADER + os.urandom(BLOCK_SIZE - len(PDF_HEADER))
+    auth = await _login(client)
+
+    response = await client.post(
+        "/api/v1/uploads", json={"file_name": "scan.pdf", "size": size}, headers=auth
+    )
+    response.raise_for_status()
+    upload_id = response.json()["id"]
+
+    start = time.perf_counter()
+    offset = 0
+    requests = 0
+    while offset < size:
+        end = min(offset + range_size, size) - 1
+        response = await client.put(
+            f"/api/v1/uploads/{upload_id}",
+            content=_body(block, end - offset + 1),
+            headers={"Content-Range": f"bytes {offset}-{end}/{size}", **auth},
+        )
+        response.raise_for_status()
+        offset = response.json()["received_bytes"]
+        requests += 1
+    response = await client.post(f"/api/v1/uploads/{upload_id}/complete", headers=auth)
+    response.raise_for_status()
+    uploaded = time.perf_counter()
+
+    name = f"bench-upload-{uuid.uuid4().hex[:8]}"
+    response = await client.post("/api/v1/register", data={
+        "company_name": name,
+        "applicant[full_name]": "Upload Bench",
+        "applicant[email]": f"{name}@example.com",
+        "upload_ids": upload_id,
+    })
+    response.raise_for_status()
+    registered = time.perf_counter()
+
+    return {
+        "size_mb": args.size_mb,
+        "range_mb": args.range_mb,
+        "put_requests": requests,
+        "upload_s": round(uploaded - start, 3),
+        "upload_mb_per_s": round(args.size_mb / (uploaded - start), 1),
+        "register_ms": round((registered - uploaded) * 1000, 2),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+async def main(args) -> None:
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            result = await run(client, args)
+    else:
+        from app.main import create_app
+        # One client sending many ranges would run into the per-IP upload rate limit
+        app = create_app(admission_control=False)
+        async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=args.timeout) as client:
+            await app.router.startup()
+            try:
+                result = await run(client, args)
+            finally:
+                await app.router.shutdown()
+    result["target"] = args.url or "in-process"
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Base URL of a running server; default runs in-process")
+    parser.add_argument("--size-mb", type=int, default=300)
+    parser.add_argument("--range-mb", type=int, default=32, help="Bytes sent per PUT request")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,75 @@
+"""
+Start-up time: interpreter launch to the first HTTP response.
+
+Each run starts a fresh Python process that imports ``app.main``, runs the
+startup handlers and serves ``GET /health`` in-process, timing the import,
+the startup handlers and the first response separately. No database is
+needed, since start-up must not wait for it. The in-process client sends no
+lifespan events, so the probe runs the handlers itself.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = r"""
+import asyncio, json, time
+import httpx  # client only; not part of what is measured
+
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def first_response():
+    await app.router.startup()
+    started = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            response = await client.get("/health")
+            response.raise_for_status()
+        return started, time.perf_counter()
+    finally:
+        await app.router.shutdown()
+
+started, done = asyncio.run(first_response())
+print(json.dumps({
+    "import_s": imported - start,
+    "startup_s": started - imported,
+    "first_response_s": done - start,
+}))
+"""
+
+
+def _summary(values: list) -> dict:
+    return {
+        "min_ms": round(min(values) * 1000, 1),
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1),
+    }
+
+
+def main(args) -> None:
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], check=True, capture_output=True, text=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(json.dumps({
+        "runs": args.runs,
+        "import": _summary([run["import_s"] for run in runs]),
+        "startup_handlers": _summary([run["startup_s"] for run in runs]),
+        "import_to_first_response": _summary([run["first_response_s"] for run in runs]),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    main(parser.parse_args())
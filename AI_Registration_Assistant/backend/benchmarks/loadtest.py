@@ -0,0 +1,227 @@
+"""
+Load test and latency benchmark for the registration API.
+
+Drives the real ASGI app, either in-process (default) or against a running
+server (``--url http://127.0.0.1:8000``), and reports requests/s and
+p50/p95/p99 latency per scenario as JSON so runs can be compared across
+commits. Needs a local Postgres with the schema in place
+(``python -m app.database.init_db``); every run uses unique names, so the
+database does not have to be empty.
+
+Every request comes from one client IP and user, so admission control
+(per-IP and per-user rate limits) would turn most of them into 429s. The
+in-process app is built without it unless ``--admission`` is given; run a
+server targeted with ``--url`` with ``ADMISSION_CONTROL_ENABLED=false``.
+
+Scenarios:
+    register          POST /api/v1/register without files
+    register_files    POST /api/v1/register with --files uploads of --file-kb each
+    get_company       GET  /api/v1/companies/{id}
+    token             POST /api/auth/token
+    users_me          GET  /api/users/me
+
+Usage (from the backend directory):
+
+    python -m benchmarks.loadtest --requests 500 --concurrency 20 --files 3
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --scenarios token,users_me
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import uuid
+
+import httpx
+
+SCENARIOS = ["register", "register_files", "get_company", "token", "users_me"]
+PASSWORD = "loadtest-password"
+
+
+def minimal_pdf(size: int) -> bytes:
+    """
+    A valid one-page PDF padded with a random stream to about ``size`` bytes.
+    Uploads are sniffed, so the payload has to be a real PDF to be accepted;
+    the random stream keeps it incompressible.
+    """
+    stream = os.urandom(max(0, size - 400))
+    body = (
+        b"%PDF-1.4\n"
+        b"1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+        b"2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj\n"
+        b"3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R >> endobj\n"
+        + f"4 0 obj << /Length {len(stream)} >> stream\n".encode()
+        + stream
+        + b"\nendstream endobj\n"
+    )
+    return body + b"trailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+        self.run_id = uuid.uuid4().hex[:8]
+        self.counter = 0
+        self.company_id = None
+        self.username = None
+        self.token = None
+        self.file_payload = minimal_pdf(args.file_kb * 1024)
+
+    def _unique(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}-{self.run_id}-{self.counter}"
+
+    async def setup(self) -> None:
+        """Create the user and company the read scenarios need"""
+        username = self._unique("loadtest")
+        response = await self.client.post("/api/users/", json={
+            "email": f"{username}@example.com", "username": username, "password": PASSWORD,
+        })
+        response.raise_for_status()
+        self.username = username
+
+        response = await self.client.post(
+            "/api/auth/token", data={"username": username, "password": PASSWORD}
+        )
+        response.raise_for_status()
+        self.token = response.json()["access_token"]
+
+        response = await self._register(files=0)
+        response.raise_for_status()
+        self.company_id = response.json()["company_id"]
+
+    def _register(self, files: int):
+        name = self._unique("company")
+        data = {
+            "company_name": name,
+            "area_of_service": "load test",
+            "applicant[full_name]": "Load Test",
+            "applicant[email]": f"{name}@example.com",
+        }
+        upload = [
+            ("files", (f"doc-{i}.pdf", self.file_payload, "application/pdf"))
+            for i in range(files)
+        ]
+        return self.client.post("/api/v1/register", data=data, files=upload or None)
+
+    def request(self, scenario: str):
+        if scenario == "register":
+            return self._register(files=0)
+        if scenario == "register_files":
+            return self._register(files=self.args.files)
+        if scenario == "get_company":
+            return self.client.get(f"/api/v1/companies/{self.company_id}")
+        if scenario == "token":
+            return self.client.post(
+                "/api/auth/token", data={"username": self.username, "password": PASSWORD}
+            )
+        if scenario == "users_me":
+            return self.client.get(
+                "/api/users/me", headers={"Authorization": f"Bearer {self.token}"}
+            )
+        raise ValueError(f"Unknown scenario {scenario}")
+
+    async def run(self, scenario: str) -> dict:
+        latencies = []
+        status_counts = {}
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await self.request(scenario)
+                latencies.append(time.perf_counter() - start)
+                status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+
+        for _ in range(self.args.warmup):
+            await self.request(scenario)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(self.args.requests)))
+        elapsed = time.perf_counter() - start
+
+        ordered = sorted(latencies)
+        return {
+            "requests": len(latencies),
+            "concurrency": self.args.concurrency,
+            "elapsed_s": round(elapsed, 3),
+            "requests_per_s": round(len(latencies) / elapsed, 1),
+            "latency_ms": {
+                "mean": round(statistics.mean(ordered) * 1000, 2),
+                "p50": round(_percentile(ordered, 50) * 1000, 2),
+                "p95": round(_percentile(ordered, 95) * 1000, 2),
+                "p99": round(_percentile(ordered, 99) * 1000, 2),
+                "max": round(ordered[-1] * 1000, 2),
+            },
+            "status_codes": {str(code): count for code, count in sorted(status_counts.items())},
+        }
+
+
+async def main(args) -> None:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        app = None
+    else:
+        from app.main import create_app
+        app = create_app(admission_control=args.admission)
+        client = httpx.AsyncClient(app=app, base_url="http://loadtest", timeout=args.timeout)
+
+    results = {
+        "revision": _git_revision(),
+        "target": args.url or "in-process",
+        "python": platform.python_version(),
+        "scenarios": {},
+    }
+    async with client:
+        if app is not None:
+            await app.router.startup()
+        try:
+            test = LoadTest(client, args)
+            await test.setup()
+            for scenario in args.scenarios.split(","):
+                results["scenarios"][scenario] = await test.run(scenario.strip())
+        finally:
+            if app is not None:
+                await app.router.shutdown()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Base URL of a running server; default runs in-process")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per scenario")
+    parser.add_argument("--files", type=int, default=3, choices=range(1, 11), metavar="1-10")
+    parser.add_argument("--file-kb", type=int, default=256, help="Size of each uploaded file")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument(
+        "--admission", action="store_true",
+        help="Keep admission control on in the in-process app, to measure its overhead or limits"
+    )
+    asyncio.run(main(parser.parse_args()))
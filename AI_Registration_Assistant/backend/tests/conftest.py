@@ -0,0 +1,78 @@
+"""
+Shared fixtures. Tests run against in-memory SQLite through a synchronous
+session: the Postgres-only column types are rendered as plain SQLite types,
+and ``AsyncSessionShim`` gives services the awaitable API they expect.
+"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+from app.models import registration  # noqa: F401  (registers the tables)
+
+@compiles(UUID, "sqlite")
+def _compile_uuid(type_, compiler, **kw):
+    return "CHAR(36)"
+
+class AsyncSessionShim:
+    """The subset of AsyncSession used by the services, over a sync Session"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement, *args, **kwargs):
+        return self.session.execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return self.session.scalar(statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return self.session.get(entity, ident, **kwargs)
+
+    async def refresh(self, instance):
+        self.session.refresh(instance)
+
+    def add(self, instance):
+        self.session.add(instance)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def commit(self):
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+    async def close(self):
+        self.session.close()
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    tables = [
+        table for table in Base.metadata.sorted_tables
+        if table.name in ("company", "applicant", "file_blob", "uploaded_file", "upload_session")
+    ]
+    Base.metadata.create_all(engine, tables=tables)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session(engine):
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements sent to the database from the moment the fixture is used"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from jose import jwt
+
+from app.config.settings import ALGORITHM, SECRET_KEY
+from app.utils.admission import AdmissionControlMiddleware, AdmissionPolicy
+from app.utils.rate_limit import MemoryRateLimitBackend
+
+def _token(username: str) -> str:
+    return jwt.encode({"sub": username}, SECRET_KEY, algorithm=ALGORITHM)
+
+def test_memory_backend_takes_tokens_only_when_every_bucket_has_one():
+    backend = MemoryRateLimitBackend()
+
+    async def scenario():
+        # Drain the user bucket through a second IP
+        assert await backend.acquire(["ip:b", "user:ann"], rate=0.001, burst=2) == 0
+        assert await backend.acquire(["ip:b", "user:ann"], rate=0.001, burst=2) == 0
+        # Refused by the user bucket, so the IP bucket keeps its tokens
+        assert await backend.acquire(["ip:a", "user:ann"], rate=0.001, burst=2) > 0
+        assert await backend.acquire(["ip:a", "user:ann"], rate=0.001, burst=2) > 0
+        assert await backend.acquire(["ip:a"], rate=0.001, burst=2) == 0
+        assert await backend.acquire(["ip:a"], rate=0.001, burst=2) == 0
+        assert await backend.acquire(["ip:a"], rate=0.001, burst=2) > 0
+
+    asyncio.run(scenario())
+
+def test_wait_is_the_longest_of_the_empty_buckets():
+    backend = MemoryRateLimitBackend()
+
+    async def scenario():
+        await backend.acquire(["slow"], rate=0.5, burst=1)
+        await backend.acquire(["fast"], rate=2, burst=1)
+        wait = await backend.acquire(["fast", "slow"], rate=0.5, burst=1)
+        assert 1.9 < wait <= 2
+
+    asyncio.run(scenario())
+
+def test_requests_refused_for_a_user_leave_the_ip_bucket_alone():
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload():
+        return {"ok": True}
+
+    policy = AdmissionPolicy("upload", ["POST /upload"], rate=0.001, burst=2, max_concurrent=0)
+    asgi = AdmissionControlMiddleware(app, [policy], MemoryRateLimitBackend())
+
+    def client(ip: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.ASGITransport(asgi, client=(ip, 1234)), base_url="http://test")
+
+    async def scenario():
+        ann = {"Authorization": f"Bearer {_token('ann')}"}
+        async with client("10.0.0.1") as first, client("10.0.0.2") as second:
+            # Ann uses up her user bucket from one address...
+            drained = [(await first.post("/upload", headers=ann)).status_code for _ in range(2)]
+            # ...so she is refused from another, which must not drain that address's bucket
+            refused = [(await second.post("/upload", headers=ann)).status_code for _ in range(3)]
+            anonymous = [(await second.post("/upload")).status_code for _ in range(3)]
+        return drained, refused, anonymous
+
+    drained, refused, anonymous = asyncio.run(scenario())
+    assert drained == [200, 200]
+    assert refused == [429, 429, 429]
+    assert anonymous == [200, 200, 429]
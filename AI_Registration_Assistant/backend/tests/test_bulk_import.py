@@ -0,0 +1,45 @@
+import csv
+import io
+
+from app.schemas.registration import RegistrationCreate
+from app.services.bulk_import import CSV_FORMAT, NDJSON_FORMAT, iter_batches
+
+HEADER = "company_name,area_of_service,applicant[full_name],applicant[email],applicant[phone]\n"
+
+def _csv_row(i: int) -> str:
+    return f"Company {i},Widgets,Person {i},person{i}@example.com,\n"
+
+def _rows(raw: bytes, fmt: str, batch_size: int = 2, max_rows: int = 100):
+    return [row for batch in iter_batches(io.BytesIO(raw), fmt, batch_size, max_rows) for row in batch]
+
+def test_csv_rows_are_parsed_in_batches():
+    raw = (HEADER + "".join(_csv_row(i) for i in range(5))).encode()
+    batches = list(iter_batches(io.BytesIO(raw), CSV_FORMAT, 2, 100))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    row_number, parsed = batches[0][0]
+    assert row_number == 1
+    assert isinstance(parsed, RegistrationCreate)
+    assert parsed.applicant.email == "person0@example.com"
+
+def test_unparseable_csv_row_is_reported_and_ends_the_import():
+    oversized = "x" * (csv.field_size_limit() + 1)
+    raw = (HEADER + _csv_row(0) + _csv_row(1) + f"{oversized},,,,\n" + _csv_row(3)).encode()
+
+    rows = _rows(raw, CSV_FORMAT)
+
+    assert [row_number for row_number, _ in rows] == [1, 2, 3]
+    assert all(isinstance(parsed, RegistrationCreate) for _, parsed in rows[:2])
+    assert rows[2][1].startswith("Invalid CSV: field larger than field limit")
+
+def test_invalid_rows_are_reported_individually():
+    raw = b'{"company_name": "A", "applicant": {"full_name": "A", "email": "a@example.com"}}\n{oops\n[]\n'
+    rows = _rows(raw, NDJSON_FORMAT)
+    assert isinstance(rows[0][1], RegistrationCreate)
+    assert rows[1][1].startswith("Invalid JSON")
+    assert rows[2][0] == 3 and isinstance(rows[2][1], str)
+
+def test_rows_beyond_the_limit_are_not_read():
+    raw = (HEADER + "".join(_csv_row(i) for i in range(5))).encode()
+    rows = _rows(raw, CSV_FORMAT, max_rows=3)
+    assert [row_number for row_number, _ in rows] == [1, 2, 3, 4]
+    assert rows[3][1] == "Row limit of 3 reached; this and later rows were not imported"
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+
+from app.services.company_cache import CompanyCache, FileCacheBackend, make_cached_response
+from app.utils.cache import TTLCache
+
+TTL = 300
+
+def _cache(directory=None) -> CompanyCache:
+    shared = FileCacheBackend(str(directory), TTL) if directory is not None else None
+    return CompanyCache(TTLCache(maxsize=16, ttl=TTL), shared)
+
+def _run(coro):
+    return asyncio.run(coro)
+
+def test_local_only_cache_round_trips_and_invalidates():
+    cache, company_id = _cache(), uuid.uuid4()
+    entry = make_cached_response(b'{"id": 1}')
+    _run(cache.set(company_id, entry))
+    assert _run(cache.get(company_id)) == entry
+    _run(cache.invalidate(company_id))
+    assert _run(cache.get(company_id)) is None
+
+def test_shared_hit_keeps_its_remaining_ttl(tmp_path):
+    writer, reader, company_id = _cache(tmp_path), _cache(tmp_path), uuid.uuid4()
+    entry = make_cached_response(b'{"id": 1}')
+    _run(writer.set(company_id, entry))
+    # Pretend the shared entry was written 290 of its 300 seconds ago
+    written_at = time.time_ns() - 290 * 10**9
+    os.utime(tmp_path / f"{company_id}.json", ns=(written_at, written_at))
+
+    assert _run(reader.get(company_id)) == entry
+    _, expires_at = reader.local._data[str(company_id)]
+    assert expires_at - time.monotonic() == pytest.approx(10, abs=1)
+
+def test_invalidation_reaches_other_workers_local_copies(tmp_path):
+    first, second, company_id = _cache(tmp_path), _cache(tmp_path), uuid.uuid4()
+    other_id = uuid.uuid4()
+    _run(first.set(company_id, make_cached_response(b"old")))
+    _run(first.set(other_id, make_cached_response(b"other")))
+    assert _run(second.get(company_id)).body == b"old"
+    assert _run(second.get(other_id)).body == b"other"
+
+    _run(first.invalidate(company_id))
+
+    assert _run(second.get(company_id)) is None
+    # The marker is per company: other entries survive
+    assert _run(second.get(other_id)).body == b"other"
+    _run(second.set(company_id, make_cached_response(b"new")))
+    assert _run(first.get(company_id)).body == b"new"
+    assert _run(second.get(company_id)).body == b"new"
+
+def test_expired_shared_entry_is_a_miss(tmp_path):
+    cache, company_id = _cache(tmp_path), uuid.uuid4()
+    _run(cache.set(company_id, make_cached_response(b"stale")))
+    written_at = time.time_ns() - (TTL + 1) * 10**9
+    os.utime(tmp_path / f"{company_id}.json", ns=(written_at, written_at))
+
+    assert _run(_cache(tmp_path).get(company_id)) is None
+    assert not (tmp_path / f"{company_id}.json").exists()
@@ -0,0 +1,52 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.endpoints import files
+from app.models.registration import Applicant, Company, UploadedFile
+from tests.conftest import AsyncSessionShim
+
+def _seed_file(session) -> uuid.UUID:
+    company_id = uuid.uuid4()
+    file_id = uuid.uuid4()
+    session.add(Company(id=company_id, company_name="Acme"))
+    session.add(Applicant(company_id=company_id, full_name="Ann Owner", email="ann@example.com"))
+    session.add(UploadedFile(id=file_id, company_id=company_id, file_name="scan.pdf", file_url="ab/cd/scan.pdf"))
+    session.commit()
+    return file_id
+
+@pytest.fixture
+def stat_calls(monkeypatch):
+    """Storage keys looked up, i.e. downloads that got past the access check"""
+    calls = []
+
+    async def stat(key):
+        calls.append(key)
+        return None
+
+    monkeypatch.setattr(files.file_handler, "_storage", SimpleNamespace(stat=stat))
+    return calls
+
+def _download(session, file_id, user):
+    request = SimpleNamespace(headers={}, method="GET")
+    return asyncio.run(files.download_file(file_id, request, AsyncSessionShim(session), user))
+
+@pytest.mark.parametrize("user", [
+    SimpleNamespace(email="Ann@Example.com", is_admin=False),
+    SimpleNamespace(email="admin@example.com", is_admin=True),
+])
+def test_applicants_and_admins_can_download(session, stat_calls, user):
+    file_id = _seed_file(session)
+    with pytest.raises(HTTPException):
+        _download(session, file_id, user)  # the stand-in storage has no bytes
+    assert stat_calls == ["ab/cd/scan.pdf"]
+
+def test_other_users_get_404_without_touching_storage(session, stat_calls):
+    file_id = _seed_file(session)
+    with pytest.raises(HTTPException) as exc:
+        _download(session, file_id, SimpleNamespace(email="mallory@example.com", is_admin=False))
+    assert exc.value.status_code == 404
+    assert stat_calls == []
@@ -0,0 +1,145 @@
+import asyncio
+from email.utils import formatdate
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from app.storage.local import LocalStorage
+from app.utils.file_response import ZEROCOPY_EXTENSION, StoredFileResponse, parse_range
+
+KEY = "ab/cd/abcd.pdf"
+CONTENT = bytes(range(100))
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-9", (0, 10)),
+    ("bytes=90-", (90, 10)),
+    ("bytes=90-500", (90, 10)),
+    ("bytes=-10", (90, 10)),
+    ("bytes=-500", (0, 100)),
+    ("bytes=0-9,20-29", None),  # multi-range: answered in full
+    ("items=0-9", None),
+    ("bytes=-", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=50-40", "bytes=-0"])
+def test_unsatisfiable_ranges_raise(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 100)
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = LocalStorage(str(tmp_path), chunk_size=16)
+    path = tmp_path / KEY
+    path.parent.mkdir(parents=True)
+    path.write_bytes(CONTENT)
+    return storage
+
+def _stored(storage):
+    return asyncio.run(storage.stat(KEY))
+
+def _request(storage, method="GET", **headers) -> httpx.Response:
+    app = FastAPI()
+
+    @app.api_route("/file", methods=["GET", "HEAD"])
+    async def download(request: Request):
+        return StoredFileResponse(
+            storage, KEY, await storage.stat(KEY), request.headers,
+            media_type="application/pdf", filename="scan.pdf", method=request.method,
+        )
+
+    async def send():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await client.request(method, "/file", headers=headers)
+
+    return asyncio.run(send())
+
+def test_full_download(storage):
+    response = _request(storage)
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-length"] == "100"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == _stored(storage).etag
+
+@pytest.mark.parametrize("header, content_range, body", [
+    ("bytes=10-19", "bytes 10-19/100", CONTENT[10:20]),
+    ("bytes=-5", "bytes 95-99/100", CONTENT[95:]),
+    ("bytes=60-", "bytes 60-99/100", CONTENT[60:]),
+])
+def test_range_requests_get_206(storage, header, content_range, body):
+    response = _request(storage, range=header)
+    assert response.status_code == 206
+    assert response.headers["content-range"] == content_range
+    assert response.headers["content-length"] == str(len(body))
+    assert response.content == body
+
+def test_unsatisfiable_range_gets_416(storage):
+    response = _request(storage, range="bytes=200-")
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */100"
+    assert response.content == b""
+
+def test_multi_range_falls_back_to_the_whole_file(storage):
+    response = _request(storage, range="bytes=0-9,20-29")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+def test_if_range_with_current_validator_honours_the_range(storage):
+    stored = _stored(storage)
+    for validator in (stored.etag, formatdate(stored.modified, usegmt=True)):
+        response = _request(storage, range="bytes=0-9", **{"if-range": validator})
+        assert response.status_code == 206
+        assert response.content == CONTENT[:10]
+
+def test_stale_if_range_ignores_the_range(storage):
+    response = _request(storage, range="bytes=0-9", **{"if-range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+def test_head_sends_headers_without_a_body(storage):
+    response = _request(storage, method="HEAD", range="bytes=0-9")
+    assert response.status_code == 206
+    assert response.headers["content-length"] == "10"
+    assert response.content == b""
+
+def test_matching_etag_gets_304(storage):
+    response = _request(storage, **{"if-none-match": f'W/"other", {_stored(storage).etag}'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert _request(storage, **{"if-none-match": '"other"'}).status_code == 200
+
+def test_if_modified_since(storage):
+    modified = _stored(storage).modified
+    current = formatdate(modified + 1, usegmt=True)
+    assert _request(storage, **{"if-modified-since": current}).status_code == 304
+    older = formatdate(modified - 60, usegmt=True)
+    assert _request(storage, **{"if-modified-since": older}).status_code == 200
+    assert _request(storage, **{"if-modified-since": "not a date"}).status_code == 200
+
+def test_if_none_match_takes_precedence_over_if_modified_since(storage):
+    current = formatdate(_stored(storage).modified + 1, usegmt=True)
+    response = _request(storage, **{"if-none-match": '"other"', "if-modified-since": current})
+    assert response.status_code == 200
+
+def test_zerocopy_send_is_used_when_the_server_offers_it(storage):
+    response = StoredFileResponse(
+        storage, KEY, _stored(storage), {"range": "bytes=10-19"},
+        media_type="application/pdf", filename="scan.pdf",
+    )
+    messages = []
+
+    async def send(message):
+        if message["type"] == ZEROCOPY_EXTENSION:
+            message = {**message, "file": message["file"].name}
+        messages.append(message)
+
+    asyncio.run(response({"type": "http", "extensions": {ZEROCOPY_EXTENSION: {}}}, None, send))
+
+    assert messages[0]["status"] == 206
+    assert messages[1] == {
+        "type": ZEROCOPY_EXTENSION, "file": storage.local_path(KEY), "offset": 10, "count": 10,
+    }
@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.utils import instrumentation
+
+@pytest.fixture
+def recorded(monkeypatch):
+    durations = []
+    monkeypatch.setattr(instrumentation, "record_query", durations.append)
+    return durations
+
+def test_statements_are_timed_including_failures(recorded):
+    engine = create_engine("sqlite://")
+    instrumentation.instrument_engine(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 2"))
+        # Nothing accumulates on the (pooled) connection
+        assert "query_start" not in conn.info
+
+    assert len(recorded) == 5
+    assert all(0 <= duration < 1 for duration in recorded)
@@ -0,0 +1,98 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from app.api.endpoints import registration
+from app.utils.multipart_stream import (
+    MAX_PART_HEADER_SIZE, FileData, FileEnd, FileStart, FormField, iter_multipart,
+)
+
+BOUNDARY = "B0undary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+def _field(name: str, value: str) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n{value}\r\n"
+    ).encode()
+
+def _file(name: str, filename: str, data: bytes, extra_headers: str = "") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{name}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: application/pdf\r\n{extra_headers}\r\n"
+    ).encode() + data + b"\r\n"
+
+END = f"--{BOUNDARY}--\r\n".encode()
+
+def _parse(body: bytes, content_type: str = CONTENT_TYPE, max_fields=5, max_field_size=16, max_files=2):
+    """POST ``body`` to an app that parses it; returns (status, events or error detail)"""
+    app = FastAPI()
+
+    @app.post("/form")
+    async def form(request: Request):
+        events = []
+        async for event in iter_multipart(request, max_fields, max_field_size, max_files):
+            if isinstance(event, FileData) and events and isinstance(events[-1], FileData):
+                events[-1] = FileData(events[-1].data + event.data)
+            else:
+                events.append(event)
+        return [[type(event).__name__, *event] for event in events]
+
+    async def post():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await client.post("/form", content=body, headers={"Content-Type": content_type})
+
+    response = asyncio.run(post())
+    return response.status_code, response.json() if response.status_code == 200 else response.json()["detail"]
+
+def test_fields_and_files_are_yielded_in_order():
+    status, events = _parse(_field("company_name", "Acme") + _file("files", "a.pdf", b"%PDF-1.4") + END)
+    assert status == 200
+    assert events == [
+        ["FormField", "company_name", "Acme"],
+        ["FileStart", "files", "a.pdf", "application/pdf"],
+        ["FileData", "%PDF-1.4"],
+        ["FileEnd"],
+    ]
+
+def test_file_input_left_blank_is_skipped():
+    status, events = _parse(_file("files", "", b"") + _field("company_name", "Acme") + END)
+    assert status == 200
+    assert events == [["FormField", "company_name", "Acme"]]
+
+@pytest.mark.parametrize("body, detail", [
+    (_field("company_name", "x" * 17) + END, "Form field company_name exceeds 16 bytes"),
+    (b"".join(_field(f"f{i}", "v") for i in range(6)) + END, "Maximum 5 form fields allowed per request"),
+    (b"".join(_file("files", f"{i}.pdf", b"x") for i in range(3)) + END, "Maximum 2 files allowed per request"),
+    (_file("files", "a.pdf", b"x", extra_headers=f"X-Pad: {'p' * MAX_PART_HEADER_SIZE}\r\n") + END,
+     "Multipart part headers are too large"),
+    (_field("company_name", "Acme") + _file("files", "a.pdf", b"%PDF-1.4")[:-2],
+     "Multipart body ended before its closing boundary"),
+])
+def test_limits_and_truncation_are_400(body, detail):
+    assert _parse(body) == (400, detail)
+
+@pytest.mark.parametrize("body", [
+    b"garbage",
+    b"--B0undary\r\ngarbage without a header separator\r\n\r\n",
+    b"--B0undaryX\r\n",
+])
+def test_malformed_body_is_400(body):
+    status, detail = _parse(body)
+    assert status == 400
+    assert detail.startswith("Malformed multipart body")
+
+def test_register_answers_malformed_body_with_400():
+    app = FastAPI()
+    app.include_router(registration.router)
+
+    async def post():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await client.post("/register", content=b"garbage", headers={"Content-Type": CONTENT_TYPE})
+
+    response = asyncio.run(post())
+    assert response.status_code == 400
+
+def test_non_multipart_body_is_415():
+    assert _parse(b"{}", content_type="application/json") == (415, "Expected a multipart/form-data body")
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from jose import jwt
+
+from app.config.settings import ALGORITHM, SECRET_KEY
+from app.services import auth_service
+from app.services.principal_cache import PrincipalCache
+from app.utils.cache import TTLCache
+
+def _cache(marker) -> PrincipalCache:
+    return PrincipalCache(TTLCache(maxsize=16, ttl=60), str(marker))
+
+@pytest.fixture
+def marker(tmp_path):
+    return tmp_path / "principals.invalidated"
+
+def test_hit_returns_the_cached_user(marker):
+    cache = _cache(marker)
+    user = SimpleNamespace(username="ann")
+    cache.set("ann", user, time.time_ns())
+    assert cache.get("ann") is user
+    assert cache.get("bob") is None
+
+def test_invalidation_reaches_every_cache_sharing_the_marker(marker):
+    first, second = _cache(marker), _cache(marker)
+    first.set("ann", "ann in first", time.time_ns())
+    second.set("ann", "ann in second", time.time_ns())
+    second.set("bob", "bob in second", time.time_ns())
+
+    first.invalidate("ann")
+
+    assert first.get("ann") is None
+    assert second.get("ann") is None
+    # The marker is not per user: every entry cached before it is dropped
+    assert second.get("bob") is None
+    second.set("ann", "reloaded", time.time_ns())
+    assert second.get("ann") == "reloaded"
+
+def test_entry_read_before_an_invalidation_is_not_served(marker):
+    cache = _cache(marker)
+    loaded_at = time.time_ns()  # the read starts...
+    cache.invalidate("ann")     # ...an update commits meanwhile...
+    cache.set("ann", "stale", loaded_at)  # ...and the stale row is cached afterwards
+    assert cache.get("ann") is None
+
+def test_get_current_user_does_not_cache_a_row_that_changed_during_the_read(marker, monkeypatch):
+    cache = _cache(marker)
+    monkeypatch.setattr(auth_service, "principal_cache", cache)
+    reads = []
+
+    async def get_user_by_username(db, username):
+        reads.append(username)
+        if len(reads) == 1:
+            # The admin deactivates the account while this request reads it
+            cache.invalidate(username)
+            return SimpleNamespace(username=username, is_active=True)
+        return SimpleNamespace(username=username, is_active=False)
+
+    monkeypatch.setattr(auth_service, "get_user_by_username", get_user_by_username)
+    db = SimpleNamespace(expunge=lambda user: None)
+    token = jwt.encode({"sub": "ann", "exp": int(time.time()) + 600}, SECRET_KEY, algorithm=ALGORITHM)
+
+    first = asyncio.run(auth_service.get_current_user(token, db))
+    second = asyncio.run(auth_service.get_current_user(token, db))
+
+    assert first.is_active
+    assert not second.is_active
+    assert reads == ["ann", "ann"]
@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.registration import Applicant, Company
+from app.services import registration_filter as registration_filter_module
+from app.services.registration_filter import RegistrationFilter
+from app.utils.bloom import BloomFilter
+from tests.conftest import AsyncSessionShim
+
+def test_bloom_filter_is_sized_for_capacity_and_error_rate():
+    bloom = BloomFilter(1000, 0.01)
+    # m = -n ln p / (ln 2)^2, k = m/n ln 2
+    assert bloom.num_bits == 9586
+    assert bloom.num_hashes == 7
+    assert bloom.memory_bytes == 1199
+
+def test_bloom_filter_has_no_false_negatives_and_meets_its_error_rate():
+    bloom = BloomFilter(10000, 0.01)
+    added = [f"member-{i}" for i in range(10000)]
+    bloom.update(added)
+
+    assert all(item in bloom for item in added)
+    assert bloom.expected_error_rate() == pytest.approx(0.01, rel=0.1)
+    false_positives = sum(bloom.might_contain(f"absent-{i}") for i in range(20000))
+    assert false_positives / 20000 < 0.015
+
+def _filter(*names: str, emails=()) -> RegistrationFilter:
+    registration_filter = RegistrationFilter(enabled=False, min_capacity=100)
+    registration_filter.company_names.bloom = BloomFilter(100)
+    registration_filter.company_names.bloom.update(names)
+    registration_filter.emails.bloom = BloomFilter(100)
+    registration_filter.emails.bloom.update(emails)
+    return registration_filter
+
+def _seed(session, company_name: str, email: str) -> None:
+    company_id = uuid.uuid4()
+    session.add(Company(id=company_id, company_name=company_name))
+    session.add(Applicant(company_id=company_id, full_name="Ann", email=email))
+    session.commit()
+
+def _precheck(registration_filter, session, company_name, email):
+    return asyncio.run(registration_filter.precheck(AsyncSessionShim(session), company_name, email))
+
+def test_precheck_skips_the_query_for_values_the_filters_rule_out(session, statements):
+    _precheck(_filter(), session, "Acme", "ann@example.com")
+    assert statements == []
+
+def test_precheck_rejects_taken_values(session):
+    _seed(session, "Acme", "ann@example.com")
+    registration_filter = _filter("Acme", emails=["ann@example.com"])
+
+    with pytest.raises(HTTPException) as taken_name:
+        _precheck(registration_filter, session, "Acme", "new@example.com")
+    assert (taken_name.value.status_code, taken_name.value.detail) == (409, "Company with this name already exists")
+    with pytest.raises(HTTPException) as taken_email:
+        _precheck(registration_filter, session, "New Co", "ann@example.com")
+    assert (taken_email.value.status_code, taken_email.value.detail) == (409, "Applicant with this email already exists")
+
+def test_precheck_counts_false_positives(session, statements):
+    registration_filter = _filter("Acme", emails=["ann@example.com"])
+
+    _precheck(registration_filter, session, "Acme", "ann@example.com")
+
+    assert len(statements) == 1
+    assert registration_filter.company_names.false_positives == 1
+    assert registration_filter.emails.false_positives == 1
+
+def test_unloaded_filter_queries_everything(session, statements):
+    _precheck(RegistrationFilter(enabled=False), session, "Acme", "ann@example.com")
+    assert len(statements) == 1
+
+def test_rebuild_replays_values_added_while_loading(monkeypatch):
+    registration_filter = RegistrationFilter(enabled=False, min_capacity=100)
+
+    async def build(db):
+        # A registration commits while the table is being read
+        registration_filter.add("Added While Loading", "loading@example.com")
+        registration_filter.add(email="conflict@example.com")
+        return BloomFilter(100)
+
+    monkeypatch.setattr(registration_filter.company_names, "build", build)
+    monkeypatch.setattr(registration_filter.emails, "build", build)
+    monkeypatch.setattr(registration_filter_module, "AsyncSessionLocal", contextlib.nullcontext)
+
+    asyncio.run(registration_filter.rebuild())
+
+    assert registration_filter.company_names.might_contain("Added While Loading")
+    assert registration_filter.emails.might_contain("loading@example.com")
+    assert registration_filter.emails.might_contain("conflict@example.com")
+    assert registration_filter._pending is None
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+
+from app.services import registration_form
+from app.services.registration_form import read_registration_form
+from app.storage.local import LocalStorage
+from app.utils.file_handler import file_handler
+
+MINIMAL_PDF = b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+FIELDS = {
+    "company_name": "Acme",
+    "applicant[full_name]": "Ann Owner",
+    "applicant[email]": "ann@example.com",
+}
+
+class RecordingSession:
+    """Stands in for AsyncSessionLocal(), recording when it is open"""
+
+    def __init__(self, events):
+        self.events = events
+
+    async def __aenter__(self):
+        self.events.append("session opened")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.events.append("session closed")
+
+@pytest.fixture
+def events(monkeypatch, tmp_path):
+    events = []
+    monkeypatch.setattr(registration_form, "AsyncSessionLocal", lambda: RecordingSession(events))
+    monkeypatch.setattr(file_handler, "_storage", LocalStorage(str(tmp_path)))
+    original_open_upload = file_handler.open_upload
+
+    async def open_upload(file_name, *args, **kwargs):
+        events.append(f"storing {file_name}")
+        return await original_open_upload(file_name, *args, **kwargs)
+
+    monkeypatch.setattr(file_handler, "open_upload", open_upload)
+    return events
+
+def _post(files):
+    app = FastAPI()
+
+    @app.post("/register")
+    async def register(form=Depends(read_registration_form)):
+        return {"company_name": form.data.company_name, "files": len(form.stored_files)}
+
+    async def post():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await client.post("/register", data=FIELDS, files=files)
+    return asyncio.run(post())
+
+def test_precheck_session_is_closed_before_files_are_stored(events, monkeypatch):
+    async def precheck(db, company_name, email):
+        events.append(f"precheck {company_name} {email}")
+
+    monkeypatch.setattr(registration_form.registration_filter, "precheck", precheck)
+    response = _post([("files", ("a.pdf", MINIMAL_PDF, "application/pdf")),
+                      ("files", ("b.pdf", MINIMAL_PDF, "application/pdf"))])
+
+    assert response.status_code == 200, response.text
+    assert events == [
+        "session opened",
+        "precheck Acme ann@example.com",
+        "session closed",
+        "storing a.pdf",
+        "storing b.pdf",
+    ]
+
+def test_taken_name_is_refused_before_any_file_is_stored(events, monkeypatch, tmp_path):
+    async def precheck(db, company_name, email):
+        raise HTTPException(status_code=409, detail="Company with this name already exists")
+
+    monkeypatch.setattr(registration_form.registration_filter, "precheck", precheck)
+    response = _post([("files", ("a.pdf", MINIMAL_PDF, "application/pdf"))])
+
+    assert response.status_code == 409
+    assert events == ["session opened", "session closed"]
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
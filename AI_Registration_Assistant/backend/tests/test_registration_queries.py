@@ -0,0 +1,45 @@
+import asyncio
+import uuid
+
+from app.models.registration import Applicant, Company, UploadedFile
+from app.services.registration import RegistrationService
+from tests.conftest import AsyncSessionShim
+
+def _seed_company(session, applicants: int, files: int) -> uuid.UUID:
+    company_id = uuid.uuid4()
+    session.add(Company(id=company_id, company_name=f"Company {company_id}"))
+    session.add_all(
+        Applicant(company_id=company_id, full_name=f"Applicant {i}", email=f"{company_id}-{i}@example.com")
+        for i in range(applicants)
+    )
+    session.add_all(
+        UploadedFile(company_id=company_id, file_name=f"file-{i}.pdf", file_url=f"{company_id}/{i}")
+        for i in range(files)
+    )
+    session.commit()
+    session.expunge_all()
+    return company_id
+
+def test_get_company_by_id_loads_relationships_in_three_queries(session, statements):
+    company_id = _seed_company(session, applicants=3, files=5)
+    statements.clear()
+
+    company = asyncio.run(RegistrationService(AsyncSessionShim(session)).get_company_by_id(company_id))
+
+    assert len(statements) == 3
+    assert statements[0].lstrip().startswith("SELECT company.")
+    assert sorted(statement.split("FROM ")[1].split()[0] for statement in statements[1:]) == [
+        "applicant", "uploaded_file",
+    ]
+    # Relationships are already loaded: touching them issues no more queries
+    assert len(company.applicants) == 3
+    assert len(company.files) == 5
+    assert len(statements) == 3
+
+def test_get_company_by_id_query_count_does_not_grow_with_rows(session, statements):
+    company_id = _seed_company(session, applicants=20, files=40)
+    statements.clear()
+
+    asyncio.run(RegistrationService(AsyncSessionShim(session)).get_company_by_id(company_id))
+
+    assert len(statements) == 3
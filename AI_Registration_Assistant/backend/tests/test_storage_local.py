@@ -0,0 +1,84 @@
+import asyncio
+import re
+
+import pytest
+
+from app.storage import local
+from app.storage.local import LocalStorage
+
+KEY_RE = re.compile(r"^([0-9a-f]{2})/([0-9a-f]{2})/(\1\2[0-9a-f]{28})\.pdf$")
+
+def _collect(storage, key, **kwargs) -> bytes:
+    async def read():
+        return b"".join([chunk async for chunk in storage.read(key, **kwargs)])
+    return asyncio.run(read())
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(str(tmp_path / "uploads"), chunk_size=4)
+
+def test_new_keys_are_sharded_by_their_leading_hex_digits(storage):
+    keys = {storage.new_key("Scan.PDF") for _ in range(100)}
+    assert len(keys) == 100
+    for key in keys:
+        assert KEY_RE.match(key), key
+
+@pytest.mark.parametrize("key", ["", "/etc/passwd", "../outside.pdf", "ab/../../x", "ab\\cd"])
+def test_keys_outside_the_root_are_rejected(storage, key):
+    with pytest.raises(ValueError):
+        storage.validate_key(key)
+
+def test_writer_fsyncs_and_renames_into_place_on_commit(storage, monkeypatch):
+    synced = []
+    real_fsync = local.os.fsync
+    monkeypatch.setattr(local.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    key = storage.new_key("scan.pdf")
+    path = storage.root / key
+
+    async def write():
+        writer = await storage.open_writer(key)
+        await writer.write(b"%PDF-")
+        await writer.write(b"1.7\n")
+        # Only the temporary file exists until the commit
+        assert writer.temp_path.exists()
+        assert writer.temp_path.parent == path.parent
+        assert not path.exists()
+        await writer.commit()
+        return writer
+
+    writer = asyncio.run(write())
+    assert len(synced) == 1
+    assert path.read_bytes() == b"%PDF-1.7\n"
+    assert writer.size == 9
+    assert not writer.temp_path.exists()
+    assert list(path.parent.iterdir()) == [path]
+
+def test_aborted_writer_leaves_nothing_behind(storage):
+    key = storage.new_key("scan.pdf")
+
+    async def write():
+        async with await storage.open_writer(key) as writer:
+            await writer.write(b"partial")
+            raise RuntimeError("client went away")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(write())
+    assert not (storage.root / key).exists()
+    assert list((storage.root / key).parent.iterdir()) == []
+
+def test_read_stat_put_and_delete(storage, tmp_path):
+    staged = tmp_path / "staged.upload"
+    staged.write_bytes(b"0123456789")
+    key = storage.new_key("notes.txt")
+    asyncio.run(storage.put_file(str(staged), key))
+
+    assert not staged.exists()
+    assert _collect(storage, key) == b"0123456789"
+    assert _collect(storage, key, offset=3, length=5) == b"34567"
+    stored = asyncio.run(storage.stat(key))
+    assert stored.size == 10
+    assert stored.etag.startswith('"') and stored.etag.endswith('"')
+
+    asyncio.run(storage.delete(key))
+    assert asyncio.run(storage.stat(key)) is None
+    asyncio.run(storage.delete(key))  # missing objects are ignored
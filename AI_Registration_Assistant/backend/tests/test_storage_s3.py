@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from app.storage.s3 import MIN_PART_SIZE, S3Storage
+
+BUCKET = "uploads"
+
+# moto 5 mocks every service with one decorator, earlier versions per service
+mock_aws = getattr(moto, "mock_aws", None) or getattr(moto, "mock_s3")
+
+@pytest.fixture
+def storage(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield S3Storage(BUCKET, prefix="docs", region="us-east-1", part_size=MIN_PART_SIZE)
+
+def _write(storage, key, chunks, commit=True):
+    async def write():
+        writer = await storage.open_writer(key)
+        for chunk in chunks:
+            await writer.write(chunk)
+        if commit:
+            await writer.commit()
+        else:
+            await writer.abort()
+        return writer
+    return asyncio.run(write())
+
+def _collect(storage, key, **kwargs) -> bytes:
+    async def read():
+        return b"".join([chunk async for chunk in storage.read(key, **kwargs)])
+    return asyncio.run(read())
+
+def test_small_object_is_a_single_put(storage):
+    key = storage.new_key("scan.pdf")
+    writer = _write(storage, key, [b"%PDF-", b"1.7\n"])
+
+    assert writer._upload_id is None
+    assert _collect(storage, key) == b"%PDF-1.7\n"
+    assert storage.client.head_object(Bucket=BUCKET, Key=f"docs/{key}")["ContentLength"] == 9
+
+def test_large_object_is_uploaded_in_parts(storage):
+    key = storage.new_key("scan.pdf")
+    block = bytes(range(256)) * 4096  # 1MB
+    writer = _write(storage, key, [block] * 12)
+
+    assert [part["PartNumber"] for part in writer._parts] == [1, 2, 3]
+    assert asyncio.run(storage.stat(key)).size == 12 * len(block)
+    assert _collect(storage, key, offset=MIN_PART_SIZE - 2, length=4) == block[-2:] + block[:2]
+    assert storage.client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+
+def test_aborted_multipart_upload_leaves_nothing_behind(storage):
+    key = storage.new_key("scan.pdf")
+    _write(storage, key, [b"x" * MIN_PART_SIZE, b"y"], commit=False)
+
+    assert asyncio.run(storage.stat(key)) is None
+    assert storage.client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+
+def test_put_file_and_delete(storage, tmp_path):
+    staged = tmp_path / "staged.upload"
+    staged.write_bytes(b"0123456789")
+    key = storage.new_key("notes.txt")
+    asyncio.run(storage.put_file(str(staged), key))
+
+    assert not staged.exists()
+    assert _collect(storage, key, offset=3, length=5) == b"34567"
+    asyncio.run(storage.delete(key))
+    assert asyncio.run(storage.stat(key)) is None
@@ -0,0 +1,89 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.registration import UploadSession
+from app.services import upload_sessions
+from app.services.upload_sessions import (
+    SESSION_COMPLETE, SESSION_COMPLETING, SESSION_UPLOADING, UploadSessionService,
+)
+from tests.conftest import AsyncSessionShim
+
+OWNER = SimpleNamespace(id=1, is_admin=False)
+
+def _seed_session(session, received_bytes: int = 100, status: str = SESSION_UPLOADING) -> uuid.UUID:
+    session_id = uuid.uuid4()
+    session.add(UploadSession(
+        id=session_id, file_name="scan.pdf", total_size=100,
+        received_bytes=received_bytes, status=status, created_by=OWNER.id,
+    ))
+    session.commit()
+    return session_id
+
+def _status(engine, session_id: uuid.UUID) -> str:
+    with engine.connect() as conn:
+        return conn.execute(
+            UploadSession.__table__.select().where(UploadSession.id == session_id)
+        ).one().status
+
+@pytest.fixture
+def service(session):
+    return UploadSessionService(AsyncSessionShim(session), OWNER)
+
+def test_complete_moves_the_file_without_holding_the_session(engine, service, session, monkeypatch):
+    session_id = _seed_session(session)
+    seen = []
+
+    async def finalize_session(key, file_name):
+        # Committed before the file is touched, so no lock or transaction is held
+        seen.append((_status(engine, session_id), session.in_transaction()))
+        return {"file_url": "ab/cd/stored.pdf", "sha256": "0" * 64, "mime_type": "application/pdf"}
+
+    monkeypatch.setattr(upload_sessions.file_handler, "finalize_session", finalize_session)
+    completed = asyncio.run(service.complete_session(session_id))
+
+    assert seen == [(SESSION_COMPLETING, False)]
+    assert completed.status == SESSION_COMPLETE
+    assert completed.file_url == "ab/cd/stored.pdf"
+
+def test_complete_while_completing_conflicts(service, session, monkeypatch):
+    session_id = _seed_session(session, status=SESSION_COMPLETING)
+
+    async def finalize_session(key, file_name):
+        raise AssertionError("the file must only be finalized once")
+
+    monkeypatch.setattr(upload_sessions.file_handler, "finalize_session", finalize_session)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(service.complete_session(session_id))
+    assert exc.value.status_code == 409
+
+def test_rejected_file_returns_the_session_to_uploading(engine, service, session, monkeypatch):
+    session_id = _seed_session(session)
+
+    async def finalize_session(key, file_name):
+        raise HTTPException(status_code=415, detail="File type is not allowed")
+
+    monkeypatch.setattr(upload_sessions.file_handler, "finalize_session", finalize_session)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(service.complete_session(session_id))
+    assert exc.value.status_code == 415
+    assert _status(engine, session_id) == SESSION_UPLOADING
+
+def test_incomplete_upload_cannot_complete(service, session):
+    session_id = _seed_session(session, received_bytes=40)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(service.complete_session(session_id))
+    assert exc.value.status_code == 409
+
+def test_sessions_are_hidden_from_other_users(session):
+    session_id = _seed_session(session)
+    other = UploadSessionService(AsyncSessionShim(session), SimpleNamespace(id=2, is_admin=False))
+    admin = UploadSessionService(AsyncSessionShim(session), SimpleNamespace(id=3, is_admin=True))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(other.get_session(session_id))
+    assert exc.value.status_code == 404
+    assert asyncio.run(admin.get_session(session_id)).id == session_id
@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.api.endpoints import registration
+from app.storage.local import LocalStorage
+from app.utils import file_inspector
+from app.utils.file_handler import check_upload_type, file_handler
+
+# A DOS/PE executable header, padded past the sniffed prefix
+EXECUTABLE = b"MZ\x90\x00\x03\x00\x00\x00\x04\x00\x00\x00\xff\xff" + bytes(16 * 1024)
+MINIMAL_PDF = b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+@pytest.fixture(params=["libmagic", "builtin"])
+def sniffer(request, monkeypatch):
+    """Run each test with libmagic (when installed) and with the built-in signatures"""
+    if request.param == "libmagic":
+        if file_inspector.magic is None:
+            pytest.skip("python-magic is not installed")
+    else:
+        monkeypatch.setattr(file_inspector, "magic", None)
+    return request.param
+
+@pytest.mark.parametrize("file_name", ["evil.pdf", "evil.docx", "evil.png", "evil.txt"])
+def test_renamed_executable_is_rejected(sniffer, file_name):
+    with pytest.raises(HTTPException) as exc:
+        check_upload_type(EXECUTABLE[:file_inspector.SNIFF_SIZE], file_name)
+    assert exc.value.status_code == 415
+
+@pytest.mark.parametrize("head", [b"", bytes(range(256)) * 4])
+def test_unrecognized_content_is_rejected(sniffer, head):
+    with pytest.raises(HTTPException) as exc:
+        check_upload_type(head, "scan.pdf")
+    assert exc.value.status_code == 415
+
+@pytest.mark.parametrize("head, file_name, mime_type", [
+    (MINIMAL_PDF, "scan.pdf", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n" + bytes(64), "logo.png", "image/png"),
+    (b"company_name,area_of_service\nAcme,Widgets\n", "companies.csv", "text/csv"),
+])
+def test_builtin_signatures_accept_allowed_types(monkeypatch, head, file_name, mime_type):
+    monkeypatch.setattr(file_inspector, "magic", None)
+    assert check_upload_type(head, file_name) == mime_type
+
+def test_register_refuses_renamed_executable_with_415(sniffer, monkeypatch, tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    monkeypatch.setattr(file_handler, "_storage", storage)
+    app = FastAPI()
+    app.include_router(registration.router)
+
+    async def post():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await client.post("/register", files={"files": ("evil.pdf", EXECUTABLE, "application/pdf")})
+
+    response = asyncio.run(post())
+    assert response.status_code == 415
+    # Nothing was stored, not even a partial file
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
@@ -73,7 +73,9 @@ const AIAssistant = () => {
     updateFormField,
     formValues,
     handleFileUploadComplete,
-    addMessage
+    addMessage,
+    checkCompanyName,
+    companyNameCheck
   } = useAIAssistant();
   
   const [inputValue, setInputValue] = useState('');
@@ -271,7 +273,13 @@ const AIAssistant = () => {
             ref={inputRef}
             type="text"
             value={inputValue}
-            onChange={(e) => setInputValue(e.target.value)}
+            onChange={(e) => {
+              setInputValue(e.target.value);
+              if (currentStep === 0) { // company name step
+                checkCompanyName(e.target.value);
+              }
+            }}
+            list={currentStep === 0 ? 'company-name-suggestions' : undefined}
             placeholder="Type your response..."
             className="flex-1 px-4 py-2 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500 focus:border-transparent"
             disabled={isTyping}
@@ -284,6 +292,20 @@ const AIAssistant = () => {
             <FiSend className="w-5 h-5" />
           </button>
         </form>
+        {currentStep === 0 && (
+          <>
+            <datalist id="company-name-suggestions">
+              {companyNameCheck.matches.map(match => (
+                <option key={match.id} value={match.company_name} />
+              ))}
+            </datalist>
+            {companyNameCheck.exact && companyNameCheck.query === inputValue.trim() && (
+              <div className="text-xs text-red-600 mt-1">
+                A company with this name is already registered.
+              </div>
+            )}
+          </>
+        )}
       </div>
     </div>
   );
@@ -44,6 +44,13 @@ const STEPS = [
   }
 ];
 
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+// Wait this long after the last keystroke before checking the company name
+const NAME_CHECK_DEBOUNCE_MS = 150;
+
+const EMPTY_NAME_CHECK = { query: '', exact: false, matches: [] };
+
 // Initial form values
 const INITIAL_FORM_VALUES = {
   companyName: '',
@@ -67,9 +74,11 @@ export const AIAssistantProvider = ({ children }) => {
   const [currentStepIndex, setCurrentStepIndex] = useState(0);
   const [formValues, setFormValues] = useState(INITIAL_FORM_VALUES);
   const [chatHistory, setChatHistory] = useState([]);
+  const [companyNameCheck, setCompanyNameCheck] = useState(EMPTY_NAME_CHECK);
   const submitFormRef = useRef(null);
   const messagesEndRef = useRef(null);
   const abortControllerRef = useRef(null);
+  const nameCheckTimerRef = useRef(null);
   
   // Get current step
   const currentStep = STEPS[currentStepIndex];
@@ -85,8 +94,41 @@ export const AIAssistantProvider = ({ children }) => {
     setCurrentStepIndex(0);
     setFormValues(INITIAL_FORM_VALUES);
     setChatHistory([]);
+    setCompanyNameCheck(EMPTY_NAME_CHECK);
+  }, []);
+  
+  // Look up a company name; only the latest request's answer is kept
+  const fetchCompanyNameCheck = useCallback(async (name) => {
+    if (abortControllerRef.current) {
+      abortControllerRef.current.abort();
+    }
+    const controller = new AbortController();
+    abortControllerRef.current = controller;
+    const response = await axios.get(`${API_URL}/api/v1/companies/search`, {
+      params: { q: name, limit: 5 },
+      signal: controller.signal
+    });
+    setCompanyNameCheck(response.data);
+    return response.data;
   }, []);
   
+  // Check the company name as it is typed, so duplicates show up before submit
+  const checkCompanyName = useCallback((value) => {
+    clearTimeout(nameCheckTimerRef.current);
+    const name = value.trim();
+    if (!name) {
+      setCompanyNameCheck(EMPTY_NAME_CHECK);
+      return;
+    }
+    nameCheckTimerRef.current = setTimeout(() => {
+      fetchCompanyNameCheck(name).catch(error => {
+        if (!axios.isCancel(error)) {
+          console.error("Company name check failed:", error);
+        }
+      });
+    }, NAME_CHECK_DEBOUNCE_MS);
+  }, [fetchCompanyNameCheck]);
+  
   // Add a message to the chat
   const addMessage = useCallback((text, isUser = false) => {
     const message = { text, isUser, timestamp: new Date().toISOString() };
@@ -181,10 +223,27 @@ export const AIAssistantProvider = ({ children }) => {
         return;
       }
       
+      // A taken company name would only fail at submit, after the uploads
+      if (step.field === 'companyName') {
+        clearTimeout(nameCheckTimerRef.current);
+        let check = companyNameCheck;
+        if (check.query !== response.trim()) {
+          try {
+            check = await fetchCompanyNameCheck(response.trim());
+          } catch (error) {
+            check = EMPTY_NAME_CHECK; // the server still rejects duplicates at submit
+          }
+        }
+        if (check.exact) {
+          addMessage(`"${response}" is already registered. Please enter a different company name.`, false);
+          return;
+        }
+      }
+      
       // Update form field and move to next step
       updateFormField(step.field, response);
     }
-  }, [currentStepIndex, addMessage, updateFormField, triggerSubmit]);
+  }, [currentStepIndex, addMessage, updateFormField, triggerSubmit, companyNameCheck, fetchCompanyNameCheck]);
   
   // Handle unexpected user input using OpenAI API
   const handleUnexpectedInput = useCallback(async (input) => {
@@ -232,7 +291,9 @@ export const AIAssistantProvider = ({ children }) => {
     formValues,
     setSubmitForm,
     handleFileUploadComplete,
-    addMessage
+    addMessage,
+    checkCompanyName,
+    companyNameCheck
   };
   
   // Auto-scroll to bottom when messages change
@@ -245,6 +306,7 @@ export const AIAssistantProvider = ({ children }) => {
   // Clean up any pending requests
   useEffect(() => {
     return () => {
+      clearTimeout(nameCheckTimerRef.current);
       if (abortControllerRef.current) {
         abortControllerRef.current.abort();
       }